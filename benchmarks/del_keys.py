@@ -0,0 +1,71 @@
+"""Key deletion cost on a populated Redis.
+
+Fills Redis with `--keys` filler keys, then deletes single exact keys the old
+way (SCAN the whole keyspace for the key, then DEL) and with `del_keys`
+(one UNLINK). Finally removes a `--group` sized prefix with `del_pattern` for
+a few COUNT values. Run with `python -m benchmarks.del_keys --port 6379`.
+"""
+
+import argparse
+import asyncio
+import time
+
+from src.core.settings import RedisSettings
+from src.services.cache.redis import RedisCache, get_redis
+
+CHUNK = 10_000
+
+
+async def _populate(cache: RedisCache, prefix: str, total: int) -> None:
+    for start in range(0, total, CHUNK):
+        await cache.set_many(
+            {f"{prefix}:{i}": "1" for i in range(start, min(start + CHUNK, total))}
+        )
+
+
+async def _legacy_delete(cache: RedisCache, key: str) -> None:
+    found = [found async for found in cache._redis.scan_iter(key)]
+    if found:
+        await cache._redis.delete(*found)
+
+
+async def main(host: str, port: int, keys: int, deletes: int, group: int) -> None:
+    cache = get_redis(RedisSettings(host=host, port=port))
+    await _populate(cache, "bench:filler", keys)
+    print(f"populated keys={await cache._redis.dbsize()}")
+
+    for name, delete in (("scan+del", _legacy_delete), ("unlink", None)):
+        await cache.set_many({f"bench:exact:{i}": "1" for i in range(deletes)})
+        start = time.perf_counter()
+        for i in range(deletes):
+            if delete is None:
+                await cache.del_keys(f"bench:exact:{i}")
+            else:
+                await delete(cache, f"bench:exact:{i}")
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:<9} deletes={deletes} total={elapsed:.2f}s "
+            f"avg={elapsed / deletes * 1000:.3f}ms"
+        )
+
+    for count in (100, 1000, 10_000):
+        await _populate(cache, "bench:group", group)
+        start = time.perf_counter()
+        deleted = await cache.del_pattern("bench:group:*", count=count)
+        elapsed = time.perf_counter() - start
+        print(f"pattern   count={count} deleted={deleted} total={elapsed:.2f}s")
+
+    await cache.del_pattern("bench:*", count=CHUNK)
+    await cache.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--deletes", type=int, default=3)
+    parser.add_argument("--group", type=int, default=50_000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.host, args.port, args.keys, args.deletes, args.group))
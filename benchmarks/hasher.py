@@ -0,0 +1,82 @@
+"""Event loop latency under concurrent password verification.
+
+A cheap coroutine stands in for `GET /users/me` (no hashing, a single await),
+while `--logins` concurrent logins verify argon2 hashes either inline (the old
+behavior) or through `PooledHasher`. Run with `python -m benchmarks.hasher`.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from src.core.settings import CipherSettings
+from src.interfaces.hasher import AbstractHasher
+from src.services.security.argon2 import get_argon2_hasher
+from src.services.security.pooled import get_pooled_hasher
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def _probe(latencies: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        latencies.append(time.perf_counter() - start - 0.001)
+
+
+async def _measure(
+    name: str, verify: Callable[[], Awaitable[bool]], logins: int
+) -> None:
+    latencies: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(latencies, stop))
+    start = time.perf_counter()
+
+    await asyncio.gather(*(verify() for _ in range(logins)))
+
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+
+    print(
+        f"{name:<8} logins={logins} total={elapsed:.2f}s probes={len(latencies)} "
+        f"p50={_percentile(latencies, 0.5) * 1000:.2f}ms "
+        f"p99={_percentile(latencies, 0.99) * 1000:.2f}ms "
+        f"max={max(latencies) * 1000:.2f}ms"
+    )
+
+
+async def main(logins: int, workers: int, executor: str) -> None:
+    hasher: AbstractHasher = get_argon2_hasher()
+    hashed = hasher.hash_password("password")
+
+    async def inline() -> bool:
+        await asyncio.sleep(0)
+        return hasher.verify_password(hashed, "password")
+
+    pooled = get_pooled_hasher(
+        hasher,
+        CipherSettings(
+            hasher_executor=executor,  # type: ignore[arg-type]
+            hasher_workers=workers,
+            hasher_queue_size=logins,
+        ),
+    )
+
+    await _measure("inline", inline, logins)
+    await _measure("pooled", lambda: pooled.verify_password(hashed, "password"), logins)
+    await pooled.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--executor", choices=("thread", "process"), default="thread")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.logins, args.workers, args.executor))
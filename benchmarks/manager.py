@@ -0,0 +1,123 @@
+"""Per-command overhead of the transaction manager.
+
+Runs `--repeat` commands the way the mediator does (a manager from the
+factory, `async with` around the command) against a session and a plain
+connection factory. A command is either answered without the database
+(`idle`, e.g. by a cache hit) or sends a single query (`query`). `former`
+starts the connection on enter and closes it in a shielded task, as the
+manager did before checking out lazily. Prints the time, the tasks created
+and the pool checkouts per command.
+Run with `python -m benchmarks.manager --url postgresql+asyncpg://...`.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from typing import Any, Callable, Coroutine
+
+from sqlalchemy import event
+
+from src.database.alchemy import queries
+from src.database.alchemy.connection import (
+    create_connection_factory,
+    create_sa_engine,
+    create_sa_session_factory,
+    create_session_factory,
+)
+from src.database.manager import TransactionManager
+from src.interfaces.connection import AbstractAsyncConnection
+
+
+class _EagerManager(TransactionManager):
+    __slots__ = ()
+
+    async def __aenter__(self) -> TransactionManager:
+        await self.conn.start()
+        self._started = True
+        return await super().__aenter__()
+
+    async def close_transaction(self) -> None:
+        self._invalidated.clear()
+        self._written = False
+        self._started = False
+        await asyncio.shield(asyncio.create_task(self.conn.close()))
+
+
+async def _idle(manager: TransactionManager) -> None:
+    async with manager:
+        pass
+
+
+async def _query(manager: TransactionManager) -> None:
+    async with manager:
+        await manager.send(queries.user.Exists(login="bench"))
+
+
+async def measure(
+    name: str,
+    create: Callable[[], TransactionManager],
+    command: Callable[[TransactionManager], Coroutine[Any, Any, None]],
+    repeat: int,
+    counts: Counter[str],
+) -> None:
+    for _ in range(repeat // 10):
+        await command(create())
+
+    counts.clear()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await command(create())
+        timings.append(time.perf_counter() - start)
+
+    print(
+        f"{name:<28} median={statistics.median(timings) * 1e6:.1f}us "
+        f"tasks={counts['tasks'] / repeat:.1f} "
+        f"checkouts={counts['checkouts'] / repeat:.1f}"
+    )
+
+
+async def main(url: str, repeat: int) -> None:
+    engine = create_sa_engine(url, pool_size=1, max_overflow=0)
+    counts: Counter[str] = Counter()
+
+    def task_factory(loop: asyncio.AbstractEventLoop, coro: Any, **kw: Any) -> Any:
+        counts["tasks"] += 1
+        return asyncio.Task(coro, loop=loop, **kw)
+
+    asyncio.get_running_loop().set_task_factory(task_factory)
+    event.listen(
+        engine.sync_engine, "checkout", lambda *args: counts.update(("checkouts",))
+    )
+
+    factories: dict[str, Callable[[], AbstractAsyncConnection]] = {
+        "session": create_session_factory(create_sa_session_factory(engine)),
+        "connection": create_connection_factory(engine),
+    }
+    try:
+        for factory_name, factory in factories.items():
+            for command in (_idle, _query):
+                for name, manager in (
+                    ("former", _EagerManager),
+                    ("lazy", TransactionManager),
+                ):
+                    await measure(
+                        f"{factory_name} {command.__name__[1:]} {name}",
+                        lambda: manager(factory()),  # noqa: B023
+                        command,
+                        repeat,
+                        counts,
+                    )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--repeat", type=int, default=5000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.url, args.repeat))
@@ -0,0 +1,95 @@
+"""Cost per row of turning query results into dtos.
+
+Builds `--rows` users in memory, each with `--roles` roles, as loaded entities
+and as plain column rows, then materializes them the old way
+(`Entity.as_dict` then `DTO.from_mapping`), with `Materializer.from_entity`
+and, for the columns only, with `Materializer.from_row`. Prints the best time
+per row out of `--repeat` runs and the peak memory a single conversion
+allocates, traced with tracemalloc.
+Run with `python -m benchmarks.materialize`.
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+import uuid
+from typing import Any, Callable
+
+from sqlalchemy.engine.result import result_tuple
+
+from src.common import dto
+from src.database.alchemy import entity
+from src.database.alchemy.queries.materialize import materializer
+
+
+def _users(rows: int, roles: int) -> list[entity.User]:
+    return [
+        entity.User.from_dict(
+            {
+                "id": uuid.uuid4(),
+                "login": f"user:{i}",
+                "password": "x",
+                "roles": [
+                    {"id": uuid.uuid4(), "name": "USER", "permissions": []}
+                    for _ in range(roles)
+                ],
+            }
+        )
+        for i in range(rows)
+    ]
+
+
+def _measure(
+    items: list[Any], convert: Callable[[Any], Any], repeat: int
+) -> tuple[float, float]:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        # results are kept like a page is, the garbage collector runs meanwhile
+        kept = [convert(item) for item in items]
+        timings.append(time.perf_counter() - start)
+        del kept
+    elapsed = min(timings)
+
+    # the high water mark of a single conversion, intermediate copies included
+    peaks = 0
+    tracemalloc.start()
+    for item in items:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        convert(item)
+        peaks += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    return elapsed / len(items) * 1e6, peaks / len(items)
+
+
+def main(rows: int, roles: int, repeat: int) -> None:
+    users = materializer(dto.User, entity.User)
+    loaded = _users(rows, roles)
+    make_row = result_tuple(list(users.columns))
+    plain = [make_row((user.id, user.login)) for user in loaded]
+
+    for name, items, convert in (
+        (
+            "as_dict+from_mapping",
+            loaded,
+            lambda user: dto.User.from_mapping(user.as_dict()),
+        ),
+        ("from_entity", loaded, users.from_entity),
+        ("from_row", plain, users.from_row),
+    ):
+        per_row, allocated = _measure(items, convert, repeat)
+        print(f"{name:<22} {per_row:8.2f}us/row {allocated:10.0f}B/row")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--roles", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    main(args.rows, args.roles, args.repeat)
@@ -0,0 +1,196 @@
+"""Deep page latency of offset and cursor pagination on the user table.
+
+Grows the table to each of `--sizes` users, then reads a page near the end
+(`--depth` of the table) with `GetManyByOffset` and with `GetManyByCursor`.
+The offset page gets slower with the table, the cursor page should not.
+With `--api` the same pages are also requested from a running server on that
+database, as `GET /api/v1/users` serves them: the version query for the ETag,
+the page with its exact count, and the 304 answer to a repeated request.
+Needs the schema from the migrations and an otherwise unused database, the
+inserted users are deleted at the end.
+Run with `python -m benchmarks.pagination --url postgresql+asyncpg://...`, add
+`--api http://127.0.0.1:8080` with the server started by `python -m src`.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Any, Callable
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.database.alchemy import queries
+from src.database.alchemy.connection import (
+    create_sa_engine,
+    create_sa_session_factory,
+    create_session_factory,
+)
+from src.database.manager import TransactionManager
+from src.database.tools import encode_cursor
+
+API = "/api/v1"
+LIMIT = 30
+INSERT = text("""
+    INSERT INTO "user" (login, password, created_at, updated_at)
+    SELECT 'bench:' || i, 'x', now() - i * interval '1 millisecond', now()
+    FROM generate_series(:start, :stop - 1) AS i
+    """)
+
+
+async def _grow(engine: AsyncEngine, current: int, size: int) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(INSERT, {"start": current, "stop": size})
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text('ANALYZE "user"'))
+
+
+async def _measure(
+    manager_factory: Callable[[], TransactionManager],
+    query: Callable[[], Any],
+    repeat: int,
+) -> float:
+    timings = []
+    for _ in range(repeat):
+        async with manager_factory() as manager:
+            start = time.perf_counter()
+            await manager.send(query())
+            timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings) * 1000
+
+
+async def _login(client: httpx.AsyncClient) -> dict[str, str]:
+    data = {"login": f"bench:api:{uuid.uuid4().hex[:12]}", "password": "password"}
+    (await client.post(f"{API}/users", json=data)).raise_for_status()
+    response = await client.post(
+        f"{API}/auth/login", json=data | {"fingerprint": "bench"}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+async def _measure_api(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+    params: dict[str, Any],
+    repeat: int,
+) -> tuple[float, float]:
+    pages, not_modified = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.get(f"{API}/users", params=params, headers=headers)
+        pages.append(time.perf_counter() - start)
+        response.raise_for_status()
+
+        start = time.perf_counter()
+        response = await client.get(
+            f"{API}/users",
+            params=params,
+            headers=headers | {"If-None-Match": response.headers["ETag"]},
+        )
+        not_modified.append(time.perf_counter() - start)
+        if response.status_code != 304:
+            raise RuntimeError(f"Expected 304, got {response.status_code}")
+
+    return statistics.median(pages) * 1000, statistics.median(not_modified) * 1000
+
+
+async def main(
+    url: str, sizes: list[int], depth: float, repeat: int, api: str | None
+) -> None:
+    engine = create_sa_engine(url)
+    session_factory = create_session_factory(create_sa_session_factory(engine))
+
+    def manager_factory() -> TransactionManager:
+        return TransactionManager(session_factory())
+
+    client = httpx.AsyncClient(base_url=api or "", timeout=60)
+    current = 0
+    try:
+        headers = await _login(client) if api else {}
+        for size in sizes:
+            await _grow(engine, current, size)
+            current = size
+
+            # a whole page, so the api can ask for it by number
+            offset = int(size * depth) // LIMIT * LIMIT
+            async with engine.connect() as conn:
+                # the row right before the requested page, in cursor order
+                row = (
+                    await conn.execute(
+                        text(
+                            'SELECT created_at, id FROM "user" '
+                            "ORDER BY created_at, id OFFSET :offset LIMIT 1"
+                        ),
+                        {"offset": offset - 1},
+                    )
+                ).one()
+
+            by_offset = await _measure(
+                manager_factory,
+                lambda offset=offset: queries.user.GetManyByOffset(
+                    offset=offset, limit=LIMIT
+                ),
+                repeat,
+            )
+            by_cursor = await _measure(
+                manager_factory,
+                lambda after=(row.created_at, row.id): queries.user.GetManyByCursor(
+                    limit=LIMIT, after=after
+                ),
+                repeat,
+            )
+            print(
+                f"users={size:<9} offset={offset:<9} "
+                f"offset_page={by_offset:.2f}ms cursor_page={by_cursor:.2f}ms"
+            )
+            if not api:
+                continue
+
+            offset_api, offset_304 = await _measure_api(
+                client,
+                headers,
+                {"page": offset // LIMIT + 1, "limit": LIMIT},
+                repeat,
+            )
+            cursor_api, cursor_304 = await _measure_api(
+                client,
+                headers,
+                {"cursor": encode_cursor(row.created_at, row.id), "limit": LIMIT},
+                repeat,
+            )
+            print(
+                f"{'':<26}api offset_page={offset_api:.2f}ms "
+                f"cursor_page={cursor_api:.2f}ms "
+                f"not_modified={offset_304:.2f}ms/{cursor_304:.2f}ms"
+            )
+    finally:
+        await client.aclose()
+        async with engine.begin() as conn:
+            await conn.execute(text("DELETE FROM \"user\" WHERE login LIKE 'bench:%'"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--depth", type=float, default=0.9)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--api", default=None)
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(
+            args.url,
+            [int(size) for size in args.sizes.split(",")],
+            args.depth,
+            args.repeat,
+            args.api,
+        )
+    )
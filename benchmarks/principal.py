@@ -0,0 +1,131 @@
+"""Loading a user with its roles and permissions, the auth middleware lookup.
+
+Gives a user every role, each with `--permissions` permissions, then loads it
+`--repeat` times the orm way (`Get("permissions")`, a join plus two subquery
+loads, then entities to dict to dto) and with `GetAsJson` (one statement, the
+json decoded straight into the dto). Needs the schema from the migrations,
+everything inserted is deleted at the end.
+Run with `python -m benchmarks.principal --url postgresql+asyncpg://...`.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable, get_args
+
+import msgspec
+from sqlalchemy import delete, insert, select
+
+from src.common import dto
+from src.database.alchemy import entity, queries
+from src.database.alchemy.connection import (
+    create_sa_engine,
+    create_sa_session_factory,
+    create_session_factory,
+)
+from src.database.alchemy.types.role import RoleType
+from src.database.manager import TransactionManager
+
+LOGIN = "bench:principal"
+DECODER = msgspec.json.Decoder(dto.User)
+
+
+async def _measure(
+    manager_factory: Callable[[], TransactionManager],
+    load: Callable[[TransactionManager], Awaitable[Any]],
+    repeat: int,
+) -> float:
+    timings = []
+    for _ in range(repeat):
+        async with manager_factory() as manager:
+            start = time.perf_counter()
+            await load(manager)
+            timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings) * 1000
+
+
+def _names(user: dto.User) -> set[str]:
+    return {
+        f"{role.name}:{permission.name}"
+        for role in user.roles
+        for permission in role.permissions
+    }
+
+
+async def main(url: str, permissions: int, repeat: int) -> None:
+    engine = create_sa_engine(url)
+    session_factory = create_session_factory(create_sa_session_factory(engine))
+
+    def manager_factory() -> TransactionManager:
+        return TransactionManager(session_factory())
+
+    async def by_orm(manager: TransactionManager) -> dto.User:
+        user = await manager.send(queries.user.Get("permissions", login=LOGIN))
+        assert user
+        return dto.User.from_mapping(user.as_dict())
+
+    async def by_json(manager: TransactionManager) -> dto.User:
+        found = await manager.send(queries.user.GetAsJson("permissions", login=LOGIN))
+        assert found
+        return DECODER.decode(found)
+
+    async with engine.begin() as conn:
+        user_id = await conn.scalar(
+            insert(entity.User)
+            .values(login=LOGIN, password="x")
+            .returning(entity.User.id)
+        )
+        for name in get_args(RoleType):
+            role_id = await conn.scalar(
+                select(entity.Role.id).where(entity.Role.name == name)
+            ) or await conn.scalar(
+                insert(entity.Role).values(name=name).returning(entity.Role.id)
+            )
+            await conn.execute(
+                insert(entity.UserRole).values(user_id=user_id, role_id=role_id)
+            )
+            permission_ids = (
+                await conn.scalars(
+                    insert(entity.Permission)
+                    .values([{"name": f"bench:{name}:{i}"} for i in range(permissions)])
+                    .returning(entity.Permission.id)
+                )
+            ).all()
+            await conn.execute(
+                insert(entity.RolePermission),
+                [
+                    {"role_id": role_id, "permission_id": permission_id}
+                    for permission_id in permission_ids
+                ],
+            )
+
+    try:
+        async with manager_factory() as manager:
+            orm_user, json_user = await by_orm(manager), await by_json(manager)
+            assert _names(orm_user) == _names(json_user), "Loaders disagree"
+
+        orm = await _measure(manager_factory, by_orm, repeat)
+        json = await _measure(manager_factory, by_json, repeat)
+        print(
+            f"permissions={permissions:<5} orm={orm:.2f}ms json={json:.2f}ms "
+            f"speedup={orm / json:.1f}x"
+        )
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(delete(entity.User).where(entity.User.login == LOGIN))
+            await conn.execute(
+                delete(entity.Permission).where(entity.Permission.name.like("bench:%"))
+            )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--permissions", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.url, args.permissions, args.repeat))
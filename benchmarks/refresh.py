@@ -0,0 +1,116 @@
+"""Refresh token rotation throughput against a local Redis.
+
+Compares the old list based store (LRANGE + scan + LREM + LPUSH + EXPIRE) with
+the single `ROTATE_SCRIPT` call used by `AuthService.refresh`. Every user holds
+`--sessions` sessions and `--concurrency` users rotate in parallel.
+Run with `python -m benchmarks.refresh --port 6379`.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from src.core.settings import RedisSettings
+from src.services.auth import LOGIN_SCRIPT, ROTATE_SCRIPT
+from src.services.cache.redis import RedisCache, get_redis
+
+TTL = 3600
+
+
+async def _legacy_rotate(cache: RedisCache, user: str, fingerprint: str) -> None:
+    key = f"bench:legacy:{user}"
+    pairs = await cache.get_list(key)
+    verified = next(
+        (pair for pair in pairs if pair.partition("::")[0] == fingerprint), None
+    )
+    if verified is None:
+        raise RuntimeError("session is missing")
+
+    await cache.pop(key, verified)
+    await cache.set_list(key, f"{fingerprint}::{uuid.uuid4().hex}", expire=TTL)
+
+
+async def _script_rotate(
+    cache: RedisCache, user: str, fingerprint: str, tokens: dict[str, str]
+) -> None:
+    key = f"bench:sessions:{user}"
+    token = uuid.uuid4().hex
+    rotated = await cache.run_script(
+        ROTATE_SCRIPT,
+        (key, f"{key}:order"),
+        (fingerprint, tokens[user], token, time.time(), TTL),
+    )
+    if not rotated:
+        raise RuntimeError("session is missing")
+
+    tokens[user] = token
+
+
+async def _measure(
+    name: str, rotate: Callable[[str], Awaitable[None]], users: list[str], rounds: int
+) -> None:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(rotate(user) for user in users))
+    elapsed = time.perf_counter() - start
+
+    total = rounds * len(users)
+    print(
+        f"{name:<7} refreshes={total} total={elapsed:.2f}s "
+        f"rate={total / elapsed:.0f}/s avg={elapsed / rounds * 1000:.2f}ms per round"
+    )
+
+
+async def main(
+    host: str, port: int, refreshes: int, concurrency: int, sessions: int
+) -> None:
+    cache = get_redis(RedisSettings(host=host, port=port))
+    users = [uuid.uuid4().hex for _ in range(concurrency)]
+    tokens: dict[str, str] = {}
+    fingerprint = f"fp{sessions - 1}"
+
+    for user in users:
+        for i in range(sessions):
+            await cache.set_list(
+                f"bench:legacy:{user}", f"fp{i}::{uuid.uuid4().hex}", expire=TTL
+            )
+            key = f"bench:sessions:{user}"
+            tokens[user] = uuid.uuid4().hex
+            await cache.run_script(
+                LOGIN_SCRIPT,
+                (key, f"{key}:order"),
+                (f"fp{i}", tokens[user], time.time(), sessions, TTL),
+            )
+
+    rounds = max(1, refreshes // concurrency)
+    await _measure(
+        "legacy",
+        lambda user: _legacy_rotate(cache, user, fingerprint),
+        users,
+        rounds,
+    )
+    await _measure(
+        "script",
+        lambda user: _script_rotate(cache, user, fingerprint, tokens),
+        users,
+        rounds,
+    )
+
+    await cache.del_pattern("bench:*")
+    await cache.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--refreshes", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(args.host, args.port, args.refreshes, args.concurrency, args.sessions)
+    )
@@ -0,0 +1,113 @@
+"""Connection errors of every server worker saturating its pool at once.
+
+Builds one engine per simulated worker (`--workers`), sized either the old
+way (`pool_size=10, max_overflow=90` each) or by `plan_connections` from the
+server's `max_connections`. Every worker then runs `--requests` transactions
+at the same time, each holding its connection for `--hold` seconds. Prints
+the completed requests, the errors by type and the most connections the
+server saw. The planned pools queue requests instead of being refused.
+Run with `python -m benchmarks.saturation --url postgresql+asyncpg://...`.
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.settings import DatabaseSettings
+from src.database.alchemy.connection import create_sa_engine
+from src.database.budget import plan_connections
+
+
+async def _request(engine: AsyncEngine, hold: float) -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT pg_sleep(:hold)"), {"hold": hold})
+
+
+async def _watch(url: str, peak: list[int], done: asyncio.Event) -> None:
+    # connected before the load starts, so it is never the one refused
+    engine = create_sa_engine(url, pool_size=1, max_overflow=0)
+    try:
+        async with engine.connect() as conn:
+            while not done.is_set():
+                count = await conn.scalar(text("SELECT count(*) FROM pg_stat_activity"))
+                await conn.rollback()
+                peak[0] = max(peak[0], count or 0)
+                await asyncio.sleep(0.05)
+    finally:
+        await engine.dispose()
+
+
+async def run(url: str, name: str, sizes: dict[str, Any], args: Any) -> None:
+    engines = [create_sa_engine(url, **sizes) for _ in range(args.workers)]
+    errors: Counter[str] = Counter()
+    peak = [0]
+    done = asyncio.Event()
+    watcher = asyncio.create_task(_watch(url, peak, done))
+    await asyncio.sleep(0.1)
+    start = time.perf_counter()
+    try:
+        results = await asyncio.gather(
+            *(
+                _request(engine, args.hold)
+                for engine in engines
+                for _ in range(args.requests)
+            ),
+            return_exceptions=True,
+        )
+    finally:
+        elapsed = time.perf_counter() - start
+        done.set()
+        await watcher
+        await asyncio.gather(*(engine.dispose() for engine in engines))
+
+    for result in results:
+        if isinstance(result, BaseException):
+            errors[type(result).__name__] += 1
+
+    print(
+        f"{name:<8} completed={len(results) - sum(errors.values()):<5} "
+        f"errors={dict(errors) or 0} peak_connections={peak[0]} "
+        f"elapsed={elapsed:.1f}s"
+    )
+
+
+async def main(args: Any) -> None:
+    probe = create_sa_engine(args.url, pool_size=1, max_overflow=0)
+    async with probe.connect() as conn:
+        max_connections = int(await conn.scalar(text("SHOW max_connections")) or 0)
+    await probe.dispose()
+
+    url = make_url(args.url)
+    settings = DatabaseSettings(
+        driver=url.drivername,
+        host=url.host,
+        port=url.port,
+        max_connections=max_connections,
+        export_pool_size=0,
+    )
+    plan = plan_connections(settings, args.workers)
+    print(f"max_connections={max_connections} plan: {plan.describe(settings)}")
+
+    await run(args.url, "fixed", {"pool_size": 10, "max_overflow": 90}, args)
+    await run(
+        args.url,
+        "planned",
+        {"pool_size": plan.pool_size, "max_overflow": plan.max_overflow},
+        args,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--hold", type=float, default=0.2)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,140 @@
+"""Throughput and latency of the api under every supported server.
+
+Starts `python -m src` once per `--servers` entry (SERVER_TYPE), with
+`--workers` workers each, on `--port`. The rest of the configuration comes
+from the environment or `.env` as for a normal run (database, redis and
+keys), the schema from the migrations must exist. Signs up and logs in one
+user, then `--concurrency` clients request `GET /api/v1/users` with its token
+for `--duration` seconds. Prints requests per second, p50/p99 latency and
+the failed requests by status. Every worker creates its clients on its own
+loop at startup, all three servers run on uvloop.
+Run with `python -m benchmarks.servers --servers granian uvicorn gunicorn`.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+from typing import Any
+
+import httpx
+
+API = "/api/v1"
+
+
+async def _wait_ready(client: httpx.AsyncClient, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get(f"{API}/healthcheck")).is_success:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+
+    raise TimeoutError(f"Server did not start within {timeout}s")
+
+
+async def _login(client: httpx.AsyncClient) -> str:
+    data = {"login": f"bench-{uuid.uuid4().hex[:12]}", "password": "password"}
+    (await client.post(f"{API}/users", json=data)).raise_for_status()
+    response = await client.post(
+        f"{API}/auth/login", json=data | {"fingerprint": "bench"}
+    )
+    response.raise_for_status()
+    return str(response.json()["token"])
+
+
+async def _hammer(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+    until: float,
+    timings: list[float],
+    errors: Counter[str],
+) -> None:
+    while time.monotonic() < until:
+        start = time.perf_counter()
+        try:
+            response = await client.get(f"{API}/users", headers=headers)
+        except httpx.HTTPError as e:
+            errors[type(e).__name__] += 1
+            continue
+        if response.is_success:
+            timings.append(time.perf_counter() - start)
+        else:
+            errors[str(response.status_code)] += 1
+
+
+async def measure(server: str, args: Any) -> None:
+    env = os.environ | {
+        "SERVER_TYPE": server,
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(args.port),
+        "SERVER_WORKERS": str(args.workers),
+        "SERVER_LOG_LEVEL": "WARNING",
+        "SERVER_SIGNUP_RATE_LIMIT": "",
+        "SERVER_LOGIN_RATE_LIMIT": "",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=None if args.verbose else subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    timings: list[float] = []
+    errors: Counter[str] = Counter()
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{args.port}",
+            limits=httpx.Limits(max_connections=args.concurrency),
+            timeout=30,
+        ) as client:
+            await _wait_ready(client, args.startup_timeout)
+            headers = {"Authorization": f"Bearer {await _login(client)}"}
+            until = time.monotonic() + args.duration
+            await asyncio.gather(
+                *(
+                    _hammer(client, headers, until, timings, errors)
+                    for _ in range(args.concurrency)
+                )
+            )
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait()
+
+    quantiles = statistics.quantiles(timings, n=100) if len(timings) > 1 else [0.0] * 99
+    print(
+        f"{server:<9} requests/s={len(timings) / args.duration:<8.0f} "
+        f"p50={quantiles[49] * 1000:.1f}ms p99={quantiles[98] * 1000:.1f}ms "
+        f"errors={dict(errors) or 0}"
+    )
+
+
+async def main(args: Any) -> None:
+    for server in args.servers:
+        await measure(server, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--servers",
+        nargs="+",
+        choices=("granian", "uvicorn", "gunicorn"),
+        default=["granian", "uvicorn", "gunicorn"],
+    )
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--startup-timeout", type=float, default=30.0)
+    parser.add_argument("--verbose", action="store_true")
+
+    asyncio.run(main(parser.parse_args()))
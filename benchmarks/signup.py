@@ -0,0 +1,117 @@
+"""Statements, round trips and latency of a single signup.
+
+Signs up `--repeat` users the former way (`UserService.create`, then
+`RoleService.set_role_to_user`, a commit and the user read again in a new
+transaction) and with `UserService.signup` (one statement returning the
+user). Statements and transaction control (BEGIN, COMMIT, ROLLBACK) are
+counted with engine events, each is a round trip to the database. Passwords
+are not hashed, both ways hash exactly once.
+Needs the schema from the migrations with the default roles, the created
+users are deleted at the end.
+Run with `python -m benchmarks.signup --url postgresql+asyncpg://...`.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import delete, event
+
+from src.common import dto
+from src.database.alchemy import entity
+from src.database.alchemy.connection import (
+    create_sa_engine,
+    create_sa_session_factory,
+    create_session_factory,
+)
+from src.database.manager import TransactionManager
+from src.services import RoleService, UserService
+
+PREFIX = "bench:signup"
+
+
+class _PlainHasher:
+    async def hash_password(self, plain: str) -> str:
+        return plain
+
+    async def verify_password(self, hashed: str, plain: str) -> bool:
+        return hashed == plain
+
+    async def close(self) -> None:
+        pass
+
+
+async def main(url: str, repeat: int) -> None:
+    engine = create_sa_engine(url)
+    session_factory = create_session_factory(create_sa_session_factory(engine))
+    hasher = _PlainHasher()
+    counts: Counter[str] = Counter()
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _statement(*args: Any) -> None:
+        counts["statements"] += 1
+
+    for name in ("begin", "commit", "rollback"):
+        event.listen(
+            engine.sync_engine,
+            name,
+            lambda *args, name=name: counts.update(("transaction control",)),
+        )
+
+    def manager_factory() -> TransactionManager:
+        return TransactionManager(session_factory())
+
+    async def former(data: dto.UserCreate) -> dto.User:
+        async with manager_factory() as manager:
+            await manager.create_transaction()
+            user = await UserService(manager).create(data, hasher)
+            await RoleService(manager).set_role_to_user(
+                dto.SetRoleToUser(user_id=user.id, name="USER")
+            )
+        async with manager_factory() as manager:
+            return await UserService(manager).get_one("permissions", id=user.id)
+
+    async def signup(data: dto.UserCreate) -> dto.User:
+        async with manager_factory() as manager:
+            await manager.create_transaction()
+            return await UserService(manager).signup(data, hasher)
+
+    async def measure(
+        name: str, create: Callable[[dto.UserCreate], Awaitable[dto.User]]
+    ) -> None:
+        counts.clear()
+        timings = []
+        for i in range(repeat):
+            data = dto.UserCreate(login=f"{PREFIX}:{name}:{i}", password="password")
+            start = time.perf_counter()
+            user = await create(data)
+            timings.append(time.perf_counter() - start)
+            assert [role.name for role in user.roles] == ["USER"], "Role not set"
+
+        print(
+            f"{name:<8} statements={counts['statements'] / repeat:.1f} "
+            f"round_trips={sum(counts.values()) / repeat:.1f} "
+            f"median={statistics.median(timings) * 1000:.2f}ms"
+        )
+
+    try:
+        await measure("former", former)
+        await measure("signup", signup)
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(
+                delete(entity.User).where(entity.User.login.like(f"{PREFIX}:%"))
+            )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.url, args.repeat))
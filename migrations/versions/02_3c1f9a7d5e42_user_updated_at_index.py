@@ -0,0 +1,25 @@
+"""user_updated_at_index
+
+Revision ID: 02_3c1f9a7d5e42
+Revises: 01_fe7594b92a01
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '02_3c1f9a7d5e42'
+down_revision: Union[str, None] = '01_fe7594b92a01'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_user_updated_at', 'user', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_user_updated_at', table_name='user')
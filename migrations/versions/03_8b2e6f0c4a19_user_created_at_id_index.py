@@ -0,0 +1,25 @@
+"""user_created_at_id_index
+
+Revision ID: 03_8b2e6f0c4a19
+Revises: 02_3c1f9a7d5e42
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '03_8b2e6f0c4a19'
+down_revision: Union[str, None] = '02_3c1f9a7d5e42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_user_created_at_id', 'user', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_user_created_at_id', table_name='user')
@@ -6,7 +6,9 @@ from src.core.server import run_granian, run_gunicorn, run_uvicorn, workers_coun
 from src.core.settings import DATETIME_FORMAT, LOGGING_FORMAT, load_settings
 
 settings = load_settings()
-app = init_app(settings, init_v1_router())
+# every worker process imports this module, they all size their pools by it
+workers = workers_count() if (w := settings.server.workers) == "max" else w
+app = init_app(settings, init_v1_router(), workers=workers)
 
 
 if __name__ == "__main__":
@@ -17,16 +19,18 @@ if __name__ == "__main__":
         level=settings.server.log_level.upper(),
         force=True,
     )
-    workers = workers_count() if (w := settings.server.workers) == "max" else w
     match settings.server.type:
         case "granian":
             run_granian(
                 "src.__main__:app",
                 settings,
-                optimize_loop=False,  # breaks db-connections if True. ¯\_(ツ)_/¯. Maybe it'll be fixed sometime
+                # requests run outside of an asyncio task then, asyncpg and redis
+                # timeouts need one, uvloop is used either way
+                optimize_loop=False,
                 workers=workers,
             )
         case "gunicorn":
             run_gunicorn(app, settings, workers=workers)
         case "uvicorn":
-            run_uvicorn(app, settings, workers=workers)
+            # workers > 1 need the import string, every worker loads the app itself
+            run_uvicorn("src.__main__:app", settings, workers=workers)
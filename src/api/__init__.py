@@ -1,5 +1,6 @@
-from contextlib import asynccontextmanager
-from typing import AsyncIterator, Literal, cast
+import asyncio
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, suppress
+from typing import AsyncIterator, Callable, Literal, cast
 
 from litestar import Litestar, Router
 from litestar.config.cors import CORSConfig
@@ -10,7 +11,7 @@ from litestar.types import Method
 
 from src.api.common.exceptions import setup_common_exception_handlers
 from src.api.common.middlewares import setup_common_middlewares
-from src.api.dependencies import setup_common_dependencies
+from src.api.dependencies import setup_common_dependencies, setup_resources
 from src.core.logger import log
 from src.core.settings import Settings
 
@@ -22,11 +23,48 @@ async def release_resources(app: Litestar) -> AsyncIterator[None]:
     finally:
         if engine := getattr(app.state, "engine", None):
             await engine.dispose()
+        if export_engine := getattr(app.state, "export_engine", None):
+            await export_engine.dispose()
+        if replica_engine := getattr(app.state, "replica_engine", None):
+            await replica_engine.dispose()
+        if tiered := getattr(app.state, "tiered_cache", None):
+            await tiered.close()
         if redis := getattr(app.state, "redis", None):
             await redis.close()
+        if hasher := getattr(app.state, "hasher", None):
+            await hasher.close()
 
 
-def init_app(settings: Settings, *routers: Router) -> Litestar:
+def manage_resources(
+    settings: Settings, workers: int = 1
+) -> Callable[[Litestar], AbstractAsyncContextManager[None]]:
+    @asynccontextmanager
+    async def _lifespan(app: Litestar) -> AsyncIterator[None]:
+        async with release_resources(app):
+            # created in every worker on its own loop after the server forked,
+            # never inherited from the process that imported the app
+            setup_resources(app, settings, workers)
+            yield
+
+    return _lifespan
+
+
+@asynccontextmanager
+async def probe_replica(app: Litestar) -> AsyncIterator[None]:
+    if (replica := getattr(app.state, "replica", None)) is None:
+        yield
+        return
+
+    task = asyncio.create_task(replica.run())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+
+def init_app(settings: Settings, *routers: Router, workers: int = 1) -> Litestar:
     log.info("Initialize Application")
 
     app = Litestar(
@@ -68,12 +106,13 @@ def init_app(settings: Settings, *routers: Router) -> Litestar:
             else None
         ),
         debug=bool(settings.server.debug),
-        lifespan=[release_resources],
+        # exited in reverse, the probe stops before the engines are disposed
+        lifespan=[manage_resources(settings, workers), probe_replica],
     )
 
     setup_common_middlewares(app)
     setup_common_exception_handlers(app)
-    setup_common_dependencies(app, settings)
+    setup_common_dependencies(app)
 
     for router in routers:
         app.register(router)
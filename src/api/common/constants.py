@@ -2,3 +2,5 @@ from typing import Final
 
 MIN_PAGINATION_LIMIT: Final[int] = 30
 MAX_PAGINATION_LIMIT: Final[int] = 200
+# users provisioned, updated or deleted by a single bulk request
+MAX_BULK_SIZE: Final[int] = 50_000
@@ -2,12 +2,16 @@ from litestar import Router
 from litestar.middleware.base import MiddlewareProtocol
 
 from src.api.common.middlewares.process_time import ProcessTimeMiddleware
+from src.api.common.middlewares.transaction_scope import TransactionScopeMiddleware
 
-__all__ = ("ProcessTimeMiddleware",)
+__all__ = (
+    "ProcessTimeMiddleware",
+    "TransactionScopeMiddleware",
+)
 
 
 def get_current_common_middlewares() -> tuple[type[MiddlewareProtocol], ...]:
-    return (ProcessTimeMiddleware,)
+    return (ProcessTimeMiddleware, TransactionScopeMiddleware)
 
 
 def setup_common_middlewares(app: Router) -> None:
@@ -0,0 +1,29 @@
+from litestar.enums import ScopeType
+from litestar.middleware.base import MiddlewareProtocol
+from litestar.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.database.manager import release_idle, transaction_scope
+
+
+class TransactionScopeMiddleware(MiddlewareProtocol):
+    __slots__ = ("app",)
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == ScopeType.HTTP:
+
+            async def send_wrapper(message: Message) -> None:
+                await send(message)
+                # the handler is done, only a body still read from the
+                # database, like an export, keeps its connection
+                if message["type"] == "http.response.start":
+                    await release_idle()
+
+            # entered before authentication, the user lookup and the handler
+            # check out a single connection
+            async with transaction_scope():
+                await self.app(scope, receive, send_wrapper)
+        else:
+            await self.app(scope, receive, send)
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import TypeVar
+
+from litestar.pagination import OffsetPagination
+
+from src.database.alchemy.types import CountType
+
+T = TypeVar("T")
+
+
+@dataclass
+class CountedOffsetPagination(OffsetPagination[T]):
+    # how `total` was computed, only `exact` and `window` are precise
+    count_mode: CountType = "exact"
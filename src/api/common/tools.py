@@ -1,5 +1,7 @@
+import hashlib
 from typing import Any, Callable, Mapping, Sequence
 
+from litestar import Request, Response, status_codes
 from litestar.di import Provide
 from litestar.utils import ensure_async_callable
 
@@ -21,3 +23,29 @@ async def find_and_resolve_simple_dependencies(
             resolved[name] = await ensure_async_callable(provide_or_callable)()
 
     return resolved
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(
+        "|".join(str(part) for part in parts).encode(), digest_size=16
+    ).hexdigest()
+
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request[Any, Any, Any], etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    # weak comparison, see RFC 9110 13.1.2
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response[None]:
+    return Response(
+        None, status_code=status_codes.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+    )
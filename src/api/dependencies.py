@@ -1,49 +1,122 @@
+from typing import Any, Callable, Final
+
 from litestar import Litestar
 from litestar.di import Provide
 
 from src.api.v1.commands.setup import setup_command_mediator
-from src.common.helpers import singleton
 from src.core.logger import log
 from src.core.settings import Settings
 from src.database.alchemy.connection import (
+    create_connection_factory,
     create_sa_engine,
     create_sa_session_factory,
     create_session_factory,
 )
+from src.database.alchemy.replica import AlchemyReadReplica
+from src.database.budget import plan_connections
 from src.database.manager import create_db_manager_factory
+from src.services.cache.principal import get_principal_cache
+from src.services.cache.query import get_query_cache
+from src.services.cache.rate_limit import get_rate_limiter
 from src.services.cache.redis import get_redis
+from src.services.cache.tiered import get_tiered_cache
 from src.services.security.argon2 import get_argon2_hasher
 from src.services.security.jwt import JWTImpl
+from src.services.security.pooled import get_pooled_hasher
+
+DEPENDENCIES: Final[tuple[str, ...]] = (
+    "mediator",
+    "jwt",
+    "cache",
+    "tiered_cache",
+    "query_cache",
+    "principal",
+    "rate_limiter",
+)
+
 
+def setup_common_dependencies(app: Litestar) -> None:
+    # resolved on every use, the values are created per worker at startup
+    for name in DEPENDENCIES:
+        app.dependencies[name] = Provide(
+            _from_state(app, name), use_cache=False, sync_to_thread=False
+        )
 
-def setup_common_dependencies(app: Litestar, settings: Settings) -> None:
-    log.info("Setup dependencies")
+
+def setup_resources(app: Litestar, settings: Settings, workers: int = 1) -> None:
+    log.info("Setup resources")
+    plan = plan_connections(settings.db, workers)
+    log.info(f"Connection plan: {plan.describe(settings.db)}")
     engine = create_sa_engine(
         settings.db.url,
-        pool_size=settings.db.connection_pool_size,
-        max_overflow=settings.db.connection_max_overflow,
+        pool_size=plan.pool_size,
+        max_overflow=plan.max_overflow,
+        pool_pre_ping=settings.db.connection_pool_pre_ping,
+    )
+    # exports hold their connection for the whole response, a pool of their own
+    # keeps them from taking the connections of interactive requests
+    export_engine = create_sa_engine(
+        settings.db.url,
+        pool_size=plan.export_pool_size,
+        max_overflow=0,
         pool_pre_ping=settings.db.connection_pool_pre_ping,
     )
     redis = get_redis(settings.redis)
     app.state.engine = engine
+    app.state.export_engine = export_engine
     app.state.redis = redis
+    tiered = get_tiered_cache(redis, settings.redis)
+    app.state.tiered_cache = tiered
+    query_cache = get_query_cache(tiered, settings.db)
     session_factory = create_session_factory(create_sa_session_factory(engine))
-    manager_factory = create_db_manager_factory(session_factory)
-    hasher = get_argon2_hasher()
+    manager_factory = create_db_manager_factory(session_factory, query_cache)
+    read_manager_factory = manager_factory
+    if replica_url := settings.db.replica_url:
+        replica_engine = create_sa_engine(
+            replica_url,
+            pool_size=plan.replica_pool_size,
+            max_overflow=plan.replica_max_overflow,
+            pool_pre_ping=settings.db.connection_pool_pre_ping,
+        )
+        app.state.replica_engine = replica_engine
+        replica = AlchemyReadReplica(
+            replica_engine,
+            create_session_factory(create_sa_session_factory(replica_engine)),
+            max_lag=settings.db.replica_max_lag,
+            probe_interval=settings.db.replica_probe_interval,
+        )
+        app.state.replica = replica
+        read_manager_factory = create_db_manager_factory(
+            session_factory, query_cache, replica=replica
+        )
+    export_manager_factory = create_db_manager_factory(
+        create_connection_factory(export_engine)
+    )
+    hasher = get_pooled_hasher(get_argon2_hasher(), settings.cipher)
+    app.state.hasher = hasher
     jwt = JWTImpl(settings.cipher)
+    principal = get_principal_cache(tiered, settings)
     mediator = setup_command_mediator(
         manager=manager_factory,
+        read_manager=read_manager_factory,
+        export_manager=export_manager_factory,
         hasher=hasher,
         jwt=jwt,
         cache=redis,
+        principal=principal,
+        query_cache=query_cache,
     )
 
-    app.dependencies["mediator"] = Provide(
-        singleton(mediator), use_cache=True, sync_to_thread=False
-    )
-    app.dependencies["jwt"] = Provide(
-        singleton(jwt), use_cache=True, sync_to_thread=False
-    )
-    app.dependencies["cache"] = Provide(
-        singleton(redis), use_cache=True, sync_to_thread=False
-    )
+    app.state.mediator = mediator
+    app.state.jwt = jwt
+    app.state.cache = redis
+    app.state.query_cache = query_cache
+    app.state.principal = principal
+    app.state.rate_limiter = get_rate_limiter(redis, settings.server)
+
+
+def _from_state(app: Litestar, name: str) -> Callable[[], Any]:
+    def _provide() -> Any:
+        return getattr(app.state, name)
+
+    return _provide
@@ -1,8 +1,9 @@
-from typing import Any, Protocol, overload, runtime_checkable
+from typing import Any, AsyncIterator, Protocol, overload, runtime_checkable
 
 from src.api.v1.commands import auth, user
 from src.api.v1.commands.mediator import AwaitableProxy, CommandType
 from src.common import dto
+from src.database.alchemy.types import CountType
 from src.interfaces.command import R, T
 
 
@@ -31,7 +32,15 @@ class CommandMediatorProtocol(Protocol):
     @overload
     def send(
         self, query: user.GetManyUsersByOffset
-    ) -> AwaitableProxy[user.GetManyUsersByOffsetCommand, tuple[int, list[dto.User]]]: ...
+    ) -> AwaitableProxy[
+        user.GetManyUsersByOffsetCommand, tuple[int, list[dto.User], CountType]
+    ]: ...
+    @overload
+    def send(
+        self, query: user.GetManyUsersByCursor
+    ) -> AwaitableProxy[
+        user.GetManyUsersByCursorCommand, tuple[list[dto.User], str | None]
+    ]: ...
     @overload
     def send(
         self, query: dto.UserCreate
@@ -40,6 +49,34 @@ class CommandMediatorProtocol(Protocol):
     def send(
         self, query: user.GetUserById
     ) -> AwaitableProxy[user.GetUserCommand, dto.User]: ...
+    @overload
+    def send(
+        self, query: user.GetUserVersion
+    ) -> AwaitableProxy[user.GetUserVersionCommand, str]: ...
+    @overload
+    def send(
+        self, query: user.GetManyUsersVersion
+    ) -> AwaitableProxy[user.GetManyUsersVersionCommand, str]: ...
+    @overload
+    def send(
+        self, query: user.CreateManyUsers
+    ) -> AwaitableProxy[user.CreateManyUsersCommand, list[dto.User]]: ...
+    @overload
+    def send(
+        self, query: user.UpdateManyUsers
+    ) -> AwaitableProxy[user.UpdateManyUsersCommand, list[dto.User]]: ...
+    @overload
+    def send(
+        self, query: user.DeleteManyUsers
+    ) -> AwaitableProxy[user.DeleteManyUsersCommand, list[dto.User]]: ...
+    @overload
+    def send(
+        self, query: user.ImportUsers
+    ) -> AwaitableProxy[user.ImportUsersCommand, dto.UserImportResult]: ...
+    @overload
+    def send(
+        self, query: user.ExportUsers
+    ) -> AwaitableProxy[user.ExportUsersCommand, AsyncIterator[bytes]]: ...
 
     # dont touch this
     def send(self, query: T, **kwargs: Any) -> AwaitableProxy[CommandType, R]: ...
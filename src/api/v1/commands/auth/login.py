@@ -4,10 +4,11 @@ from typing import Any
 from src.common import dto
 from src.interfaces.cache import Cache
 from src.interfaces.command import Command
-from src.interfaces.hasher import AbstractHasher
+from src.interfaces.hasher import AbstractAsyncHasher
 from src.interfaces.manager import AbstractTransactionManager
 from src.interfaces.token import JWT
 from src.services.auth import AuthService
+from src.services.cache.principal import PrincipalCache
 
 
 class LoginCommand(Command[dto.UserLogin, dto.InternalToken]):
@@ -20,11 +21,14 @@ class LoginCommand(Command[dto.UserLogin, dto.InternalToken]):
         self,
         manager: AbstractTransactionManager,
         jwt: JWT[tuple[datetime, dto.Token], dto.TokenPayload],
-        hasher: AbstractHasher,
+        hasher: AbstractAsyncHasher,
         cache: Cache[str, str],
+        principal: PrincipalCache,
     ) -> None:
         self._manager = manager
-        self._auth = AuthService(manager=manager, hasher=hasher, jwt=jwt, cache=cache)
+        self._auth = AuthService(
+            manager=manager, hasher=hasher, jwt=jwt, cache=cache, principal=principal
+        )
 
     async def execute(
         self, query: dto.UserLogin, /, **kwargs: Any
@@ -4,7 +4,7 @@ from typing import Any
 from src.common import dto
 from src.interfaces.cache import Cache
 from src.interfaces.command import Command
-from src.interfaces.hasher import AbstractHasher
+from src.interfaces.hasher import AbstractAsyncHasher
 from src.interfaces.manager import AbstractTransactionManager
 from src.interfaces.token import JWT
 from src.services.auth import AuthService
@@ -21,7 +21,7 @@ class LogoutCommand(Command[dto.Token, dto.Status]):
         self,
         manager: AbstractTransactionManager,
         jwt: JWT[tuple[datetime, dto.Token], dto.TokenPayload],
-        hasher: AbstractHasher,
+        hasher: AbstractAsyncHasher,
         cache: Cache[str, str],
     ) -> None:
         self._manager = manager
@@ -1,11 +1,27 @@
+from src.api.v1.commands.user.bulk import (
+    CreateManyUsers,
+    CreateManyUsersCommand,
+    DeleteManyUsers,
+    DeleteManyUsersCommand,
+    UpdateManyUsers,
+    UpdateManyUsersCommand,
+)
 from src.api.v1.commands.user.create import CreateUserCommand
 from src.api.v1.commands.user.delete import DeleteUserById, DeleteUserByIdCommand
+from src.api.v1.commands.user.export import ExportUsers, ExportUsersCommand
 from src.api.v1.commands.user.get import (
+    GetManyUsersByCursor,
+    GetManyUsersByCursorCommand,
     GetManyUsersByOffset,
     GetManyUsersByOffsetCommand,
+    GetManyUsersVersion,
+    GetManyUsersVersionCommand,
     GetUserById,
     GetUserCommand,
+    GetUserVersion,
+    GetUserVersionCommand,
 )
+from src.api.v1.commands.user.imports import ImportUsers, ImportUsersCommand
 from src.api.v1.commands.user.update import UpdateUserById, UpdateUserByIdCommand
 
 __all__ = (
@@ -15,7 +31,23 @@ __all__ = (
     "DeleteUserByIdCommand",
     "GetManyUsersByOffset",
     "GetManyUsersByOffsetCommand",
+    "GetManyUsersByCursor",
+    "GetManyUsersByCursorCommand",
+    "GetManyUsersVersion",
+    "GetManyUsersVersionCommand",
     "GetUserById",
     "GetUserCommand",
+    "GetUserVersion",
+    "GetUserVersionCommand",
     "CreateUserCommand",
+    "CreateManyUsers",
+    "CreateManyUsersCommand",
+    "UpdateManyUsers",
+    "UpdateManyUsersCommand",
+    "DeleteManyUsers",
+    "DeleteManyUsersCommand",
+    "ImportUsers",
+    "ImportUsersCommand",
+    "ExportUsers",
+    "ExportUsersCommand",
 )
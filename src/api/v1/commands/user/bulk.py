@@ -0,0 +1,123 @@
+import uuid
+from typing import Annotated, Any
+
+from msgspec import Meta
+from msgspec.structs import replace
+
+from src.api.common.constants import MAX_BULK_SIZE
+from src.common import dto
+from src.database.manager import release_idle
+from src.interfaces.command import Command
+from src.interfaces.hasher import AbstractAsyncHasher
+from src.interfaces.manager import AbstractTransactionManager
+from src.services import RoleService, UserService
+from src.services.cache.principal import PrincipalCache
+from src.services.user import hash_users
+
+
+class CreateManyUsers(dto.DTO):
+    users: Annotated[list[dto.UserCreate], Meta(min_length=1, max_length=MAX_BULK_SIZE)]
+
+
+class UpdateManyUsers(dto.DTO):
+    users: Annotated[
+        list[dto.UserBulkUpdate], Meta(min_length=1, max_length=MAX_BULK_SIZE)
+    ]
+
+
+class DeleteManyUsers(dto.DTO):
+    ids: Annotated[list[uuid.UUID], Meta(min_length=1, max_length=MAX_BULK_SIZE)]
+
+
+class CreateManyUsersCommand(Command[CreateManyUsers, list[dto.User]]):
+    __slots__ = (
+        "_manager",
+        "_hasher",
+        "_principal",
+    )
+
+    def __init__(
+        self,
+        manager: AbstractTransactionManager,
+        hasher: AbstractAsyncHasher,
+        principal: PrincipalCache,
+    ) -> None:
+        self._manager = manager
+        self._hasher = hasher
+        self._principal = principal
+
+    async def execute(self, query: CreateManyUsers, /, **kwargs: Any) -> list[dto.User]:
+        # hashing takes long, the transaction only begins once it is done and
+        # the connection of the user lookup is not held meanwhile
+        await release_idle()
+        data = await hash_users(self._hasher, query.users)
+        async with self._manager:
+            await self._manager.create_transaction()
+
+            users = await UserService(self._manager).create_many(data)
+            if users:
+                role = await RoleService(self._manager).set_role_to_users(
+                    [user.id for user in users], "USER"
+                )
+                users = [replace(user, roles=[role]) for user in users]
+
+        # roles changed, only after commit like for a single user
+        if users:
+            await self._principal.invalidate(*(user.id for user in users))
+
+        return users
+
+
+class UpdateManyUsersCommand(Command[UpdateManyUsers, list[dto.User]]):
+    __slots__ = (
+        "_manager",
+        "_hasher",
+        "_principal",
+    )
+
+    def __init__(
+        self,
+        manager: AbstractTransactionManager,
+        hasher: AbstractAsyncHasher,
+        principal: PrincipalCache,
+    ) -> None:
+        self._manager = manager
+        self._hasher = hasher
+        self._principal = principal
+
+    async def execute(self, query: UpdateManyUsers, /, **kwargs: Any) -> list[dto.User]:
+        await release_idle()
+        data = await hash_users(self._hasher, query.users)
+        async with self._manager:
+            await self._manager.create_transaction()
+
+            users = await UserService(self._manager).update_many(data)
+
+        if users:
+            await self._principal.invalidate(*(user.id for user in users))
+
+        return users
+
+
+class DeleteManyUsersCommand(Command[DeleteManyUsers, list[dto.User]]):
+    __slots__ = (
+        "_manager",
+        "_principal",
+    )
+
+    def __init__(
+        self, manager: AbstractTransactionManager, principal: PrincipalCache
+    ) -> None:
+        self._manager = manager
+        self._principal = principal
+
+    async def execute(self, query: DeleteManyUsers, /, **kwargs: Any) -> list[dto.User]:
+        async with self._manager:
+            await self._manager.create_transaction()
+
+            users = await UserService(self._manager).delete_many(query.ids)
+
+        if users:
+            await self._principal.invalidate(*(user.id for user in users))
+
+        return users
@@ -4,6 +4,7 @@ from typing import Any
 from src.common import dto
 from src.interfaces.command import Command
 from src.interfaces.manager import AbstractTransactionManager
+from src.services.cache.principal import PrincipalCache
 from src.services.user import UserService
 
 
@@ -12,13 +13,23 @@ class DeleteUserById(dto.DTO):
 
 
 class DeleteUserByIdCommand(Command[DeleteUserById, dto.User]):
-    __slots__ = ("_manager",)
-
-    def __init__(self, manager: AbstractTransactionManager) -> None:
+    __slots__ = (
+        "_manager",
+        "_principal",
+    )
+
+    def __init__(
+        self, manager: AbstractTransactionManager, principal: PrincipalCache
+    ) -> None:
         self._manager = manager
+        self._principal = principal
 
     async def execute(self, query: DeleteUserById, /, **kwargs: Any) -> dto.User:
         async with self._manager:
             await self._manager.create_transaction()
 
-            return await UserService(self._manager).delete(id=query.user_id)
+            user = await UserService(self._manager).delete(id=query.user_id)
+
+        await self._principal.invalidate(query.user_id)
+
+        return user
@@ -0,0 +1,31 @@
+from typing import Any, AsyncIterator
+
+from src.common import dto
+from src.database.alchemy.types import OrderByType
+from src.interfaces.command import Command
+from src.interfaces.manager import AbstractTransactionManager
+from src.services.user import UserService
+
+
+class ExportUsers(dto.DTO):
+    order_by: OrderByType = "ASC"
+
+
+class ExportUsersCommand(Command[ExportUsers, AsyncIterator[bytes]]):
+    __slots__ = ("_manager",)
+
+    def __init__(self, export_manager: AbstractTransactionManager) -> None:
+        self._manager = export_manager
+
+    async def execute(
+        self, query: ExportUsers, /, **kwargs: Any
+    ) -> AsyncIterator[bytes]:
+        return self._export(query)
+
+    async def _export(self, query: ExportUsers) -> AsyncIterator[bytes]:
+        # the connection is held while the response is sent, the next partition
+        # is fetched only once the client took the previous one
+        async with self._manager:
+            await self._manager.create_transaction()
+            async for users in UserService(self._manager).export(query.order_by):
+                yield "".join(f"{user}\n" for user in users).encode()
@@ -1,15 +1,24 @@
 import uuid
-from typing import Any, Sequence
+from typing import Any, Final, Sequence, get_args
 
 from msgspec import field
 
 from src.common import dto
-from src.database.alchemy.types import OrderByType
+from src.database.alchemy import entity
+from src.database.alchemy.queries.tools import loaded_tables
+from src.database.alchemy.types import CountType, OrderByType
 from src.database.alchemy.types.user import LoadsType
 from src.interfaces.command import Command
 from src.interfaces.manager import AbstractTransactionManager
+from src.services.cache.query import QueryCache
 from src.services.user import UserService
 
+# a user is returned with its roles and permissions, changes to them do not
+# touch the user row
+_USER_TABLES: Final[frozenset[str]] = loaded_tables(
+    *get_args(LoadsType), model=entity.User
+)
+
 
 class GetUserById(dto.DTO):
     id: uuid.UUID
@@ -19,8 +28,8 @@ class GetUserById(dto.DTO):
 class GetUserCommand(Command[GetUserById, dto.User]):
     __slots__ = ("_manager",)
 
-    def __init__(self, manager: AbstractTransactionManager) -> None:
-        self._manager = manager
+    def __init__(self, read_manager: AbstractTransactionManager) -> None:
+        self._manager = read_manager
 
     async def execute(self, query: GetUserById, /, **kwargs: Any) -> dto.User:
         async with self._manager:
@@ -31,21 +40,92 @@ class GetManyUsersByOffset(dto.DTO):
     order_by: OrderByType
     offset: int | None = None
     limit: int | None = None
+    count: CountType = "exact"
     s: Sequence[LoadsType] = field(default_factory=list)
 
 
 class GetManyUsersByOffsetCommand(
-    Command[GetManyUsersByOffset, tuple[int, list[dto.User]]]
+    Command[GetManyUsersByOffset, tuple[int, list[dto.User], CountType]]
 ):
     __slots__ = ("_manager",)
 
-    def __init__(self, manager: AbstractTransactionManager) -> None:
-        self._manager = manager
+    def __init__(self, read_manager: AbstractTransactionManager) -> None:
+        self._manager = read_manager
 
     async def execute(
         self, query: GetManyUsersByOffset, /, **kwargs: Any
-    ) -> tuple[int, list[dto.User]]:
+    ) -> tuple[int, list[dto.User], CountType]:
         async with self._manager:
             return await UserService(self._manager).get_many(
                 *query.s, **query.to_dict(exclude={"s"})
             )
+
+
+class GetManyUsersByCursor(dto.DTO):
+    order_by: OrderByType
+    limit: int
+    cursor: str | None = None
+    s: Sequence[LoadsType] = field(default_factory=list)
+
+
+class GetManyUsersByCursorCommand(
+    Command[GetManyUsersByCursor, tuple[list[dto.User], str | None]]
+):
+    __slots__ = ("_manager",)
+
+    def __init__(self, read_manager: AbstractTransactionManager) -> None:
+        self._manager = read_manager
+
+    async def execute(
+        self, query: GetManyUsersByCursor, /, **kwargs: Any
+    ) -> tuple[list[dto.User], str | None]:
+        async with self._manager:
+            return await UserService(self._manager).get_many_by_cursor(
+                *query.s, **query.to_dict(exclude={"s"})
+            )
+
+
+class GetUserVersion(dto.DTO):
+    id: uuid.UUID
+
+
+class GetUserVersionCommand(Command[GetUserVersion, str]):
+    __slots__ = (
+        "_manager",
+        "_query_cache",
+    )
+
+    def __init__(
+        self, read_manager: AbstractTransactionManager, query_cache: QueryCache
+    ) -> None:
+        self._manager = read_manager
+        self._query_cache = query_cache
+
+    async def execute(self, query: GetUserVersion, /, **kwargs: Any) -> str:
+        async with self._manager:
+            version = await UserService(self._manager).get_version(id=query.id)
+
+        return f"{version}:{await self._query_cache.generation(_USER_TABLES)}"
+
+
+class GetManyUsersVersion(dto.DTO):
+    pass
+
+
+class GetManyUsersVersionCommand(Command[GetManyUsersVersion, str]):
+    __slots__ = (
+        "_manager",
+        "_query_cache",
+    )
+
+    def __init__(
+        self, read_manager: AbstractTransactionManager, query_cache: QueryCache
+    ) -> None:
+        self._manager = read_manager
+        self._query_cache = query_cache
+
+    async def execute(self, query: GetManyUsersVersion, /, **kwargs: Any) -> str:
+        async with self._manager:
+            version = await UserService(self._manager).get_many_version()
+
+        return f"{version}:{await self._query_cache.generation(_USER_TABLES)}"
@@ -0,0 +1,47 @@
+from typing import Any, AsyncIterable
+
+from src.common import dto
+from src.interfaces.command import Command
+from src.interfaces.hasher import AbstractAsyncHasher
+from src.interfaces.manager import AbstractTransactionManager
+from src.services import UserService
+from src.services.importer import ImportFormat, read_users
+from src.services.user import hash_users
+
+
+class ImportUsers(dto.DTO):
+    stream: AsyncIterable[bytes]
+    format: ImportFormat
+
+
+class ImportUsersCommand(Command[ImportUsers, dto.UserImportResult]):
+    __slots__ = (
+        "_manager",
+        "_hasher",
+    )
+
+    def __init__(
+        self, manager: AbstractTransactionManager, hasher: AbstractAsyncHasher
+    ) -> None:
+        self._manager = manager
+        self._hasher = hasher
+
+    async def execute(
+        self, query: ImportUsers, /, **kwargs: Any
+    ) -> dto.UserImportResult:
+        result = dto.UserImportResult()
+        async with self._manager:
+            service = UserService(self._manager)
+            async for batch in read_users(query.stream, query.format, result):
+                # hashed before the transaction of the batch begins. every
+                # batch is committed on its own, a failed import can be sent
+                # again and continues where it stopped
+                data = await hash_users(self._hasher, batch)
+                await self._manager.create_transaction()
+                created = await service.import_many(data)
+                await self._manager.commit()
+
+                result.created += created
+                result.skipped += len(batch) - created
+
+        return result
@@ -3,8 +3,9 @@ from typing import Any
 
 from src.common import dto
 from src.interfaces.command import Command
-from src.interfaces.hasher import AbstractHasher
+from src.interfaces.hasher import AbstractAsyncHasher
 from src.interfaces.manager import AbstractTransactionManager
+from src.services.cache.principal import PrincipalCache
 from src.services.user import UserService
 
 
@@ -17,18 +18,28 @@ class UpdateUserByIdCommand(Command[UpdateUserById, dto.User]):
     __slots__ = (
         "_manager",
         "_hasher",
+        "_principal",
     )
 
     def __init__(
-        self, manager: AbstractTransactionManager, hasher: AbstractHasher
+        self,
+        manager: AbstractTransactionManager,
+        hasher: AbstractAsyncHasher,
+        principal: PrincipalCache,
     ) -> None:
         self._manager = manager
         self._hasher = hasher
+        self._principal = principal
 
     async def execute(self, query: UpdateUserById, /, **kwargs: Any) -> dto.User:
         async with self._manager:
             await self._manager.create_transaction()
 
-            return await UserService(self._manager).update(
+            user = await UserService(self._manager).update(
                 id=query.user_id, hasher=self._hasher, data=query.data
             )
+
+        # only after commit, otherwise a concurrent request may cache the old state again
+        await self._principal.invalidate(query.user_id)
+
+        return user
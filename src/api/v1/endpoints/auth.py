@@ -10,11 +10,12 @@ from litestar import (
 )
 from litestar.datastructures.cookie import Cookie
 from litestar.datastructures.state import State
-from litestar.middleware.rate_limit import RateLimitConfig
+from litestar.middleware.base import DefineMiddleware
 from litestar.params import Body
 
-from src.api.common.docs import TooManyRequests, UnAuthorized
+from src.api.common.docs import ServiceUnavailable, TooManyRequests, UnAuthorized
 from src.api.v1.commands import CommandMediatorProtocol
+from src.api.v1.middlewares.rate_limit import RateLimitMiddleware
 from src.common import dto
 
 
@@ -25,9 +26,13 @@ class AuthController(Controller):
     @post(
         "/login",
         status_code=status_codes.HTTP_200_OK,
-        responses=UnAuthorized.to_spec() | TooManyRequests.to_spec(),
+        responses=UnAuthorized.to_spec()
+        | TooManyRequests.to_spec()
+        | ServiceUnavailable.to_spec(),
         exclude_from_auth=True,
-        middleware=[RateLimitConfig(rate_limit=("minute", 5)).middleware],
+        middleware=[
+            DefineMiddleware(RateLimitMiddleware, name="login", by=("ip", "login"))
+        ],
     )
     async def login_endpoint(
         self,
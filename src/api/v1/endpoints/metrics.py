@@ -0,0 +1,25 @@
+from litestar import get, status_codes
+
+from src.api.common.docs import Forbidden
+from src.api.common.permission import Permission
+from src.services.cache.principal import PrincipalCache
+from src.services.cache.query import QueryCache
+from src.services.cache.tiered import TieredCache
+
+
+@get(
+    "/metrics/cache",
+    status_code=status_codes.HTTP_200_OK,
+    tags=["metrics"],
+    security=[{"BearerToken": []}],
+    guards=[Permission("ADMIN", same_user=False)],
+    responses=Forbidden.to_spec(),
+)
+async def cache_metrics_endpoint(
+    principal: PrincipalCache, tiered_cache: TieredCache, query_cache: QueryCache
+) -> dict[str, dict[str, int | float]]:
+    return {
+        "principal": principal.stats(),
+        "tiered": tiered_cache.stats(),
+        "query": query_cache.stats(),
+    }
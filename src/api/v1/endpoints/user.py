@@ -5,6 +5,7 @@ from litestar import (
     Controller,
     MediaType,
     Request,
+    Response,
     delete,
     get,
     patch,
@@ -12,25 +13,43 @@ from litestar import (
     status_codes,
 )
 from litestar.datastructures.state import State
-from litestar.middleware.rate_limit import RateLimitConfig
+from litestar.middleware.base import DefineMiddleware
 from litestar.openapi.spec import Example
-from litestar.pagination import OffsetPagination
+from litestar.pagination import CursorPagination
 from litestar.params import Body, Parameter
+from litestar.response import Stream
 
 from src.api.common.constants import MAX_PAGINATION_LIMIT, MIN_PAGINATION_LIMIT
-from src.api.common.docs import Conflict, NotFound, TooManyRequests
+from src.api.common.docs import (
+    Conflict,
+    NotFound,
+    ServiceUnavailable,
+    TooManyRequests,
+)
+from src.api.common.pagination import CountedOffsetPagination
 from src.api.common.permission import Permission
+from src.api.common.tools import etag_matches, make_etag, not_modified
 from src.api.v1.commands import CommandMediatorProtocol
 from src.api.v1.commands.user import (
+    CreateManyUsers,
+    DeleteManyUsers,
     DeleteUserById,
+    ExportUsers,
+    GetManyUsersByCursor,
     GetManyUsersByOffset,
+    GetManyUsersVersion,
     GetUserById,
+    GetUserVersion,
+    ImportUsers,
+    UpdateManyUsers,
     UpdateUserById,
 )
+from src.api.v1.middlewares.rate_limit import RateLimitMiddleware
 from src.common import dto
-from src.database.alchemy.types import OrderByType
+from src.database.alchemy.types import CountType, OrderByType
 from src.database.alchemy.types import user as user_types
 from src.database.tools import page_to_offset
+from src.services.importer import ImportFormat
 
 
 class UserController(Controller):
@@ -40,9 +59,11 @@ class UserController(Controller):
     @post(
         status_code=status_codes.HTTP_201_CREATED,
         media_type=MediaType.JSON,
-        responses=Conflict.to_spec() | TooManyRequests.to_spec(),
+        responses=Conflict.to_spec()
+        | TooManyRequests.to_spec()
+        | ServiceUnavailable.to_spec(),
         exclude_from_auth=True,
-        middleware=[RateLimitConfig(rate_limit=("minute", 5)).middleware],
+        middleware=[DefineMiddleware(RateLimitMiddleware, name="signup", by=("ip",))],
     )
     async def create_user_endpoint(
         self,
@@ -55,9 +76,130 @@ class UserController(Controller):
         ],
         mediator: CommandMediatorProtocol,
     ) -> dto.User:
-        created_user = await mediator.send(data)
+        return await mediator.send(data)
+
+    @post(
+        "/bulk",
+        status_code=status_codes.HTTP_201_CREATED,
+        media_type=MediaType.JSON,
+        security=[{"BearerToken": []}],
+        guards=[Permission("ADMIN", same_user=False)],
+        responses=Conflict.to_spec() | ServiceUnavailable.to_spec(),
+    )
+    async def create_many_users_endpoint(
+        self,
+        data: Annotated[
+            CreateManyUsers,
+            Body(
+                title="Create Users",
+                description=(
+                    "Create users in a single transaction. "
+                    "Taken logins are skipped and missing in the response."
+                ),
+            ),
+        ],
+        mediator: CommandMediatorProtocol,
+    ) -> list[dto.User]:
+        return await mediator.send(data)
+
+    @patch(
+        "/bulk",
+        status_code=status_codes.HTTP_200_OK,
+        media_type=MediaType.JSON,
+        security=[{"BearerToken": []}],
+        guards=[Permission("ADMIN", same_user=False)],
+        responses=Conflict.to_spec() | ServiceUnavailable.to_spec(),
+    )
+    async def update_many_users_endpoint(
+        self,
+        data: Annotated[
+            UpdateManyUsers,
+            Body(
+                title="Update Users",
+                description=(
+                    "Update users in a single transaction. "
+                    "Unknown ids are skipped and missing in the response."
+                ),
+            ),
+        ],
+        mediator: CommandMediatorProtocol,
+    ) -> list[dto.User]:
+        return await mediator.send(data)
+
+    @delete(
+        "/bulk",
+        status_code=status_codes.HTTP_200_OK,
+        media_type=MediaType.JSON,
+        security=[{"BearerToken": []}],
+        guards=[Permission("ADMIN", same_user=False)],
+        responses=Conflict.to_spec(),
+    )
+    async def delete_many_users_endpoint(
+        self,
+        data: Annotated[
+            DeleteManyUsers,
+            Body(
+                title="Delete Users",
+                description=(
+                    "Delete users in a single transaction. "
+                    "Unknown ids are skipped and missing in the response."
+                ),
+            ),
+        ],
+        mediator: CommandMediatorProtocol,
+    ) -> list[dto.User]:
+        return await mediator.send(data)
+
+    @post(
+        "/import",
+        status_code=status_codes.HTTP_200_OK,
+        media_type=MediaType.JSON,
+        security=[{"BearerToken": []}],
+        guards=[Permission("ADMIN", same_user=False)],
+        responses=ServiceUnavailable.to_spec(),
+    )
+    async def import_users_endpoint(
+        self,
+        request: Request[dto.User, dto.TokenPayload, State],
+        mediator: CommandMediatorProtocol,
+        format: Annotated[
+            ImportFormat | None,
+            Parameter(
+                default=None,
+                required=False,
+                title="Body format",
+                description=(
+                    "`ndjson` with a `UserCreate` object per line or `csv` with a "
+                    "`login,password` header. Taken from `Content-Type` if omitted"
+                ),
+            ),
+        ],
+    ) -> dto.UserImportResult:
+        if format is None:
+            format = "csv" if "csv" in request.content_type[0] else "ndjson"
+
+        # the body is read while it is imported, however large it is
+        return await mediator.send(ImportUsers(stream=request.stream(), format=format))
 
-        return await mediator.send(GetUserById(id=created_user.id, s=["permissions"]))
+    @get(
+        "/export",
+        status_code=status_codes.HTTP_200_OK,
+        media_type="application/x-ndjson",
+        security=[{"BearerToken": []}],
+        guards=[Permission("ADMIN", same_user=False)],
+    )
+    async def export_users_endpoint(
+        self,
+        mediator: CommandMediatorProtocol,
+        order_by: Annotated[
+            OrderByType, Parameter(default="ASC", required=False, title="Item ordering")
+        ],
+    ) -> Stream:
+        # a `User` object per line, written while the rows are read
+        return Stream(
+            await mediator.send(ExportUsers(order_by=order_by)),
+            media_type="application/x-ndjson",
+        )
 
     @get(
         status_code=status_codes.HTTP_200_OK,
@@ -66,6 +208,7 @@ class UserController(Controller):
     )
     async def get_many_users_by_offset_endpoint(
         self,
+        request: Request[dto.User, dto.TokenPayload, State],
         mediator: CommandMediatorProtocol,
         s: Annotated[
             tuple[user_types.LoadsType, ...],
@@ -91,18 +234,77 @@ class UserController(Controller):
         order_by: Annotated[
             OrderByType, Parameter(default="ASC", required=False, title="Item ordering")
         ],
-    ) -> OffsetPagination[dto.User]:
-        total, items = await mediator.send(
+        count_mode: Annotated[
+            CountType,
+            Parameter(
+                default="exact",
+                required=False,
+                title="Total count mode",
+                description=(
+                    "`exact` runs a separate count, `window` counts in the page "
+                    "query, saving a round trip on small results but reading every "
+                    "matching row. `estimate` uses table statistics and `cached` "
+                    "reuses a recent exact count, both stay cheap on large tables. "
+                    "Not used with `cursor`"
+                ),
+            ),
+        ],
+        cursor: Annotated[
+            str | None,
+            Parameter(
+                default=None,
+                required=False,
+                title="Page cursor",
+                description=(
+                    "Switches to cursor pagination ordered by creation time, "
+                    "send it empty for the first page and then the returned `cursor`. "
+                    "`page` is ignored"
+                ),
+            ),
+        ],
+    ) -> Response[CountedOffsetPagination[dto.User] | CursorPagination[str, dto.User]]:
+        etag = make_etag(
+            await mediator.send(GetManyUsersVersion()),
+            order_by,
+            limit,
+            f"{page}:{count_mode}" if cursor is None else f"cursor:{cursor}",
+            *sorted(set(s)),
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)  # type: ignore[return-value]
+
+        if cursor is not None:
+            users, next_cursor = await mediator.send(
+                GetManyUsersByCursor(
+                    order_by=order_by, limit=limit, cursor=cursor or None, s=s or []
+                )
+            )
+            return Response(
+                CursorPagination[str, dto.User](
+                    items=users, results_per_page=limit, cursor=next_cursor
+                ),
+                headers={"ETag": etag},
+            )
+
+        total, items, counted = await mediator.send(
             GetManyUsersByOffset(
                 order_by=order_by,
                 offset=page_to_offset(page, limit),
                 limit=limit,
+                count=count_mode,
                 s=s or [],
             )
         )
 
-        return OffsetPagination[dto.User](
-            items=items, total=total, limit=limit, offset=limit * page
+        return Response(
+            CountedOffsetPagination[dto.User](
+                items=items,
+                total=total,
+                limit=limit,
+                offset=limit * page,
+                count_mode=counted,
+            ),
+            headers={"ETag": etag},
         )
 
     @get(
@@ -116,8 +318,15 @@ class UserController(Controller):
         self,
         request: Request[dto.User, dto.TokenPayload, State],
         mediator: CommandMediatorProtocol,
-    ) -> dto.User:
-        return await mediator.send(GetUserById(id=request.user.id))
+    ) -> Response[dto.User]:
+        etag = make_etag(await mediator.send(GetUserVersion(id=request.user.id)))
+        if etag_matches(request, etag):
+            return not_modified(etag)  # type: ignore[return-value]
+
+        return Response(
+            await mediator.send(GetUserById(id=request.user.id)),
+            headers={"ETag": etag},
+        )
 
     @get(
         "/{id:uuid}",
@@ -141,9 +350,17 @@ class UserController(Controller):
                 ],
             ),
         ],
+        request: Request[dto.User, dto.TokenPayload, State],
         mediator: CommandMediatorProtocol,
-    ) -> dto.User:
-        return await mediator.send(GetUserById(id=id, s=s or []))
+    ) -> Response[dto.User]:
+        loads = sorted(set(s or []))
+        etag = make_etag(await mediator.send(GetUserVersion(id=id)), *loads)
+        if etag_matches(request, etag):
+            return not_modified(etag)  # type: ignore[return-value]
+
+        return Response(
+            await mediator.send(GetUserById(id=id, s=loads)), headers={"ETag": etag}
+        )
 
     @patch(
         "/{id:uuid}",
@@ -151,7 +368,9 @@ class UserController(Controller):
         media_type=MediaType.JSON,
         security=[{"BearerToken": []}],
         guards=[Permission("ADMIN", same_user=True)],
-        responses=Conflict.to_spec() | NotFound.to_spec(),
+        responses=Conflict.to_spec()
+        | NotFound.to_spec()
+        | ServiceUnavailable.to_spec(),
     )
     async def update_user_by_id_endpoint(
         self,
@@ -15,6 +15,7 @@ from src.api.v1.commands import CommandMediatorProtocol
 from src.api.v1.commands.user import GetUserById
 from src.common import dto
 from src.common.exceptions import NotFoundError, UnAuthorizedError
+from src.services.cache.principal import PrincipalCache
 from src.services.security.jwt import JWTImpl
 
 
@@ -52,7 +53,7 @@ class JWTAuthMiddleware(AbstractAuthenticationMiddleware):
             encoded_token,
             **(
                 await find_and_resolve_simple_dependencies(
-                    connection.app.dependencies, ("jwt", "mediator")
+                    connection.app.dependencies, ("jwt", "mediator", "principal")
                 )
             ),
         )
@@ -64,20 +65,39 @@ class JWTAuthMiddleware(AbstractAuthenticationMiddleware):
         if not payload or payload.type != "access":
             raise UnAuthorizedError("Invalid token provided")
 
-        user = await self.authenticate_user(sub=payload.sub, **kw)
+        if jwt.stateless and payload.epoch is not None:
+            user = await self.authenticate_claims(payload, kw["principal"])
+        else:
+            user = await self.authenticate_user(sub=payload.sub, **kw)
 
         return AuthenticationResult(user=user, auth=payload)
 
+    async def authenticate_claims(
+        self, payload: dto.TokenPayload, principal: PrincipalCache
+    ) -> dto.User:
+        user_id = uuid.UUID(payload.sub)
+        if payload.epoch is None or payload.epoch < await principal.epoch(user_id):
+            raise UnAuthorizedError("Token has been revoked")
+
+        return dto.User(
+            id=user_id, login=payload.login or "", roles=payload.roles or []
+        )
+
     async def authenticate_user(
         self,
         sub: str,
         mediator: CommandMediatorProtocol,
+        principal: PrincipalCache,
     ) -> dto.User:
+        user_id = uuid.UUID(sub)
+        if (user := await principal.get(user_id)) is not None:
+            return user
+
         try:
-            user = await mediator.send(
-                GetUserById(s=["permissions"], id=uuid.UUID(sub))
-            )
+            user = await mediator.send(GetUserById(s=["permissions"], id=user_id))
         except NotFoundError:
             raise UnAuthorizedError("Unauthorized") from None
 
+        await principal.set(user)
+
         return user
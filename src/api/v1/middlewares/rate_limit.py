@@ -0,0 +1,115 @@
+from typing import Final, Literal, Sequence
+
+import msgspec
+from litestar.enums import ScopeType
+from litestar.middleware.base import MiddlewareProtocol
+from litestar.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.api.common.tools import find_and_resolve_simple_dependencies
+from src.common.exceptions import TooManyRequestsError
+from src.services.cache.rate_limit import RateLimiter
+
+RateLimitKey = Literal["ip", "login"]
+MAX_PEEK_BODY_SIZE: Final[int] = 64 * 1024
+
+
+class _LoginBody(msgspec.Struct):
+    login: str | None = None
+
+
+_LOGIN_DECODER: Final[msgspec.json.Decoder[_LoginBody]] = msgspec.json.Decoder(
+    _LoginBody
+)
+
+
+class RateLimitMiddleware(MiddlewareProtocol):
+    __slots__ = (
+        "app",
+        "name",
+        "by",
+    )
+
+    def __init__(
+        self, app: ASGIApp, name: str, by: Sequence[RateLimitKey] = ("ip",)
+    ) -> None:
+        self.app = app
+        self.name = name
+        self.by = by
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != ScopeType.HTTP:
+            await self.app(scope, receive, send)
+            return
+
+        limiter: RateLimiter = (
+            await find_and_resolve_simple_dependencies(
+                scope["app"].dependencies, ("rate_limiter",)
+            )
+        )["rate_limiter"]
+
+        ip = self.client_ip(scope, limiter)
+        identities: list[str] = []
+        if "ip" in self.by:
+            identities.append(f"ip:{ip}")
+        if "login" in self.by:
+            body, receive = await self.peek_body(receive)
+            if login := self.extract_login(body):
+                # per login from one ip, otherwise anyone could lock its owner out
+                identities.append(f"login:{ip}:{login}")
+
+        if retry_after := await limiter.hit(self.name, *identities):
+            raise TooManyRequestsError(
+                "Too many requests, try again later",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+        await self.app(scope, receive, send)
+
+    def client_ip(self, scope: Scope, limiter: RateLimiter) -> str:
+        client = scope.get("client")
+        host = client[0] if client else "anonymous"
+        if not limiter.trusts_proxy(host):
+            return host
+
+        # set by nginx in front of the app, see nginx/nginx.conf
+        for name, value in scope["headers"]:
+            if name == b"x-real-ip":
+                return value.decode("latin-1")
+
+        return host
+
+    def extract_login(self, body: bytes | None) -> str | None:
+        if not body:
+            return None
+        try:
+            login = _LOGIN_DECODER.decode(body).login
+        except msgspec.DecodeError:
+            return None
+
+        return login.strip().lower() if login else None
+
+    async def peek_body(self, receive: Receive) -> tuple[bytes | None, Receive]:
+        # a body over the limit is not looked into, the rest of it is left
+        # to the handler
+        messages: list[Message] = []
+        chunks: list[bytes] = []
+        size = 0
+        body: bytes | None = None
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > MAX_PEEK_BODY_SIZE:
+                break
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                body = b"".join(chunks)
+                break
+
+        async def replay() -> Message:
+            return messages.pop(0) if messages else await receive()
+
+        return body, replay
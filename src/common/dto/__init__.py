@@ -3,7 +3,16 @@ from src.common.dto.permission import Permission
 from src.common.dto.role import ChangeUserRole, Role, RoleCreate, SetRoleToUser
 from src.common.dto.status import Status
 from src.common.dto.token import InternalToken, Token, TokenPayload
-from src.common.dto.user import Fingerprint, User, UserCreate, UserLogin, UserUpdate
+from src.common.dto.user import (
+    Fingerprint,
+    User,
+    UserBulkUpdate,
+    UserCreate,
+    UserImportError,
+    UserImportResult,
+    UserLogin,
+    UserUpdate,
+)
 
 __all__ = (
     "Role",
@@ -14,6 +23,9 @@ __all__ = (
     "UserCreate",
     "UserLogin",
     "UserUpdate",
+    "UserBulkUpdate",
+    "UserImportError",
+    "UserImportResult",
     "Fingerprint",
     "Permission",
     "Status",
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
+import src.common.dto.role as role
 from src.common.dto.base import DTO as DTO
 
 
@@ -17,6 +18,9 @@ class TokenPayload(DTO):
     aud: str | None = None
     jti: str | None = None
     type: str | None = None
+    login: str | None = None
+    roles: list[role.Role] | None = None
+    epoch: int | None = None
 
 
 class InternalToken(DTO):
@@ -8,6 +8,7 @@ from msgspec import UNSET, Meta, UnsetType, field
 import src.common.dto.role as role
 from src.common.dto.base import DTO as DTO
 
+MAX_LOGIN_LENGTH: Final[int] = 55
 MIN_PASSWORD_LENGTH: Final[int] = 8
 MAX_PASSWORD_LENGTH: Final[int] = 32
 
@@ -19,7 +20,7 @@ class User(DTO):
 
 
 class UserCreate(DTO):
-    login: str
+    login: Annotated[str, Meta(max_length=MAX_LOGIN_LENGTH)]
     password: Annotated[
         str,
         Meta(
@@ -45,6 +46,23 @@ class UserUpdate(DTO):
     ) = UNSET
 
 
+class UserBulkUpdate(UserUpdate, kw_only=True):
+    id: uuid.UUID
+
+
+class UserImportError(DTO):
+    line: int
+    message: str
+
+
+class UserImportResult(DTO):
+    created: int = 0
+    # valid, but the login is already taken or repeated in the file
+    skipped: int = 0
+    rejected: int = 0
+    errors: list[UserImportError] = field(default_factory=list)
+
+
 class Fingerprint(DTO):
     fingerprint: str
 
@@ -1,10 +1,23 @@
-from typing import Callable, TypeVar
+import asyncio
+from typing import Any, Awaitable, Callable, Final, TypeVar
 
 DT = TypeVar("DT")
 
+# scheduled tasks are referenced until they finish, the loop keeps weak ones only
+_BACKGROUND: Final[set[asyncio.Task[Any]]] = set()
+
 
 def singleton(value: DT) -> Callable[[], DT]:
     def _factory() -> DT:
         return value
 
     return _factory
+
+
+def call_later(delay: float, func: Callable[..., Awaitable[Any]], *args: Any) -> None:
+    def _start() -> None:
+        task = asyncio.ensure_future(func(*args))
+        _BACKGROUND.add(task)
+        task.add_done_callback(_BACKGROUND.discard)
+
+    asyncio.get_running_loop().call_later(delay, _start)
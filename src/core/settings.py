@@ -46,6 +46,16 @@ class DatabaseSettings(BaseSettings):
     connection_max_overflow: int = 90
     connection_pool_pre_ping: bool = True
     max_connections: int = 100  # postgres default
+    # kept free of the server pools, migrations, the importer and psql use them
+    reserved_connections: int = 10
+    query_cache_ttl: int = 0  # results are not cached
+    # separate pool for long running exports, interactive requests never wait for it
+    export_pool_size: int = 2
+    # a streaming replica of the same database, reads are routed there if set
+    replica_host: str | None = None
+    replica_port: int | None = None
+    replica_max_lag: float = 1.0  # seconds
+    replica_probe_interval: float = 1.0  # seconds
 
     @property
     def url(self) -> str:
@@ -54,6 +64,25 @@ class DatabaseSettings(BaseSettings):
 
         return f"{self.driver}://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
 
+    @property
+    def replica_stale_window(self) -> float:
+        # the longest a replica read may trail a commit, the lag is only probed
+        # every `replica_probe_interval`
+        if not self.replica_url:
+            return 0
+
+        return self.replica_max_lag + self.replica_probe_interval
+
+    @property
+    def replica_url(self) -> str | None:
+        if not self.replica_host or "sqlite" in self.driver:
+            return None
+
+        return (
+            f"{self.driver}://{self.user}:{self.password}"
+            f"@{self.replica_host}:{self.replica_port or self.port}/{self.name}"
+        )
+
 
 class ServerSettings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -82,6 +111,9 @@ class ServerSettings(BaseSettings):
     type: Literal["granian", "uvicorn", "gunicorn"] = "granian"
     workers: int | Literal["max"] = 1
     domain: str = "http://localhost:8080"
+    login_rate_limit: str = "5/minute"
+    signup_rate_limit: str = "5/minute"
+    trusted_proxies: list[str] = []
 
 
 class CipherSettings(BaseSettings):
@@ -98,6 +130,10 @@ class CipherSettings(BaseSettings):
     public_key: str = ""
     access_token_expire_seconds: int = 0
     refresh_token_expire_seconds: int = 0
+    hasher_executor: Literal["thread", "process"] = "thread"
+    hasher_workers: int = 2
+    hasher_queue_size: int = 128
+    stateless_access_tokens: bool = False
 
 
 class RedisSettings(BaseSettings):
@@ -112,6 +148,9 @@ class RedisSettings(BaseSettings):
     host: str = "127.0.0.1"
     port: int = 6379
     password: str | None = None
+    principal_ttl: int = 300
+    local_cache_ttl: int = 30
+    local_cache_size: int = 10_000
 
 
 class Settings(BaseSettings):
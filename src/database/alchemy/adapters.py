@@ -4,6 +4,7 @@ from typing import Any, Generator, cast
 
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
+    AsyncEngine,
     AsyncSession,
     AsyncSessionTransaction,
     AsyncTransaction,
@@ -155,10 +156,14 @@ class AlchemyAsyncSessionTransactionAdapter:
 
 
 class AlchemyAsyncSessionConnectionAdapter:
-    __slots__ = ("_conn",)
+    __slots__ = (
+        "_conn",
+        "_bind",
+    )
 
     def __init__(self, conn: AsyncSession) -> None:
         self._conn = conn
+        self._bind: AsyncConnection | None = None
 
     def __await__(self) -> Generator[None, None, AbstractAsyncConnection]:
         return cast(
@@ -176,6 +181,11 @@ class AlchemyAsyncSessionConnectionAdapter:
         return await self._conn.__aexit__(*args)
 
     async def start(self, **kw: Any) -> AbstractAsyncConnection:
+        # once started the session runs on a connection of its own, ending a
+        # transaction does not hand it back to the pool, only `close` does
+        if self._bind is None and isinstance(self._conn.bind, AsyncEngine):
+            self._bind = await self._conn.bind.connect()
+            self._conn.sync_session.bind = self._bind.sync_connection
         return cast(AbstractAsyncConnection, self)
 
     async def execute(self, *args: Any, **kw: Any) -> Any:
@@ -185,7 +195,12 @@ class AlchemyAsyncSessionConnectionAdapter:
         return await self._conn.stream(*args, **kw)
 
     async def close(self) -> None:
-        return await self._conn.close()
+        try:
+            await self._conn.close()
+        finally:
+            if (bind := self._bind) is not None:
+                self._bind = None
+                await bind.close()
 
     async def commit(self) -> None:
         return await self._conn.commit()
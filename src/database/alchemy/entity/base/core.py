@@ -1,14 +1,20 @@
 import re
-from typing import Any, Dict, TypeVar
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Self, TypeVar
 
+import msgspec
+from sqlalchemy import inspect
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm.attributes import set_committed_value
 
 EntityType = TypeVar("EntityType", bound="Entity")
 
 
 class Entity(DeclarativeBase):
     __abstract__: bool = True
+    # columns left out of `as_dict(secrets=False)`, e.g. password hashes
+    __secret__: tuple[str, ...] = ()
     id: Any
 
     @declared_attr.directive
@@ -23,18 +29,50 @@ class Entity(DeclarativeBase):
         )
         return f"{type(self).__name__}({params})"
 
-    def as_dict(self) -> Dict[str, Any]:
+    def as_dict(self, secrets: bool = True) -> Dict[str, Any]:
         return {
-            attr: _convert(value)
+            attr: _convert(value, secrets)
             for attr, value in self.__dict__.items()
-            if not attr.startswith("_")
+            if not attr.startswith("_") and (secrets or attr not in self.__secret__)
         }
 
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Self:
+        # reverse of `as_dict`, values are set as already loaded from the database
+        mapper = inspect(cls)
+        entity = mapper.class_manager.new_instance()
+        types = _column_types(cls)
+        for attr, value in data.items():
+            if attr in mapper.relationships:
+                target = mapper.relationships[attr].mapper.class_
+                if isinstance(value, list):
+                    value = [target.from_dict(v) for v in value]
+                elif value is not None:
+                    value = target.from_dict(value)
+            elif value is not None and attr in types:
+                value = msgspec.convert(value, types[attr], strict=False)
+
+            set_committed_value(entity, attr, value)
+
+        return entity
+
+
+@lru_cache
+def _column_types(entity: type[Entity]) -> dict[str, type[Any]]:
+    types = {}
+    for attr in inspect(entity).column_attrs:
+        try:
+            types[attr.key] = attr.columns[0].type.python_type
+        except NotImplementedError:
+            continue
+
+    return types
+
 
-def _convert(v: Any) -> Any:
+def _convert(v: Any, secrets: bool = True) -> Any:
     if isinstance(v, Entity):
-        return v.as_dict()
+        return v.as_dict(secrets)
     elif isinstance(v, (list, tuple, set)):
-        return type(v)(_convert(_v) for _v in v)
+        return type(v)(_convert(_v, secrets) for _v in v)
 
     return v
@@ -21,10 +21,15 @@ class User(mixins.WithUUIDMixin, mixins.WithTimeMixin, Entity):
         secondary=UserRole.__table__,
     )
 
+    __secret__ = ("password",)
     __table_args__ = (
         Index(
             "idx_lower_login",
             func.lower(login),
             unique=True,
         ),
+        # keeps the version of the users list an index lookup
+        Index("idx_user_updated_at", "updated_at"),
+        # keyset pagination, see `GetManyByCursor`
+        Index("idx_user_created_at_id", "created_at", "id"),
     )
@@ -1,19 +1,67 @@
-from typing import Any, Generic, Self, Sequence, get_args, get_origin
-
-from sqlalchemy import ColumnExpressionArgument, Select, exists, func, update
+from typing import (
+    Any,
+    AsyncIterator,
+    ClassVar,
+    Final,
+    Generic,
+    Hashable,
+    Iterator,
+    Mapping,
+    Self,
+    Sequence,
+    TypeVar,
+    get_args,
+    get_origin,
+)
+
+from sqlalchemy import (
+    ColumnExpressionArgument,
+    Row,
+    Select,
+    column,
+    delete,
+    exists,
+    func,
+    text,
+    tuple_,
+    update,
+    values,
+)
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from src.common.cache import TTLCache
 from src.database.alchemy.entity.base import Entity, EntityType
-from src.database.alchemy.queries.tools import select_with_relationships
-from src.database.alchemy.types import OrderByType
+from src.database.alchemy.queries.tools import (
+    in_array,
+    select_with_relationships,
+    where_clauses,
+)
+from src.database.alchemy.types import CountType, OrderByType
 from src.interfaces.command import Query, R
 
+COUNT_CACHE_TTL: Final[int] = 30
+# per process, a count may be off by the writes of the last COUNT_CACHE_TTL seconds
+_COUNTS: Final[TTLCache[Hashable, int]] = TTLCache(maxsize=1024, ttl=COUNT_CACHE_TTL)
+# postgres protocol limit of bind parameters in a single statement
+MAX_BIND_PARAMS: Final[int] = 32767
+
+T = TypeVar("T")
+
+
+def _chunks(rows: Sequence[T], params_per_row: int) -> Iterator[Sequence[T]]:
+    size = max(1, MAX_BIND_PARAMS // max(1, params_per_row))
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
 
 class BaseQuery(Query[AsyncSession, R], Generic[EntityType, R]):
     __slots__ = ("kw",)
     _entity: type[EntityType]
+    # read only queries may be served from the query cache,
+    # any other one invalidates it for its table
+    readonly: ClassVar[bool] = False
 
     def __init__(self, **kw: Any) -> None:
         self.kw = kw
@@ -57,13 +105,17 @@ class Create(BaseQuery[EntityType, EntityType | None]):
         return result.first()
 
 
-class GetManyByOffset(BaseQuery[EntityType, tuple[int, Sequence[EntityType]]]):
+class GetManyByOffset(
+    BaseQuery[EntityType, tuple[int, Sequence[EntityType], CountType]]
+):
     __slots__ = (
         "loads",
         "offset",
         "limit",
         "order_by",
+        "count",
     )
+    readonly = True
 
     def __init__(
         self,
@@ -71,27 +123,83 @@ class GetManyByOffset(BaseQuery[EntityType, tuple[int, Sequence[EntityType]]]):
         order_by: OrderByType = "ASC",
         offset: int | None = None,
         limit: int | None = None,
+        count: CountType = "exact",
         **kw: Any,
     ) -> None:
+        super().__init__(**kw)
         self.loads = loads
         self.order_by = order_by
         self.offset = offset
         self.limit = limit
-        self.clauses = [
-            getattr(self.entity, k) == v for k, v in kw.items() if v is not None
-        ]
+        self.clauses = where_clauses(self.entity, **kw)
+        # statistics only know the size of the whole table
+        self.count: CountType = (
+            "window" if count == "estimate" and self.clauses else count
+        )
 
     async def execute(
         self, conn: AsyncSession, /, **kw: Any
-    ) -> tuple[int, Sequence[EntityType]]:
-        count = (await conn.scalar(self._count_stmt())) or 0
-
-        if count <= 0:
-            return count, []
+    ) -> tuple[int, Sequence[EntityType], CountType]:
+        # the mode actually used is returned, it may differ from the requested
+        if self.count == "window":
+            return await self._window(conn)
+
+        count: int | None = None
+        mode: CountType = self.count
+        if mode == "estimate":
+            count = await self._estimate(conn)
+        elif mode == "cached":
+            count = await self._cached_count(conn)
+
+        if count is None:
+            # also when the table has no statistics yet
+            count, mode = await self._exact_count(conn), "exact"
+
+        # estimated and cached counts may lag behind, the page decides then
+        if count <= 0 and mode == "exact":
+            return count, [], mode
 
         items: Any = (await conn.scalars(self._stmt())).all()
 
-        return count, items
+        return count, items, mode
+
+    async def _window(
+        self, conn: AsyncSession
+    ) -> tuple[int, Sequence[EntityType], CountType]:
+        rows = (await conn.execute(self._stmt().add_columns(func.count().over()))).all()
+        if rows:
+            return rows[0][1], [row[0] for row in rows], "window"
+
+        # past the last page there is no row to carry the count
+        if self.offset:
+            return await self._exact_count(conn), [], "exact"
+
+        return 0, [], "window"
+
+    async def _estimate(self, conn: AsyncSession) -> int | None:
+        estimate = await conn.scalar(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = CAST(:table AS regclass)"
+            ),
+            {"table": f'"{self.entity.__table__.name}"'},
+        )
+        # -1 until the table is vacuumed or analyzed for the first time
+        if estimate is None or estimate < 0:
+            return None
+
+        return int(estimate)
+
+    async def _cached_count(self, conn: AsyncSession) -> int:
+        key = (self.entity.__table__.name, tuple(sorted(self.kw.items())))
+        if (count := _COUNTS.get(key)) is None:
+            count = await self._exact_count(conn)
+            _COUNTS.set(key, count)
+
+        return count
+
+    async def _exact_count(self, conn: AsyncSession) -> int:
+        return (await conn.scalar(self._count_stmt())) or 0
 
     def _stmt(
         self, *additional_clauses: ColumnExpressionArgument[bool]
@@ -115,31 +223,132 @@ class GetManyByOffset(BaseQuery[EntityType, tuple[int, Sequence[EntityType]]]):
         return stmt.where(*(self.clauses + list(additional_clauses)))
 
 
+class GetManyByCursor(BaseQuery[EntityType, tuple[Sequence[EntityType], bool]]):
+    __slots__ = (
+        "loads",
+        "after",
+        "limit",
+        "order_by",
+        "clauses",
+    )
+    readonly = True
+
+    def __init__(
+        self,
+        *loads: str,
+        limit: int,
+        order_by: OrderByType = "ASC",
+        after: tuple[Any, Any] | None = None,
+        **kw: Any,
+    ) -> None:
+        super().__init__(**kw)
+        self.loads = loads
+        self.limit = limit
+        self.order_by = order_by
+        self.after = after
+        self.clauses = where_clauses(self.entity, **kw)
+
+    async def execute(
+        self, conn: AsyncSession, /, **kw: Any
+    ) -> tuple[Sequence[EntityType], bool]:
+        # one extra row tells whether there is a next page
+        items: Any = (await conn.scalars(self._stmt())).all()
+
+        return items[: self.limit], len(items) > self.limit
+
+    def _stmt(self) -> Select[tuple[EntityType]]:
+        # keyset on (created_at, id), served by an index on the same columns,
+        # so every page costs the same whatever its depth
+        columns = (self.entity.created_at, self.entity.id)  # type: ignore[attr-defined]
+        ascending = self.order_by.upper() == "ASC"
+        stmt = (
+            select_with_relationships(*self.loads, model=self.entity)
+            .where(*self.clauses)
+            .order_by(*(c.asc() if ascending else c.desc() for c in columns))
+            .limit(self.limit + 1)
+        )
+        if self.after is not None:
+            key, after = tuple_(*columns), tuple_(*self.after)
+            stmt = stmt.where(key > after if ascending else key < after)
+
+        return stmt
+
+
+class Stream(BaseQuery[EntityType, AsyncIterator[Sequence[Row[Any]]]]):
+    __slots__ = (
+        "columns",
+        "order_by",
+        "partition_size",
+    )
+    readonly = True
+
+    def __init__(
+        self,
+        *columns: str,
+        order_by: OrderByType = "ASC",
+        partition_size: int = 1000,
+    ) -> None:
+        super().__init__()
+        self.columns = columns
+        self.order_by = order_by
+        self.partition_size = partition_size
+
+    async def execute(
+        self, conn: AsyncSession, /, **kw: Any
+    ) -> AsyncIterator[Sequence[Row[Any]]]:
+        # a server side cursor, the next partition is fetched once the previous
+        # one was consumed, it must be read inside of the transaction
+        result = await conn.stream(
+            self._stmt().execution_options(yield_per=self.partition_size)
+        )
+
+        return result.partitions()
+
+    def _stmt(self) -> Select[Any]:
+        return select(*(getattr(self.entity, name) for name in self.columns)).order_by(
+            self.entity.id.asc()
+            if self.order_by.upper() == "ASC"
+            else self.entity.id.desc()
+        )
+
+
 class Get(BaseQuery[EntityType, EntityType | None]):
     __slots__ = (
         "loads",
         "clauses",
         "lock_for_update",
+        "secrets",
     )
+    readonly = True
 
-    def __init__(self, *loads: str, lock_for_update: bool = False, **kw: Any) -> None:
+    def __init__(
+        self,
+        *loads: str,
+        lock_for_update: bool = False,
+        secrets: bool = False,
+        **kw: Any,
+    ) -> None:
         assert kw, "At least one identifier must be provided"
         super().__init__(**kw)
         self.loads = loads
         self.lock_for_update = lock_for_update
-        self.clauses = [
-            getattr(self.entity, k) == v for k, v in self.kw.items() if v is not None
-        ]
+        # secret columns are never cached, an entity that needs them is read
+        # from the database
+        self.secrets = secrets
+        self.clauses = where_clauses(self.entity, **self.kw)
 
     async def execute(self, conn: AsyncSession, /, **kw: Any) -> EntityType | None:
+        result = (await conn.scalars(self._stmt())).first()
+
+        return result
+
+    def _stmt(self) -> Select[tuple[EntityType]]:
         stmt = select_with_relationships(*self.loads, model=self.entity)
 
         if self.lock_for_update:
             stmt = stmt.with_for_update()
 
-        result = (await conn.scalars(stmt.where(*self.clauses))).first()
-
-        return result
+        return stmt.where(*self.clauses)
 
 
 class Update(BaseQuery[EntityType, EntityType | None]):
@@ -167,27 +376,112 @@ class Delete(BaseQuery[EntityType, EntityType | None]):
         self.clauses = [self.entity.id == id]
 
     async def execute(self, conn: AsyncSession, /, **kw: Any) -> EntityType | None:
-        result = (await conn.scalars(select(self.entity).where(*self.clauses))).first()
-        if result:
-            # to cascades capability
-            await conn.delete(result)
+        # related rows are removed by the `ON DELETE CASCADE` of their foreign keys
+        result = await conn.scalars(
+            delete(self.entity).where(*self.clauses).returning(self.entity)
+        )
 
-        return result
+        return result.first()
 
 
 class Exists(BaseQuery[EntityType, bool]):
     __slots__ = ("clauses",)
+    readonly = True
 
     def __init__(self, **kw: Any) -> None:
         assert kw, "At least one identifier must be provided"
         super().__init__(**kw)
-        self.clauses = [
-            getattr(self.entity, k) == v for k, v in self.kw.items() if v is not None
-        ]
+        self.clauses = where_clauses(self.entity, **self.kw)
 
     async def execute(self, conn: AsyncSession, /, **kw: Any) -> bool:
-        is_exist = await conn.scalar(
-            exists(select(self.entity.id).where(*self.clauses)).select()
-        )
+        is_exist = await conn.scalar(self._stmt())
 
         return bool(is_exist)
+
+    def _stmt(self) -> Select[tuple[bool]]:
+        return exists(select(self.entity.id).where(*self.clauses)).select()
+
+
+class BulkCreate(BaseQuery[EntityType, Sequence[EntityType]]):
+    __slots__ = ("rows",)
+
+    def __init__(self, *rows: Mapping[str, Any]) -> None:
+        super().__init__()
+        self.rows = rows
+
+    async def execute(self, conn: AsyncSession, /, **kw: Any) -> Sequence[EntityType]:
+        created: list[EntityType] = []
+        # client side defaults are bound too, so every column may take a parameter
+        for chunk in _chunks(self.rows, len(self.entity.__table__.columns)):
+            result = await conn.scalars(
+                insert(self.entity)
+                .on_conflict_do_nothing()
+                .values(list(chunk))
+                .returning(self.entity)
+            )
+            created.extend(result.all())
+
+        return created
+
+
+class BulkUpdate(BaseQuery[EntityType, Sequence[EntityType]]):
+    __slots__ = ("rows",)
+
+    def __init__(self, *rows: Mapping[str, Any]) -> None:
+        super().__init__()
+        self.rows = rows
+
+    async def execute(self, conn: AsyncSession, /, **kw: Any) -> Sequence[EntityType]:
+        # one statement per set of changed columns, the last change of an id wins
+        groups: dict[tuple[str, ...], dict[Any, Mapping[str, Any]]] = {}
+        for row in self.rows:
+            keys = tuple(sorted(key for key in row if key != "id"))
+            if keys:
+                groups.setdefault(keys, {})[row["id"]] = row
+
+        table = self.entity.__table__
+        updated: list[EntityType] = []
+        for keys, rows in groups.items():
+            names = ("id", *keys)
+            for chunk in _chunks(list(rows.values()), len(names)):
+                data = values(
+                    *(column(name, table.c[name].type) for name in names),
+                    name="data",
+                ).data([tuple(row[name] for name in names) for row in chunk])
+                stmt = (
+                    update(self.entity)
+                    .where(self.entity.id == data.c.id)
+                    .values({key: data.c[key] for key in keys})
+                    .returning(self.entity)
+                )
+                # values come from the data rows and can not be synchronized
+                # in place, objects already in the session are loaded again
+                result = await conn.scalars(
+                    select(self.entity)
+                    .from_statement(stmt)
+                    .execution_options(populate_existing=True)
+                )
+                updated.extend(result.all())
+
+        return updated
+
+
+class BulkDelete(BaseQuery[EntityType, Sequence[EntityType]]):
+    __slots__ = ("ids",)
+
+    def __init__(self, *ids: Any) -> None:
+        super().__init__()
+        self.ids = ids
+
+    async def execute(self, conn: AsyncSession, /, **kw: Any) -> Sequence[EntityType]:
+        if not self.ids:
+            return []
+
+        # related rows go with the foreign keys `ON DELETE CASCADE`
+        result = await conn.scalars(
+            delete(self.entity)
+            .where(in_array(self.entity.id, self.ids))
+            .returning(self.entity)
+        )
+
+        return result.all()
@@ -0,0 +1,108 @@
+from types import UnionType
+from typing import (
+    Any,
+    Final,
+    Generic,
+    Mapping,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
+
+import msgspec
+from sqlalchemy import Row, Select, inspect, select
+
+from src.database.alchemy.entity.base import Entity
+
+StructType = TypeVar("StructType", bound=msgspec.Struct)
+
+_MATERIALIZERS: Final[dict[tuple[type[Any], type[Entity]], "Materializer[Any]"]] = {}
+
+
+class Materializer(Generic[StructType]):
+    __slots__ = (
+        "struct",
+        "model",
+        "columns",
+        "relations",
+    )
+
+    def __init__(self, struct: type[StructType], model: type[Entity]) -> None:
+        self.struct = struct
+        self.model = model
+        self.columns: tuple[str, ...] = ()
+        # field name, materializer of its items, whether it holds a list
+        self.relations: tuple[tuple[str, Materializer[Any], bool], ...] = ()
+
+    def select(self) -> Select[Any]:
+        # only the columns the struct has, rows come back in its field order
+        return select(*(getattr(self.model, name) for name in self.columns))
+
+    def from_entity(self, entity: Entity) -> StructType:
+        # reads the loaded state only, an unloaded relationship is left default
+        state = entity.__dict__
+        values = {name: state[name] for name in self.columns if name in state}
+        for name, materializer, many in self.relations:
+            if (value := state.get(name)) is None:
+                continue
+            values[name] = (
+                [materializer.from_entity(item) for item in value]
+                if many
+                else materializer.from_entity(value)
+            )
+
+        return self.struct(**values)
+
+    def from_row(self, row: Row[Any] | Mapping[str, Any]) -> StructType:
+        mapping = row._mapping if isinstance(row, Row) else row
+        return self.struct(
+            **{name: mapping[name] for name in self.columns if name in mapping}
+        )
+
+    def _bind(self) -> None:
+        mapper = inspect(self.model)
+        columns = []
+        relations = []
+        for field in msgspec.structs.fields(self.struct):
+            if field.name in mapper.column_attrs:
+                columns.append(field.name)
+            elif field.name in mapper.relationships:
+                item, many = _item_type(field.type)
+                relations.append(
+                    (
+                        field.name,
+                        materializer(
+                            item, mapper.relationships[field.name].mapper.class_
+                        ),
+                        many,
+                    )
+                )
+
+        self.columns = tuple(columns)
+        self.relations = tuple(relations)
+
+
+def _item_type(tp: Any) -> tuple[type[msgspec.Struct], bool]:
+    origin = get_origin(tp)
+    if origin in (list, tuple, set, frozenset):
+        return get_args(tp)[0], True
+    if origin in (Union, UnionType):
+        # `Struct | None`
+        return next(arg for arg in get_args(tp) if arg is not type(None)), False
+
+    return tp, False
+
+
+def materializer(
+    struct: type[StructType], model: type[Entity]
+) -> Materializer[StructType]:
+    key = (struct, model)
+    if (found := _MATERIALIZERS.get(key)) is not None:
+        return found
+
+    # registered before its relations are resolved, so cycles end here
+    _MATERIALIZERS[key] = found = Materializer(struct, model)
+    found._bind()
+
+    return found
@@ -17,6 +17,13 @@ class Create(base.Create[Role]):
         super().__init__(name=name)
 
 
+class BulkCreate(base.BulkCreate[Role]):
+    __slots__ = ()
+
+    def __init__(self, *names: role.RoleType) -> None:
+        super().__init__(*({"name": name} for name in names))
+
+
 class Get(base.Get[Role]):
     __slots__ = ()
 
@@ -41,6 +48,15 @@ class SetToUser(base.Create[UserRole]):
         super().__init__(user_id=user_id, role_id=role_id)
 
 
+class BulkSetToUsers(base.BulkCreate[UserRole]):
+    __slots__ = ()
+
+    def __init__(self, *user_ids: uuid.UUID, role_id: uuid.UUID) -> None:
+        super().__init__(
+            *({"user_id": user_id, "role_id": role_id} for user_id in user_ids)
+        )
+
+
 class ChangeUserRole(base.BaseQuery[UserRole, int]):
     __slots__ = ()
 
@@ -2,12 +2,15 @@ from collections import deque
 from functools import lru_cache
 from typing import (
     Any,
+    Iterable,
     ParamSpec,
     TypeVar,
 )
 
-from sqlalchemy import Select, select
+from sqlalchemy import ColumnElement, Select, any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Load, RelationshipProperty, joinedload, subqueryload
+from sqlalchemy.sql.functions import Function
 
 from src.database.alchemy.entity import MODELS_RELATIONSHIPS_NODE
 from src.database.alchemy.entity.base import Entity, EntityType
@@ -65,6 +68,54 @@ def _construct_loads(
     return load
 
 
+@lru_cache
+def lower_indexed_columns(model: type[Entity]) -> frozenset[str]:
+    columns = set()
+    for index in model.__table__.indexes:
+        expressions = index.expressions
+        if (
+            len(expressions) == 1
+            and isinstance(expressions[0], Function)
+            and expressions[0].name == "lower"
+        ):
+            columns.update(column.key for column in expressions[0].clauses)
+
+    return frozenset(columns)
+
+
+def equals(model: type[Entity], key: str, value: Any) -> ColumnElement[bool]:
+    column = getattr(model, key)
+    # `column = :value` can not use an index on `lower(column)`
+    if isinstance(value, str) and key in lower_indexed_columns(model):
+        return func.lower(column) == func.lower(value)
+
+    return column == value  # type: ignore[no-any-return]
+
+
+def in_array(column: Any, values: Iterable[Any]) -> ColumnElement[bool]:
+    # `= ANY(:values)` binds a single array whatever the number of values,
+    # `IN` would take a parameter for each of them
+    return column == any_(  # type: ignore[no-any-return]
+        bindparam(None, list(values), type_=ARRAY(column.type))
+    )
+
+
+def where_clauses(model: type[Entity], **kw: Any) -> list[ColumnElement[bool]]:
+    return [equals(model, k, v) for k, v in kw.items() if v is not None]
+
+
+@lru_cache
+def loaded_tables(*_should_load: str, model: type[Entity]) -> frozenset[str]:
+    tables = {model.__table__.name}
+    for load in _should_load:
+        for relationship in _bfs_search(model, load):
+            tables.add(relationship.mapper.class_.__table__.name)
+            if relationship.secondary is not None:
+                tables.add(relationship.secondary.name)
+
+    return frozenset(tables)
+
+
 @lru_cache
 def select_with_relationships(
     *_should_load: str,
@@ -1,9 +1,31 @@
 import uuid
+from datetime import datetime
 from typing import Any, Unpack, overload
 
-from src.database.alchemy.entity import User
+from sqlalchemy import (
+    ColumnElement,
+    ScalarSelect,
+    Select,
+    Text,
+    cast,
+    column,
+    func,
+    literal,
+    literal_column,
+    select,
+    table,
+    text,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.alchemy.entity import Permission, Role, RolePermission, User, UserRole
 from src.database.alchemy.queries import base
-from src.database.alchemy.types import OrderByType, user
+from src.database.alchemy.queries.tools import in_array, where_clauses
+from src.database.alchemy.types import CountType, OrderByType, user
+from src.database.alchemy.types.role import RoleType
 
 
 class Create(base.Create[User]):
@@ -13,19 +35,96 @@ class Create(base.Create[User]):
         super().__init__(**data)
 
 
+class Signup(base.BaseQuery[User, str | None]):
+    __slots__ = (
+        "login",
+        "password",
+        "role",
+    )
+
+    def __init__(self, login: str, password: str, role: RoleType = "USER") -> None:
+        super().__init__()
+        self.login = login
+        self.password = password
+        self.role = role
+
+    async def execute(self, conn: AsyncSession, /, **kw: Any) -> str | None:
+        return await conn.scalar(self._stmt())
+
+    def _stmt(self) -> Select[tuple[str]]:
+        created = (
+            insert(self.entity)
+            .values(login=self.login, password=self.password)
+            .on_conflict_do_nothing()
+            .returning(self.entity.id, self.entity.login)
+            .cte("created")
+        )
+        assigned = (
+            insert(UserRole)
+            .from_select(
+                ["user_id", "role_id"],
+                select(created.c.id, Role.id)
+                .join_from(created, Role, true())
+                .where(*where_clauses(Role, name=self.role)),
+                include_defaults=False,
+            )
+            .returning(UserRole.user_id, UserRole.role_id)
+            .cte("assigned")
+        )
+        # the statement does not see its own inserts, roles are read through
+        # what `assigned` returned instead of `user_role`
+        roles = (
+            select(
+                _array(
+                    _object(
+                        ("id", "name", "permissions"),
+                        [Role.id, Role.name, _permissions()],
+                    ),
+                    Role.name,
+                )
+            )
+            .join_from(assigned, Role, assigned.c.role_id == Role.id)
+            .where(assigned.c.user_id == created.c.id)
+            .scalar_subquery()
+        )
+
+        return select(
+            cast(
+                _object(
+                    ("id", "login", "roles"), [created.c.id, created.c.login, roles]
+                ),
+                Text,
+            )
+        )
+
+
 class Get(base.Get[User]):
     __slots__ = ()
 
     @overload
     def __init__(
-        self, *_loads: user.LoadsType, lock: bool = False, id: uuid.UUID
+        self,
+        *_loads: user.LoadsType,
+        lock: bool = False,
+        secrets: bool = False,
+        id: uuid.UUID,
     ) -> None: ...
     @overload
     def __init__(
-        self, *_loads: user.LoadsType, lock: bool = False, login: str
+        self,
+        *_loads: user.LoadsType,
+        lock: bool = False,
+        secrets: bool = False,
+        login: str,
     ) -> None: ...
-    def __init__(self, *_loads: user.LoadsType, lock: bool = False, **kw: Any) -> None:
-        super().__init__(*_loads, lock_for_update=lock, **kw)
+    def __init__(
+        self,
+        *_loads: user.LoadsType,
+        lock: bool = False,
+        secrets: bool = False,
+        **kw: Any,
+    ) -> None:
+        super().__init__(*_loads, lock_for_update=lock, secrets=secrets, **kw)
 
 
 class Update(base.Update[User]):
@@ -35,6 +134,31 @@ class Update(base.Update[User]):
         super().__init__(id=id, **data)
 
 
+class Touch(base.Update[User]):
+    __slots__ = ()
+
+    def __init__(self, id: uuid.UUID) -> None:
+        super().__init__(id=id, updated_at=func.now())
+
+
+class TouchMany(base.BaseQuery[User, int]):
+    __slots__ = ("ids",)
+
+    def __init__(self, *ids: uuid.UUID) -> None:
+        super().__init__()
+        self.ids = ids
+
+    async def execute(self, conn: AsyncSession, /, **kw: Any) -> int:
+        result = await conn.execute(
+            update(self.entity)
+            .where(in_array(self.entity.id, self.ids))
+            .values(updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+        return result.rowcount
+
+
 class Delete(base.Delete[User]):
     __slots__ = ()
 
@@ -56,14 +180,242 @@ class Exists(base.Exists[User]):
         super().__init__(**kw)
 
 
+class BulkCreate(base.BulkCreate[User]):
+    __slots__ = ()
+
+    def __init__(self, *rows: user.CreateType) -> None:
+        super().__init__(*rows)
+
+
+class BulkUpdate(base.BulkUpdate[User]):
+    __slots__ = ()
+
+    def __init__(self, *rows: user.BulkUpdateType) -> None:
+        super().__init__(*rows)
+
+
+class BulkDelete(base.BulkDelete[User]):
+    __slots__ = ()
+
+    def __init__(self, *ids: uuid.UUID) -> None:
+        super().__init__(*ids)
+
+
+class Import(base.BaseQuery[User, int]):
+    __slots__ = (
+        "rows",
+        "role_id",
+    )
+    _staging = table("user_import", column("login"), column("password"))
+
+    def __init__(self, *rows: tuple[str, str], role_id: uuid.UUID) -> None:
+        super().__init__()
+        self.rows = rows
+        self.role_id = role_id
+
+    async def execute(self, conn: AsyncSession, /, **kw: Any) -> int:
+        await conn.execute(
+            text(
+                "CREATE TEMP TABLE IF NOT EXISTS user_import "
+                "(login text NOT NULL, password text NOT NULL) ON COMMIT DROP"
+            )
+        )
+        raw = await (await conn.connection()).get_raw_connection()
+        # COPY streams the rows in a single round trip, without bind parameters
+        await raw.driver_connection.copy_records_to_table(  # type: ignore[union-attr]
+            "user_import", records=self.rows, columns=("login", "password")
+        )
+        created = await conn.scalar(self._merge_stmt())
+        await conn.execute(text("TRUNCATE user_import"))
+
+        return created or 0
+
+    def _merge_stmt(self) -> Select[tuple[int]]:
+        staging = self._staging
+        created = (
+            insert(self.entity)
+            .from_select(
+                ["login", "password"],
+                select(staging.c.login, staging.c.password)
+                .distinct(func.lower(staging.c.login))
+                .order_by(func.lower(staging.c.login)),
+                # callable defaults would be evaluated once for every row
+                include_defaults=False,
+            )
+            .on_conflict_do_nothing()
+            .returning(self.entity.id)
+            .cte("created")
+        )
+        assigned = (
+            insert(UserRole)
+            .from_select(
+                ["user_id", "role_id"],
+                select(created.c.id, literal(self.role_id, UserRole.role_id.type)),
+                include_defaults=False,
+            )
+            .returning(UserRole.user_id)
+            .cte("assigned")
+        )
+
+        return select(func.count()).select_from(assigned)
+
+
 class GetManyByOffset(base.GetManyByOffset[User]):
     __slots__ = ()
 
     def __init__(
         self,
         *_loads: user.LoadsType,
-        order_by: OrderByType = 'ASC',
+        order_by: OrderByType = "ASC",
         offset: int | None = None,
         limit: int | None = None,
+        count: CountType = "exact",
     ) -> None:
-        super().__init__(*_loads, order_by=order_by, offset=offset, limit=limit)
+        super().__init__(
+            *_loads, order_by=order_by, offset=offset, limit=limit, count=count
+        )
+
+
+class GetManyByCursor(base.GetManyByCursor[User]):
+    __slots__ = ()
+
+    def __init__(
+        self,
+        *_loads: user.LoadsType,
+        limit: int,
+        order_by: OrderByType = "ASC",
+        after: tuple[datetime, uuid.UUID] | None = None,
+    ) -> None:
+        super().__init__(*_loads, limit=limit, order_by=order_by, after=after)
+
+
+class Stream(base.Stream[User]):
+    __slots__ = ()
+
+
+class StreamAsJson(base.Stream[User]):
+    __slots__ = ("loads",)
+
+    def __init__(
+        self,
+        *_loads: user.LoadsType,
+        order_by: OrderByType = "ASC",
+        partition_size: int = 1000,
+    ) -> None:
+        super().__init__(order_by=order_by, partition_size=partition_size)
+        self.loads = _loads
+
+    def _stmt(self) -> Select[Any]:
+        # a user per row as json, it is written out without being decoded
+        return super()._stmt().add_columns(_user_object(self.loads))
+
+
+class GetVersion(base.BaseQuery[User, str | None]):
+    __slots__ = ()
+    readonly = True
+
+    def __init__(self, id: uuid.UUID) -> None:
+        super().__init__(id=id)
+
+    async def execute(self, conn: AsyncSession, /, **kw: Any) -> str | None:
+        updated_at = await conn.scalar(
+            select(self.entity.updated_at).where(self.entity.id == self.kw["id"])
+        )
+
+        return updated_at.isoformat() if updated_at else None
+
+
+class GetManyVersion(base.BaseQuery[User, str]):
+    __slots__ = ()
+    readonly = True
+
+    async def execute(self, conn: AsyncSession, /, **kw: Any) -> str:
+        # read from the end of idx_user_updated_at instead of counting the
+        # table. inserts and updates move the latest timestamp, deletes made
+        # by the app are seen through the generation of the table
+        updated_at = await conn.scalar(select(func.max(self.entity.updated_at)))
+
+        return updated_at.isoformat() if updated_at else ""
+
+
+class GetAsJson(base.BaseQuery[User, str | None]):
+    __slots__ = ("loads",)
+    readonly = True
+
+    @overload
+    def __init__(self, *_loads: user.LoadsType, id: uuid.UUID) -> None: ...
+    @overload
+    def __init__(self, *_loads: user.LoadsType, login: str) -> None: ...
+    def __init__(self, *_loads: user.LoadsType, **kw: Any) -> None:
+        assert kw, "At least one identifier must be provided"
+        super().__init__(**kw)
+        self.loads = _loads
+
+    async def execute(self, conn: AsyncSession, /, **kw: Any) -> str | None:
+        return await conn.scalar(self._stmt())
+
+    def _stmt(self) -> Select[tuple[str]]:
+        # one statement and one row for the whole tree
+        return select(_user_object(self.loads)).where(
+            *where_clauses(self.entity, **self.kw)
+        )
+
+
+def _user_object(loads: tuple[user.LoadsType, ...]) -> ColumnElement[str]:
+    keys: tuple[str, ...] = ("id", "login")
+    fields: list[Any] = [User.id, User.login]
+    if loads:
+        keys += ("roles",)
+        fields.append(_roles("permissions" in loads))
+
+    # as text so the driver hands it over untouched and it is decoded straight
+    # into the dto
+    return cast(_object(keys, fields), Text)
+
+
+def _object(keys: tuple[str, ...], values: list[Any]) -> ColumnElement[Any]:
+    return func.json_build_object(
+        *(
+            arg
+            for key, value in zip(keys, values, strict=True)
+            for arg in (literal_column(f"'{key}'"), value)
+        )
+    )
+
+
+def _array(element: ColumnElement[Any], order_by: Any) -> ColumnElement[Any]:
+    return func.coalesce(
+        func.json_agg(aggregate_order_by(element, order_by)),
+        literal_column("'[]'::json"),
+    )
+
+
+def _permissions() -> ScalarSelect[Any]:
+    return (
+        select(
+            _array(
+                _object(("id", "name"), [Permission.id, Permission.name]),
+                Permission.name,
+            )
+        )
+        .join_from(
+            RolePermission, Permission, RolePermission.permission_id == Permission.id
+        )
+        .where(RolePermission.role_id == Role.id)
+        .scalar_subquery()
+    )
+
+
+def _roles(with_permissions: bool) -> ScalarSelect[Any]:
+    keys: tuple[str, ...] = ("id", "name")
+    fields: list[Any] = [Role.id, Role.name]
+    if with_permissions:
+        keys += ("permissions",)
+        fields.append(_permissions())
+
+    return (
+        select(_array(_object(keys, fields), Role.name))
+        .join_from(UserRole, Role, UserRole.role_id == Role.id)
+        .where(UserRole.user_id == User.id)
+        .scalar_subquery()
+    )
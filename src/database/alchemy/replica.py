@@ -0,0 +1,85 @@
+import asyncio
+from typing import Callable, Final
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.logger import log
+from src.interfaces.connection import AbstractAsyncConnection
+
+# seconds the replica is behind, 0 when it replayed everything it received
+# or is not a standby at all. null while it receives nothing from the primary,
+# a standby cut off from it has replayed all it got and would look up to date.
+# the status is only visible to pg_read_all_stats (or pg_monitor) members
+LAG_QUERY: Final[str] = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT FROM pg_stat_wal_receiver WHERE status = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+"""
+
+
+class AlchemyReadReplica:
+    __slots__ = (
+        "_engine",
+        "_conn_factory",
+        "max_lag",
+        "probe_interval",
+        "lag",
+    )
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        conn_factory: Callable[[], AbstractAsyncConnection],
+        max_lag: float,
+        probe_interval: float,
+    ) -> None:
+        self._engine = engine
+        self._conn_factory = conn_factory
+        self.max_lag = max_lag
+        self.probe_interval = probe_interval
+        # unknown until the first probe, reads stay on the primary meanwhile
+        self.lag: float | None = None
+
+    def conn_factory(self) -> AbstractAsyncConnection:
+        return self._conn_factory()
+
+    def available(self) -> bool:
+        return self.lag is not None and self.lag <= self.max_lag
+
+    async def probe(self) -> float | None:
+        was_available = self.available()
+        try:
+            async with self._engine.connect() as conn:
+                lag = await conn.scalar(text(LAG_QUERY))
+        except (SQLAlchemyError, OSError) as e:
+            self.lag = None
+            reason = repr(e)
+        else:
+            if lag is None:
+                self.lag = None
+                reason = "it does not stream from the primary"
+            else:
+                self.lag = float(lag)
+                reason = f"lag of {self.lag:.1f}s"
+
+        # only changes are logged, the probe runs every `probe_interval`
+        if was_available and not self.available():
+            log.warning(f"Replica is not used, reading primary: {reason}")
+        elif not was_available and self.available():
+            log.info(f"Replica is used for reads, {reason}")
+
+        return self.lag
+
+    async def run(self) -> None:
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.probe_interval)
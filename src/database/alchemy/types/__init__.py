@@ -3,5 +3,8 @@ from typing import Literal
 from src.database.alchemy.types import role, user
 
 OrderByType = Literal["ASC", "DESC"]
+# exact: separate count(*), window: count(*) OVER () in the page query,
+# estimate: planner statistics, cached: exact count reused for a while
+CountType = Literal["exact", "window", "estimate", "cached"]
 
 __all__ = ("user", "role")
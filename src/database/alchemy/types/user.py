@@ -1,3 +1,4 @@
+import uuid
 from typing import Literal, NotRequired, TypedDict
 
 LoadsType = Literal["roles", "permissions"]
@@ -11,3 +12,7 @@ class CreateType(TypedDict):
 class UpdateType(TypedDict, total=False):
     login: NotRequired[str]
     password: NotRequired[str]
+
+
+class BulkUpdateType(UpdateType):
+    id: uuid.UUID
@@ -0,0 +1,67 @@
+import msgspec
+
+from src.core.settings import DatabaseSettings
+
+
+class ConnectionPlan(msgspec.Struct, frozen=True):
+    workers: int
+    pool_size: int
+    max_overflow: int
+    export_pool_size: int
+    replica_pool_size: int = 0
+    replica_max_overflow: int = 0
+
+    @property
+    def per_worker(self) -> int:
+        return self.pool_size + self.max_overflow + self.export_pool_size
+
+    def describe(self, settings: DatabaseSettings) -> str:
+        plan = (
+            f"{self.workers} worker(s) x (pool {self.pool_size} + overflow "
+            f"{self.max_overflow} + export {self.export_pool_size}) = "
+            f"{self.workers * self.per_worker} of {settings.max_connections} "
+            f"primary connections, {settings.reserved_connections} reserved"
+        )
+        if self.replica_pool_size:
+            plan += (
+                f", {self.workers} worker(s) x (pool {self.replica_pool_size} + "
+                f"overflow {self.replica_max_overflow}) replica connections"
+            )
+
+        return plan
+
+
+def plan_connections(settings: DatabaseSettings, workers: int) -> ConnectionPlan:
+    # every worker owns its pools, together they must fit into what the server
+    # accepts, the configured sizes are upper bounds
+    available = settings.max_connections - settings.reserved_connections
+    required = workers * (settings.export_pool_size + 1)
+    if workers < 1 or available < required:
+        raise ValueError(
+            f"{workers} worker(s) need at least {required} connections, "
+            f"DB_MAX_CONNECTIONS={settings.max_connections} minus "
+            f"DB_RESERVED_CONNECTIONS={settings.reserved_connections} leaves {available}"
+        )
+
+    share = available // workers
+    pool_size, max_overflow = _split(settings, share - settings.export_pool_size)
+    replica_pool_size, replica_max_overflow = (
+        # a replica serves reads only, exports stay on the primary
+        _split(settings, share)
+        if settings.replica_url
+        else (0, 0)
+    )
+
+    return ConnectionPlan(
+        workers=workers,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        export_pool_size=settings.export_pool_size,
+        replica_pool_size=replica_pool_size,
+        replica_max_overflow=replica_max_overflow,
+    )
+
+
+def _split(settings: DatabaseSettings, total: int) -> tuple[int, int]:
+    pool_size = min(settings.connection_pool_size, total)
+    return pool_size, min(settings.connection_max_overflow, total - pool_size)
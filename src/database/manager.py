@@ -1,70 +1,237 @@
 from __future__ import annotations
 
-import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import partial
 from types import TracebackType
-from typing import Any, Callable
+from typing import Any, AsyncIterator, Callable
 
+from src.interfaces.cache import AbstractQueryCache
 from src.interfaces.command import Query, R
 from src.interfaces.connection import (
     AbstractAsyncConnection,
     AbstractAsyncTransaction,
     IsolationLevel,
 )
+from src.interfaces.replica import ReadReplica
+
+# monotonic time of the last committed write in this request (task context)
+_last_write: ContextVar[float] = ContextVar("last_write", default=float("-inf"))
+# managers shared by every command of the current request, by connection factory
+_scope: ContextVar[dict[object, TransactionManager] | None] = ContextVar(
+    "transaction_scope", default=None
+)
+
+
+def written_within(seconds: float) -> bool:
+    return time.monotonic() - _last_write.get() < seconds
 
 
 class TransactionManager:
     __slots__ = (
         "conn",
         "_transaction",
+        "_cache",
+        "_invalidated",
+        "_written",
+        "_depth",
+        "_transaction_depth",
+        "_scoped",
+        "_started",
+        "_isolation_level",
     )
 
-    def __init__(self, conn: AbstractAsyncConnection) -> None:
+    def __init__(
+        self,
+        conn: AbstractAsyncConnection,
+        cache: AbstractQueryCache | None = None,
+        scoped: bool = False,
+    ) -> None:
         self.conn = conn
         self._transaction: AbstractAsyncTransaction | None = None
+        self._cache = cache
+        self._invalidated: set[str] = set()
+        self._written = False
+        # `async with` blocks entered, the transaction ends with the one that began it
+        self._depth = 0
+        self._transaction_depth: int | None = None
+        # a scoped manager is closed by its scope, not by the last `async with`
+        self._scoped = scoped
+        # the connection is checked out by the first query that is not cached
+        self._started = False
+        self._isolation_level: IsolationLevel | None = None
 
     async def send(self, query: Query[Any, R], /, **kw: Any) -> R:
-        return await query(self.conn, **kw)
+        if not getattr(query, "readonly", False):
+            self._written = True
+
+        if self._cache is None:
+            return await self._execute(query, **kw)
+
+        if tables := self._cache.invalidates(query):
+            self._invalidated.update(tables)
+            return await self._execute(query, **kw)
+
+        if self._invalidated:
+            # this transaction must see its own uncommitted writes
+            return await self._execute(query, **kw)
+
+        return await self._cache.fetch(query, partial(self._execute, query, **kw))
 
     __call__ = send
 
+    async def _execute(self, query: Query[Any, R], /, **kw: Any) -> R:
+        if not self._started:
+            await self.conn.start()
+            self._started = True
+            if self._transaction_depth is not None:
+                # asked for before the first query, begun together with it
+                await self._begin(self._isolation_level)
+
+        return await query(self.conn, **kw)
+
     async def __aexit__(
         self,
         exc_type: type[BaseException] | None,
         exc_value: BaseException | None,
         traceback: TracebackType | None,
     ) -> None:
-        if self._transaction:
+        self._depth -= 1
+        if (
+            self._transaction_depth is not None
+            and self._depth < self._transaction_depth
+        ):
+            self._transaction = self._transaction_depth = None
             if exc_type:
                 await self.rollback()
             else:
                 await self.commit()
-
-        await self.close_transaction()
+        elif (
+            (exc_type or not self._depth)
+            and self._scoped
+            and self._transaction_depth is None
+            and self._started
+            and self.conn.in_transaction()
+        ):
+            # a read is not kept open until the request ends, nor is a failed
+            # read left to abort the next command. the connection stays
+            await self.rollback()
+
+        if not self._depth and not self._scoped:
+            await self.close_transaction()
 
     async def __aenter__(self) -> TransactionManager:
-        await self.conn.start()
+        self._depth += 1
         return self
 
     async def commit(self) -> None:
-        await self.conn.commit()
+        if self._started:
+            await self.conn.commit()
+
+        if self._written:
+            self._written = False
+            _last_write.set(time.monotonic())
+
+        if self._cache is not None and self._invalidated:
+            tables, self._invalidated = self._invalidated, set()
+            await self._cache.invalidate(tables)
 
     async def rollback(self) -> None:
-        await self.conn.rollback()
+        if self._started:
+            await self.conn.rollback()
+        self._invalidated.clear()
+        self._written = False
 
     async def create_transaction(
         self, isolation_level: IsolationLevel | None = None
     ) -> None:
+        if self._transaction_depth is None:
+            self._transaction_depth = self._depth
+            self._isolation_level = isolation_level
+            # an earlier command of the request may have read through this
+            # connection and left its transaction open, the writes continue in
+            # it unless they need another isolation level
+            if (
+                self._started
+                and isolation_level is not None
+                and self.conn.in_transaction()
+            ):
+                await self.conn.rollback()
+
+        if self._started:
+            await self._begin(isolation_level)
+
+    async def _begin(self, isolation_level: IsolationLevel | None) -> None:
         if not self.conn.in_transaction() and not self.conn.closed:
             self._transaction = await self.conn.begin(isolation_level=isolation_level)
 
+    async def release(self) -> None:
+        # between commands only, a manager still inside of `async with` keeps
+        # its connection
+        if not self._depth:
+            await self.close_transaction()
+
     async def close_transaction(self) -> None:
-        await asyncio.shield(asyncio.create_task(self.conn.close()))
+        # writes that were never committed are discarded with the connection
+        self._invalidated.clear()
+        self._written = False
+        if not self._started:
+            return
+
+        self._started = False
+        # a close cancelled midway invalidates the connection in the pool, it is
+        # not leaked, so it is awaited in place instead of in a shielded task
+        await self.conn.close()
+
+
+@asynccontextmanager
+async def transaction_scope() -> AsyncIterator[None]:
+    # commands sent within share one manager, and so one connection, per
+    # database, it is released once the scope ends
+    managers: dict[object, TransactionManager] = {}
+    token = _scope.set(managers)
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+        for manager in managers.values():
+            await manager.close_transaction()
+
+
+async def release_idle() -> None:
+    # managers of the scope give their connection back to the pool until the
+    # next command needs one
+    for manager in (_scope.get() or {}).values():
+        await manager.release()
 
 
 def create_db_manager_factory(
     conn_factory: Callable[..., AbstractAsyncConnection],
+    cache: AbstractQueryCache | None = None,
+    replica: ReadReplica | None = None,
 ) -> Callable[[], TransactionManager]:
     def _create() -> TransactionManager:
-        return TransactionManager(conn=conn_factory())
+        # reads go to the replica only while it keeps up and this request has
+        # not written anything the replica may not have yet
+        if (
+            replica is not None
+            and replica.available()
+            and not written_within(replica.max_lag)
+        ):
+            factory: Callable[..., AbstractAsyncConnection] = replica.conn_factory
+            key: object = replica
+        else:
+            factory = key = conn_factory
+
+        if (managers := _scope.get()) is None:
+            return TransactionManager(conn=factory(), cache=cache)
+
+        if (manager := managers.get(key)) is None:
+            manager = managers[key] = TransactionManager(
+                conn=factory(), cache=cache, scoped=True
+            )
+
+        return manager
 
     return _create
@@ -1,7 +1,13 @@
+import base64
+import binascii
+import uuid
+from datetime import datetime
 from functools import wraps
 from typing import Any, Awaitable, Callable, NoReturn, ParamSpec, TypeVar
 
-from src.common.exceptions import AppException, ConflictError
+import msgspec
+
+from src.common.exceptions import AppException, BadRequestError, ConflictError
 
 P = ParamSpec("P")
 R = TypeVar("R")
@@ -56,3 +62,18 @@ def on_error(
 def page_to_offset(page: int | None, limit: int | None) -> int | None:
     page = page if page and page > 0 else 1
     return ((page) - 1) * limit if limit else None
+
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    encoded = base64.urlsafe_b64encode(msgspec.json.encode((created_at, id)))
+    return encoded.rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        return msgspec.json.decode(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)),
+            type=tuple[datetime, uuid.UUID],
+        )
+    except (binascii.Error, ValueError, msgspec.DecodeError):
+        raise BadRequestError("Invalid cursor", cursor=cursor) from None
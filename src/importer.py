@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+import sys
+from typing import AsyncIterator, BinaryIO, Final, get_args
+
+import msgspec
+
+from src.api.v1.commands.user import ImportUsers, ImportUsersCommand
+from src.core.settings import load_settings
+from src.database.alchemy.connection import (
+    create_sa_engine,
+    create_sa_session_factory,
+    create_session_factory,
+)
+from src.database.manager import TransactionManager
+from src.services.cache.query import get_query_cache
+from src.services.cache.redis import get_redis
+from src.services.cache.tiered import get_tiered_cache
+from src.services.importer import ImportFormat
+from src.services.security.argon2 import get_argon2_hasher
+from src.services.security.pooled import get_pooled_hasher
+
+CHUNK_SIZE: Final[int] = 64 * 1024
+
+
+async def _read(file: BinaryIO) -> AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    while chunk := await loop.run_in_executor(None, file.read, CHUNK_SIZE):
+        yield chunk
+
+
+async def main(path: str, format: ImportFormat) -> None:
+    settings = load_settings()
+    # batches run one after another, a single connection out of the reserved ones
+    engine = create_sa_engine(settings.db.url, pool_size=1, max_overflow=0)
+    redis = get_redis(settings.redis)
+    tiered = get_tiered_cache(redis, settings.redis)
+    # commits invalidate cached queries of the running api as well
+    query_cache = get_query_cache(tiered, settings.db)
+    session_factory = create_session_factory(create_sa_session_factory(engine))
+    hasher = get_pooled_hasher(get_argon2_hasher(), settings.cipher)
+
+    command = ImportUsersCommand(
+        TransactionManager(session_factory(), cache=query_cache), hasher
+    )
+    try:
+        with sys.stdin.buffer if path == "-" else open(path, "rb") as file:
+            result = await command(ImportUsers(stream=_read(file), format=format))
+    finally:
+        await hasher.close()
+        await tiered.close()
+        await redis.close()
+        await engine.dispose()
+
+    sys.stdout.buffer.write(msgspec.json.encode(result) + b"\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import users from NDJSON or CSV")
+    parser.add_argument("path", help="file to import, `-` reads stdin")
+    parser.add_argument("--format", choices=get_args(ImportFormat))
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(
+            args.path,
+            args.format or ("csv" if args.path.endswith(".csv") else "ndjson"),
+        )
+    )
@@ -1,5 +1,18 @@
+from contextlib import AbstractAsyncContextManager
 from datetime import timedelta
-from typing import Any, Protocol, TypeVar, runtime_checkable
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Collection,
+    Mapping,
+    Protocol,
+    Sequence,
+    TypeVar,
+    runtime_checkable,
+)
+
+from src.interfaces.command import Query, R
 
 KeyT = TypeVar("KeyT", contravariant=True)
 RespT = TypeVar("RespT")
@@ -14,7 +27,15 @@ class Cache(Protocol[KeyT, RespT]):
     async def set_value(
         self, key: KeyT, value: Any, expire: int | timedelta | None = None, **kw: Any
     ) -> None: ...
+    async def get_many(self, *keys: KeyT) -> list[RespT | None]: ...
+    async def set_many(
+        self, values: Mapping[KeyT, Any], expire: int | timedelta | None = None
+    ) -> None: ...
     async def del_keys(self, *keys: KeyT) -> None: ...
+    async def del_pattern(self, pattern: KeyT, count: int = 1000) -> int: ...
+    async def incr(
+        self, key: KeyT, amount: int = 1, expire: int | timedelta | None = None
+    ) -> int: ...
     async def get_list(
         self,
         key: KeyT,
@@ -28,4 +49,19 @@ class Cache(Protocol[KeyT, RespT]):
         value: Any,
         **kw: Any,
     ) -> bool: ...
+    async def run_script(
+        self, script: str, keys: Sequence[KeyT], args: Sequence[Any]
+    ) -> Any: ...
+    def pipeline(
+        self, transaction: bool = False
+    ) -> AbstractAsyncContextManager["Cache[KeyT, RespT]"]: ...
     async def close(self) -> None: ...
+
+
+@runtime_checkable
+class AbstractQueryCache(Protocol):
+    def invalidates(self, query: Query[Any, Any]) -> Collection[str]: ...
+    async def fetch(
+        self, query: Query[Any, R], execute: Callable[[], Awaitable[R]]
+    ) -> R: ...
+    async def invalidate(self, tables: Collection[str]) -> None: ...
@@ -6,3 +6,7 @@ class AbstractHasher(Protocol):
     def verify_password(self, hashed: str, plain: str) -> bool: ...
 
 
+class AbstractAsyncHasher(Protocol):
+    async def hash_password(self, plain: str) -> str: ...
+    async def verify_password(self, hashed: str, plain: str) -> bool: ...
+    async def close(self) -> None: ...
@@ -0,0 +1,11 @@
+from typing import Protocol, runtime_checkable
+
+from src.interfaces.connection import AbstractAsyncConnection
+
+
+@runtime_checkable
+class ReadReplica(Protocol):
+    max_lag: float
+
+    def conn_factory(self) -> AbstractAsyncConnection: ...
+    def available(self) -> bool: ...
@@ -7,6 +7,8 @@ DecodeT = TypeVar("DecodeT", covariant=True)
 
 @runtime_checkable
 class JWT(Protocol[EncodeT, DecodeT]):
+    @property
+    def stateless(self) -> bool: ...
     def encode(
         self,
         sub: str,
@@ -1,46 +1,109 @@
 import math
 import uuid
 from datetime import datetime, timezone
-from typing import Final
+from typing import Any, Final
 
 from src.common import dto
 from src.common.exceptions import UnAuthorizedError
 from src.database.alchemy import entity, queries
+from src.database.alchemy.queries.materialize import materializer
 from src.interfaces.cache import Cache
-from src.interfaces.hasher import AbstractHasher
+from src.interfaces.hasher import AbstractAsyncHasher
 from src.interfaces.manager import AbstractTransactionManager
 from src.interfaces.token import JWT
 from src.services.base import Service
+from src.services.cache.principal import PrincipalCache
+from src.services.user import normalize_login
 
 MAXIMUM_TOKENS_COUNT: Final[int] = 5
 
+# Refresh tokens live in a hash of fingerprint -> token, next to a sorted set of
+# fingerprint -> expire timestamp used to drop the oldest sessions.
+# KEYS: hash, sorted set
+
+# ARGV: fingerprint, token, expire timestamp, maximum sessions, ttl
+LOGIN_SCRIPT: Final[str] = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 0 then
+    local excess = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[4]) + 1
+    if excess > 0 then
+        local oldest = redis.call('ZRANGE', KEYS[2], 0, excess - 1)
+        redis.call('HDEL', KEYS[1], unpack(oldest))
+        redis.call('ZREM', KEYS[2], unpack(oldest))
+    end
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+redis.call('EXPIRE', KEYS[2], ARGV[5])
+return 1
+"""
+
+# ARGV: fingerprint, current token, new token, expire timestamp, ttl
+# a token that does not match is treated as stolen and ends every session
+ROTATE_SCRIPT: Final[str] = """
+if redis.call('HGET', KEYS[1], ARGV[1]) ~= ARGV[2] then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[3])
+redis.call('ZADD', KEYS[2], ARGV[4], ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+redis.call('EXPIRE', KEYS[2], ARGV[5])
+return 1
+"""
+
+# ARGV: token
+LOGOUT_SCRIPT: Final[str] = """
+local sessions = redis.call('HGETALL', KEYS[1])
+for i = 1, #sessions, 2 do
+    if sessions[i + 1] == ARGV[1] then
+        redis.call('HDEL', KEYS[1], sessions[i])
+        redis.call('ZREM', KEYS[2], sessions[i])
+        return 1
+    end
+end
+return 0
+"""
+
 
 class AuthService(Service):
     __slots__ = (
         "_hasher",
         "_jwt",
         "_cache",
+        "_principal",
         "_max_tokens",
     )
-    _cache_key: str = "auth:{key}"
+    _cache_key: str = "auth:sessions:{key}"
 
     def __init__(
         self,
         manager: AbstractTransactionManager,
-        hasher: AbstractHasher,
+        hasher: AbstractAsyncHasher,
         jwt: JWT[tuple[datetime, dto.Token], dto.TokenPayload],
         cache: Cache[str, str],
+        principal: PrincipalCache | None = None,
         maximum_tokens: int = MAXIMUM_TOKENS_COUNT,
     ) -> None:
         super().__init__(manager)
         self._hasher = hasher
         self._jwt = jwt
         self._cache = cache
+        self._principal = principal
         self._max_tokens = maximum_tokens
 
+    @property
+    def stateless(self) -> bool:
+        return self._jwt.stateless and self._principal is not None
+
     async def authenticate(self, token: str, typ: str) -> entity.User:
         payload = self._jwt.decode(token)
-        user = await self.manager.send(queries.user.Get(id=uuid.UUID(payload.sub)))
+        user = await self.manager.send(
+            queries.user.Get(
+                *(("permissions",) if self.stateless else ()),
+                id=uuid.UUID(payload.sub),
+            )
+        )
 
         if not user or payload.type != typ:
             raise UnAuthorizedError("Unauthorized")
@@ -48,31 +111,37 @@ class AuthService(Service):
         return user
 
     async def login(self, credentials: dto.UserLogin) -> dto.InternalToken:
-        user = await self.manager.send(queries.user.Get(login=credentials.login))
+        user = await self.manager.send(
+            queries.user.Get(
+                *(("permissions",) if self.stateless else ()),
+                secrets=True,
+                login=normalize_login(credentials.login),
+            )
+        )
 
-        if not user or not self._hasher.verify_password(
+        if not user or not await self._hasher.verify_password(
             user.password, credentials.password
         ):
             raise UnAuthorizedError("Incorrect login or password")
 
         user_id = user.id.hex
-        cache_key = self._cache_key.format(key=user_id)
-
         expire, refresh = self._jwt.encode(sub=user_id, typ="refresh")
-        _, access = self._jwt.encode(sub=user_id, typ="access")
-
-        old_tokens = await self._cache.get_list(cache_key)
-
-        if len(old_tokens) > self._max_tokens:
-            await self._cache.del_keys(cache_key)
-
+        _, access = self._jwt.encode(
+            sub=user_id, typ="access", **(await self._access_claims(user))
+        )
         seconds_expire = math.ceil(
             (expire - datetime.now(timezone.utc)).total_seconds()
         )
-        await self._cache.set_list(
-            cache_key,
-            f"{credentials.fingerprint}::{refresh.token}",
-            expire=seconds_expire,
+        await self._cache.run_script(
+            LOGIN_SCRIPT,
+            self._session_keys(user_id),
+            (
+                credentials.fingerprint,
+                refresh.token,
+                expire.timestamp(),
+                self._max_tokens,
+                seconds_expire,
+            ),
         )
 
         return dto.InternalToken(
@@ -85,34 +154,29 @@ class AuthService(Service):
         user = await self.authenticate(token, "refresh")
 
         user_id = user.id.hex
-        cache_key = self._cache_key.format(key=user_id)
-        token_pairs = await self._cache.get_list(cache_key)
-
-        verified: str | None = None
-
-        for pair in token_pairs:
-            fp, _, cached_token = pair.partition("::")
-            if fp == fingerprint.fingerprint and cached_token == token:
-                verified = pair
-                break
+        expire, refresh = self._jwt.encode(sub=user_id, typ="refresh")
+        seconds_expire = math.ceil(
+            (expire - datetime.now(timezone.utc)).total_seconds()
+        )
+        rotated = await self._cache.run_script(
+            ROTATE_SCRIPT,
+            self._session_keys(user_id),
+            (
+                fingerprint.fingerprint,
+                token,
+                refresh.token,
+                expire.timestamp(),
+                seconds_expire,
+            ),
+        )
 
-        if not verified:
-            await self._cache.del_keys(cache_key)
+        if not rotated:
             raise UnAuthorizedError(
                 "Unauthorized", detail="Current token is not valid anymore"
             )
 
-        await self._cache.pop(cache_key, verified)
-
-        expire, refresh = self._jwt.encode(sub=user_id, typ="refresh")
-        _, access = self._jwt.encode(sub=user_id, typ="access")
-        seconds_expire = math.ceil(
-            (expire - datetime.now(timezone.utc)).total_seconds()
-        )
-        await self._cache.set_list(
-            cache_key,
-            f"{fingerprint}::{refresh.token}",
-            expire=seconds_expire,
+        _, access = self._jwt.encode(
+            sub=user_id, typ="access", **(await self._access_claims(user))
         )
 
         return dto.InternalToken(
@@ -122,17 +186,37 @@ class AuthService(Service):
     async def logout(self, token: dto.Token) -> dto.Status:
         user = await self.authenticate(token.token, "refresh")
 
-        user_id = user.id.hex
-        cache_key = self._cache_key.format(key=user_id)
-
-        token_pairs = await self._cache.get_list(cache_key)
+        removed = await self._cache.run_script(
+            LOGOUT_SCRIPT, self._session_keys(user.id.hex), (token.token,)
+        )
 
-        for pair in token_pairs:
-            _, _, cached_token = pair.partition("::")
-            if cached_token == token.token:
-                await self._cache.pop(cache_key, pair)
-                break
-        else:
+        if not removed:
             raise UnAuthorizedError("Invalid token")
 
         return dto.Status(success=True)
+
+    def _session_keys(self, user_id: str) -> tuple[str, str]:
+        cache_key = self._cache_key.format(key=user_id)
+        return cache_key, f"{cache_key}:order"
+
+    async def _access_claims(self, user: entity.User) -> dict[str, Any]:
+        if not self._jwt.stateless or self._principal is None:
+            return {}
+
+        principal = materializer(dto.User, entity.User).from_entity(user)
+
+        return {
+            "login": principal.login,
+            "epoch": await self._principal.epoch(principal.id),
+            "roles": [
+                {
+                    "id": str(role.id),
+                    "name": role.name,
+                    "permissions": [
+                        {"id": str(permission.id), "name": permission.name}
+                        for permission in role.permissions
+                    ],
+                }
+                for role in principal.roles
+            ],
+        }
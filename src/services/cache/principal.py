@@ -0,0 +1,94 @@
+import uuid
+from typing import Final
+
+import msgspec
+from redis.exceptions import RedisError
+
+from src.common import dto
+from src.common.helpers import call_later
+from src.core.logger import log
+from src.core.settings import Settings
+from src.interfaces.cache import Cache
+
+_USER_DECODER: Final[msgspec.json.Decoder[dto.User]] = msgspec.json.Decoder(dto.User)
+
+
+class PrincipalCache:
+    __slots__ = (
+        "_cache",
+        "_ttl",
+        "_stale_window",
+        "hits",
+        "misses",
+    )
+    _cache_key: str = "principal:{key}"
+    _epoch_key: str = "principal:epoch:{key}"
+
+    def __init__(
+        self,
+        cache: Cache[str, str],
+        ttl: int,
+        stale_window: float = 0,
+    ) -> None:
+        self._cache = cache
+        self._ttl = ttl
+        self._stale_window = stale_window
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, user_id: uuid.UUID) -> dto.User | None:
+        cached = await self._cache.get_value(self._cache_key.format(key=user_id.hex))
+        if cached is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        return _USER_DECODER.decode(cached)
+
+    async def set(self, user: dto.User) -> None:
+        await self._cache.set_value(
+            self._cache_key.format(key=user.id.hex), user, expire=self._ttl
+        )
+
+    async def epoch(self, user_id: uuid.UUID) -> int:
+        cached = await self._cache.get_value(self._epoch_key.format(key=user_id.hex))
+        return int(cached) if cached else 0
+
+    async def invalidate(self, *user_ids: uuid.UUID) -> None:
+        keys = [user_id.hex for user_id in user_ids]
+
+        # access tokens issued before the bump are rejected. the key never
+        # expires, tokens are issued with the current epoch long after the
+        # bump and once it started over the next bump would not reach them
+        async with self._cache.pipeline(transaction=True) as batch:
+            for key in keys:
+                await batch.incr(self._epoch_key.format(key=key))
+            await batch.del_keys(*(self._cache_key.format(key=key) for key in keys))
+
+        if self._stale_window:
+            # a lookup on a lagging replica may have cached the old user again,
+            # the epoch is not bumped twice, tokens issued since then stay valid
+            call_later(self._stale_window, self._forget, keys)
+
+    async def _forget(self, keys: list[str]) -> None:
+        try:
+            await self._cache.del_keys(
+                *(self._cache_key.format(key=key) for key in keys)
+            )
+        except RedisError as e:
+            log.warning(f"Principals stay cached until they expire: {e!r}")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def get_principal_cache(cache: Cache[str, str], settings: Settings) -> PrincipalCache:
+    return PrincipalCache(
+        cache,
+        ttl=settings.redis.principal_ttl,
+        stale_window=settings.db.replica_stale_window,
+    )
@@ -0,0 +1,186 @@
+import hashlib
+import uuid
+from typing import Any, Awaitable, Callable, Collection
+
+import msgspec
+from redis.exceptions import RedisError
+
+from src.common.helpers import call_later
+from src.core.logger import log
+from src.core.settings import DatabaseSettings
+from src.database.alchemy.queries.base import (
+    BaseQuery,
+    Get,
+    GetManyByCursor,
+    GetManyByOffset,
+    Stream,
+)
+from src.database.alchemy.queries.tools import loaded_tables
+from src.interfaces.cache import Cache
+from src.interfaces.command import Query, R
+
+
+class QueryCache:
+    __slots__ = (
+        "_cache",
+        "_ttl",
+        "_stale_window",
+        "hits",
+        "misses",
+    )
+    _generation_key: str = "query:generation:{table}"
+    _result_key: str = "query:{table}:{digest}"
+
+    def __init__(
+        self, cache: Cache[str, str], ttl: int, stale_window: float = 0
+    ) -> None:
+        self._cache = cache
+        self._ttl = ttl
+        self._stale_window = stale_window
+        self.hits = 0
+        self.misses = 0
+
+    def invalidates(self, query: Query[Any, Any]) -> Collection[str]:
+        if isinstance(query, BaseQuery) and not query.readonly:
+            return (query.entity.__table__.name,)
+
+        return ()
+
+    async def fetch(
+        self, query: Query[Any, R], execute: Callable[[], Awaitable[R]]
+    ) -> R:
+        if (
+            not self._ttl
+            or not isinstance(query, BaseQuery)
+            or not query.readonly
+            or (params := _params(query)) is None
+        ):
+            return await execute()
+
+        tables = sorted(loaded_tables(*getattr(query, "loads", ()), model=query.entity))
+        try:
+            # results are keyed by the generation of every table they were
+            # read from, a commit bumps it and older entries are never read again
+            generations = await self._cache.get_many(
+                *(self._generation_key.format(table=table) for table in tables)
+            )
+            key = self._result_key.format(
+                table=query.entity.__table__.name,
+                digest=hashlib.blake2b(
+                    msgspec.json.encode((params, generations), order="sorted"),
+                    digest_size=16,
+                ).hexdigest(),
+            )
+            cached = await self._cache.get_value(key)
+        except RedisError as e:
+            log.warning(f"Query cache is unavailable, reading database: {e!r}")
+            return await execute()
+
+        if cached is not None:
+            self.hits += 1
+            return _load(query, msgspec.json.decode(cached))
+
+        self.misses += 1
+        result = await execute()
+        try:
+            await self._cache.set_value(
+                key, msgspec.json.encode(_dump(query, result)), expire=self._ttl
+            )
+        except RedisError as e:
+            log.warning(f"Query result was not cached: {e!r}")
+
+        return result
+
+    async def generation(self, tables: Collection[str]) -> str:
+        # changes with every commit to any of the tables, also with results
+        # not being cached, a part of versions a row timestamp does not cover
+        try:
+            generations = await self._cache.get_many(
+                *(self._generation_key.format(table=table) for table in sorted(tables))
+            )
+        except RedisError as e:
+            log.warning(f"Table generations are unavailable: {e!r}")
+            # matches no version handed out before
+            return uuid.uuid4().hex
+
+        return ".".join(str(generation or 0) for generation in generations)
+
+    async def invalidate(self, tables: Collection[str]) -> None:
+        await self._bump(tables)
+        if self._stale_window:
+            # a replica read shortly after the commit may have cached the old
+            # rows under the new generation, these are dropped once it caught up
+            call_later(self._stale_window, self._bump, tables)
+
+    async def _bump(self, tables: Collection[str]) -> None:
+        try:
+            async with self._cache.pipeline(transaction=True) as batch:
+                for table in sorted(tables):
+                    await batch.incr(self._generation_key.format(table=table))
+        except RedisError as e:
+            # entries of these tables stay stale until they expire
+            log.error(f"Query cache invalidation failed for {tables}: {e!r}")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def _params(query: BaseQuery[Any, Any]) -> dict[str, Any] | None:
+    # streamed rows are read lazily, locked rows and secret columns must come
+    # from the database
+    if (
+        isinstance(query, Stream)
+        or getattr(query, "lock_for_update", False)
+        or getattr(query, "secrets", False)
+    ):
+        return None
+
+    # everything a query was built from, its clauses are derived from these
+    return {
+        "query": type(query).__qualname__,
+        **{
+            name: getattr(query, name)
+            for cls in type(query).__mro__
+            for name in getattr(cls, "__slots__", ())
+            if name != "clauses" and hasattr(query, name)
+        },
+    }
+
+
+def _dump(query: BaseQuery[Any, Any], result: Any) -> Any:
+    # password hashes and the like never reach redis
+    if isinstance(query, Get):
+        return result.as_dict(secrets=False) if result is not None else None
+    if isinstance(query, GetManyByOffset):
+        count, items, mode = result
+        return count, [item.as_dict(secrets=False) for item in items], mode
+    if isinstance(query, GetManyByCursor):
+        items, has_more = result
+        return [item.as_dict(secrets=False) for item in items], has_more
+
+    return result
+
+
+def _load(query: BaseQuery[Any, Any], data: Any) -> Any:
+    if isinstance(query, Get):
+        return query.entity.from_dict(data) if data is not None else None
+    if isinstance(query, GetManyByOffset):
+        count, items, mode = data
+        return count, [query.entity.from_dict(item) for item in items], mode
+    if isinstance(query, GetManyByCursor):
+        items, has_more = data
+        return [query.entity.from_dict(item) for item in items], has_more
+
+    return data
+
+
+def get_query_cache(cache: Cache[str, str], settings: DatabaseSettings) -> QueryCache:
+    # with no ttl results are not cached, commits still bump the generations
+    return QueryCache(
+        cache,
+        ttl=settings.query_cache_ttl,
+        stale_window=settings.replica_stale_window,
+    )
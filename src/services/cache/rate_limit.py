@@ -0,0 +1,131 @@
+import asyncio
+import ipaddress
+import math
+import uuid
+from typing import Final, Iterable, Mapping
+
+from redis.exceptions import RedisError
+
+from src.core.logger import log
+from src.core.settings import ServerSettings
+from src.interfaces.cache import Cache
+
+RATE_LIMIT_TIMEOUT: Final[float] = 0.5
+PERIODS: Final[dict[str, int]] = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86_400,
+}
+
+# Sliding window log, one sorted set of request timestamps per identity.
+# A request is recorded for every identity only if none of them is full,
+# otherwise returns milliseconds until the oldest entry leaves the window.
+# KEYS: identities. ARGV: window ms, limit, unique member
+RATE_LIMIT_SCRIPT: Final[str] = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local retry = 0
+for _, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= limit then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        retry = math.max(retry, tonumber(oldest[2]) + window - now)
+    end
+end
+if retry > 0 then
+    return retry
+end
+for _, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[3])
+    redis.call('PEXPIRE', key, window)
+end
+return 0
+"""
+
+
+def parse_rate(value: str) -> tuple[int, int] | None:
+    if not value:
+        return None
+
+    limit, _, period = value.partition("/")
+    if period not in PERIODS or not limit.isdigit():
+        raise ValueError(
+            f"Invalid rate limit `{value}`, expected `<count>/<{'|'.join(PERIODS)}>`"
+        )
+
+    return int(limit), PERIODS[period]
+
+
+def parse_networks(
+    values: Iterable[str],
+) -> tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+    return tuple(ipaddress.ip_network(value, strict=False) for value in values)
+
+
+class RateLimiter:
+    __slots__ = (
+        "_cache",
+        "_limits",
+        "_timeout",
+        "_trusted_proxies",
+    )
+    _cache_key: str = "rate:{name}:{identity}"
+
+    def __init__(
+        self,
+        cache: Cache[str, str],
+        limits: Mapping[str, tuple[int, int] | None],
+        timeout: float = RATE_LIMIT_TIMEOUT,
+        trusted_proxies: Iterable[str] = (),
+    ) -> None:
+        self._cache = cache
+        self._limits = limits
+        self._timeout = timeout
+        self._trusted_proxies = parse_networks(trusted_proxies)
+
+    def trusts_proxy(self, host: str) -> bool:
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+
+        return any(address in network for network in self._trusted_proxies)
+
+    async def hit(self, name: str, *identities: str) -> int:
+        rate = self._limits.get(name)
+        if not rate or not identities:
+            return 0
+
+        limit, period = rate
+        try:
+            retry_after = await asyncio.wait_for(
+                self._cache.run_script(
+                    RATE_LIMIT_SCRIPT,
+                    [
+                        self._cache_key.format(name=name, identity=identity)
+                        for identity in identities
+                    ],
+                    (period * 1000, limit, uuid.uuid4().hex),
+                ),
+                self._timeout,
+            )
+        except (RedisError, TimeoutError) as e:
+            # a broken limiter must not take logins down with it
+            log.warning(f"Rate limiter is unavailable, letting request in: {e!r}")
+            return 0
+
+        return math.ceil(int(retry_after) / 1000)
+
+
+def get_rate_limiter(cache: Cache[str, str], settings: ServerSettings) -> RateLimiter:
+    return RateLimiter(
+        cache,
+        {
+            "login": parse_rate(settings.login_rate_limit),
+            "signup": parse_rate(settings.signup_rate_limit),
+        },
+        trusted_proxies=settings.trusted_proxies,
+    )
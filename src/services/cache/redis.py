@@ -1,8 +1,10 @@
+from contextlib import asynccontextmanager
 from datetime import timedelta
-from typing import Any, Final
+from typing import Any, AsyncIterator, Final, Mapping, Sequence
 
 import msgspec
-from redis.asyncio.client import Redis
+from redis.asyncio.client import Pipeline, PubSub, Redis
+from redis.commands.core import AsyncScript
 
 from src.common.dto.base import DTO
 from src.core.settings import RedisSettings
@@ -17,36 +19,87 @@ ONE_MONTH: Final[int] = 2_592_000
 
 
 class RedisCache(Cache[str, str]):
-    __slots__ = ("_redis",)
+    __slots__ = (
+        "_redis",
+        "_scripts",
+    )
 
     def __init__(self, redis: Redis) -> None:  # type: ignore
         self._redis = redis
+        self._scripts: dict[str, AsyncScript] = {}
 
     async def get_value(
         self,
         key: str,
     ) -> str | None:
-        return await self._redis.get(key)
+        return await self._reader("get_value").get(key)
 
     async def set_value(
         self, key: str, value: Any, expire: int | timedelta | None = None, **kw: Any
     ) -> None:
         await self._redis.set(key, self._convert_value(value), ex=expire, **kw)
 
+    async def get_many(self, *keys: str) -> list[str | None]:
+        if not keys:
+            return []
+
+        return await self._reader("get_many").mget(keys)
+
+    async def set_many(
+        self, values: Mapping[str, Any], expire: int | timedelta | None = None
+    ) -> None:
+        if not values:
+            return
+
+        pipe = self._batch()
+        if expire:
+            for key, value in values.items():
+                pipe.set(key, self._convert_value(value), ex=expire)
+        else:
+            pipe.mset({k: self._convert_value(v) for k, v in values.items()})
+
+        await self._flush(pipe)
+
     async def del_keys(self, *keys: str) -> None:
-        found_keys = [
-            found for key in keys async for found in self._redis.scan_iter(key)
-        ]
-        if found_keys:
-            await self._redis.delete(*found_keys)
+        if keys:
+            await self._redis.unlink(*keys)
+
+    async def del_pattern(self, pattern: str, count: int = 1000) -> int:
+        redis = self._reader("del_pattern")
+        deleted = 0
+        batch: list[str] = []
+        async for key in redis.scan_iter(match=pattern, count=count):
+            batch.append(key)
+            if len(batch) >= count:
+                deleted += await redis.unlink(*batch)
+                batch.clear()
+
+        if batch:
+            deleted += await redis.unlink(*batch)
+
+        return deleted
+
+    async def incr(
+        self, key: str, amount: int = 1, expire: int | timedelta | None = None
+    ) -> int:
+        pipe = self._batch(transaction=True)
+        pipe.incr(key, amount)
+        if expire:
+            pipe.expire(key, expire)
+
+        result = await self._flush(pipe)
+
+        return int(result[0]) if result else 0
 
     async def set_list(
         self, key: str, *values: Any, expire: int | timedelta | None = None, **kw: Any
     ) -> None:
-        await self._redis.lpush(key, *(self._convert_value(v) for v in values))
-
+        pipe = self._batch()
+        pipe.lpush(key, *(self._convert_value(v) for v in values))
         if expire:
-            await self._redis.expire(key, expire, **kw)
+            pipe.expire(key, expire, **kw)
+
+        await self._flush(pipe)
 
     async def get_list(
         self,
@@ -54,7 +107,7 @@ class RedisCache(Cache[str, str]):
         **kw: Any,
     ) -> list[str]:
         start, end = kw.pop("start", 0), kw.pop("end", -1)
-        return await self._redis.lrange(key, start, end)
+        return await self._reader("get_list").lrange(key, start, end)
 
     async def pop(
         self,
@@ -63,13 +116,62 @@ class RedisCache(Cache[str, str]):
         **kw: Any,
     ) -> bool:
         count = kw.pop("count", 0)
-        popped = await self._redis.lrem(key, count, value)
+        popped = await self._reader("pop").lrem(key, count, value)
 
         return bool(popped)
 
+    async def run_script(
+        self, script: str, keys: Sequence[str], args: Sequence[Any]
+    ) -> Any:
+        redis = self._reader("run_script")
+        if (registered := self._scripts.get(script)) is None:
+            # EVALSHA first, the body is only sent again after a SCRIPT FLUSH
+            registered = self._scripts[script] = redis.register_script(script)
+
+        return await registered(keys=keys, args=args)
+
+    async def publish(self, channel: str, message: Any) -> None:
+        await self._redis.publish(channel, self._convert_value(message))
+
+    def pubsub(self) -> PubSub:
+        return self._redis.pubsub(ignore_subscribe_messages=True)
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator["RedisCache"]:
+        # commands are only queued and sent on exit, operations that need a
+        # reply are rejected inside
+        pipe = self._batch(transaction)
+        try:
+            yield RedisCache(pipe)
+            await self._flush(pipe)
+        finally:
+            if pipe is not self._redis:
+                await pipe.reset()
+
     async def close(self) -> None:
         await self._redis.aclose(close_connection_pool=True)  # type: ignore
 
+    def _reader(self, operation: str) -> Redis:  # type: ignore
+        if isinstance(self._redis, Pipeline):
+            raise TypeError(
+                f"`{operation}` needs a reply, it can't be used in `pipeline()`"
+            )
+
+        return self._redis
+
+    def _batch(self, transaction: bool = False) -> Pipeline:
+        # inside `pipeline()` every command joins the outer batch
+        if isinstance(self._redis, Pipeline):
+            return self._redis
+
+        return self._redis.pipeline(transaction=transaction)
+
+    async def _flush(self, pipe: Pipeline) -> list[Any]:
+        if pipe is self._redis:
+            return []
+
+        return await pipe.execute()
+
     def _convert_value(self, v: Any) -> Any:
         if isinstance(v, (DTO, dict, list)):
             serialized = msgspec.json.encode(v)
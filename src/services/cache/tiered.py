@@ -0,0 +1,268 @@
+import asyncio
+import contextlib
+import fnmatch
+import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Any, AsyncIterator, Final, Mapping, Sequence
+
+import msgspec
+from redis.exceptions import RedisError
+
+from src.common.cache import TTLCache
+from src.core.logger import log
+from src.core.settings import RedisSettings
+from src.interfaces.cache import Cache
+from src.services.cache.redis import RedisCache
+
+INVALIDATION_CHANNEL: Final[str] = "cache:invalidate"
+RECONNECT_DELAY: Final[float] = 1.0
+# remembers keys missing in redis, invalidated like any other value
+MISSING: Final[str] = "\x00missing"
+
+
+class Invalidation(msgspec.Struct):
+    sent_at: float
+    keys: list[str] = msgspec.field(default_factory=list)
+    pattern: str | None = None
+
+
+_INVALIDATION_DECODER: Final[msgspec.json.Decoder[Invalidation]] = msgspec.json.Decoder(
+    Invalidation
+)
+
+
+class _TierState:
+    __slots__ = (
+        "listener",
+        "subscribed",
+        "generation",
+        "l2_hits",
+        "l2_misses",
+        "sent",
+        "received",
+        "lag_last",
+        "lag_max",
+        "lag_total",
+    )
+
+    def __init__(self) -> None:
+        self.listener: asyncio.Task[None] | None = None
+        self.subscribed = False
+        self.generation = 0
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.sent = 0
+        self.received = 0
+        self.lag_last = 0.0
+        self.lag_max = 0.0
+        self.lag_total = 0.0
+
+
+class TieredCache(Cache[str, str]):
+    __slots__ = (
+        "_l2",
+        "_l1",
+        "_channel",
+        "_state",
+        "_batch",
+    )
+
+    def __init__(
+        self,
+        l2: RedisCache,
+        l1: TTLCache[str, str],
+        channel: str = INVALIDATION_CHANNEL,
+        state: _TierState | None = None,
+    ) -> None:
+        self._l2 = l2
+        self._l1 = l1
+        self._channel = channel
+        self._state = state or _TierState()
+        # inside `pipeline()` reads are rejected by l2 and must not touch l1
+        self._batch = state is not None
+
+    async def get_value(self, key: str) -> str | None:
+        return (await self.get_many(key))[0]
+
+    async def set_value(
+        self, key: str, value: Any, expire: int | timedelta | None = None, **kw: Any
+    ) -> None:
+        await self._l2.set_value(key, value, expire=expire, **kw)
+        await self._invalidate(keys=[key])
+
+    async def get_many(self, *keys: str) -> list[str | None]:
+        if self._batch:
+            return await self._l2.get_many(*keys)
+
+        self._ensure_listener()
+        state = self._state
+        found: dict[str, str | None] = {}
+        if state.subscribed:
+            for key in keys:
+                if (value := self._l1.get(key)) is not None:
+                    found[key] = None if value is MISSING else value
+
+        if missing := [key for key in keys if key not in found]:
+            generation = state.generation
+            for key, value in zip(
+                missing, await self._l2.get_many(*missing), strict=True
+            ):
+                found[key] = value
+                if value is None:
+                    state.l2_misses += 1
+                else:
+                    state.l2_hits += 1
+
+                # an invalidation that arrived while we were reading may be
+                # older than the value, so only keep it when nothing arrived
+                if state.subscribed and generation == state.generation:
+                    self._l1.set(key, MISSING if value is None else value)
+
+        return [found[key] for key in keys]
+
+    async def set_many(
+        self, values: Mapping[str, Any], expire: int | timedelta | None = None
+    ) -> None:
+        await self._l2.set_many(values, expire=expire)
+        await self._invalidate(keys=list(values))
+
+    async def del_keys(self, *keys: str) -> None:
+        await self._l2.del_keys(*keys)
+        await self._invalidate(keys=list(keys))
+
+    async def del_pattern(self, pattern: str, count: int = 1000) -> int:
+        deleted = await self._l2.del_pattern(pattern, count)
+        await self._invalidate(pattern=pattern)
+
+        return deleted
+
+    async def incr(
+        self, key: str, amount: int = 1, expire: int | timedelta | None = None
+    ) -> int:
+        value = await self._l2.incr(key, amount, expire)
+        await self._invalidate(keys=[key])
+
+        return value
+
+    # lists and scripts are never kept in l1
+    async def get_list(self, key: str) -> list[str]:
+        return await self._l2.get_list(key)
+
+    async def set_list(
+        self, key: str, *values: Any, expire: int | timedelta | None = None, **kw: Any
+    ) -> None:
+        await self._l2.set_list(key, *values, expire=expire, **kw)
+
+    async def pop(self, key: str, value: Any, **kw: Any) -> bool:
+        return await self._l2.pop(key, value, **kw)
+
+    async def run_script(
+        self, script: str, keys: Sequence[str], args: Sequence[Any]
+    ) -> Any:
+        return await self._l2.run_script(script, keys, args)
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator["TieredCache"]:
+        async with self._l2.pipeline(transaction) as pipe:
+            # the invalidation is queued too, so other workers drop their copy
+            # only once the batch is applied
+            yield TieredCache(pipe, self._l1, self._channel, self._state)
+
+    async def close(self) -> None:
+        # only stops the listener, the redis client is shared and closed by
+        # its owner
+        if (listener := self._state.listener) is not None:
+            listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await listener
+            self._state.listener = None
+
+    def stats(self) -> dict[str, int | float]:
+        state = self._state
+        lookups = self._l1.hits + self._l1.misses
+
+        return {
+            "l1_hits": self._l1.hits,
+            "l1_misses": self._l1.misses,
+            "l1_hit_ratio": round(self._l1.hits / lookups, 4) if lookups else 0.0,
+            "l1_size": self._l1.size,
+            "l1_evictions": self._l1.evictions,
+            "l2_hits": state.l2_hits,
+            "l2_misses": state.l2_misses,
+            "invalidations_sent": state.sent,
+            "invalidations_received": state.received,
+            "invalidation_lag_ms_last": round(state.lag_last * 1000, 3),
+            "invalidation_lag_ms_max": round(state.lag_max * 1000, 3),
+            "invalidation_lag_ms_avg": (
+                round(state.lag_total / state.received * 1000, 3)
+                if state.received
+                else 0.0
+            ),
+        }
+
+    async def _invalidate(
+        self, keys: list[str] | None = None, pattern: str | None = None
+    ) -> None:
+        invalidation = Invalidation(
+            sent_at=time.time(), keys=keys or [], pattern=pattern
+        )
+        self._apply(invalidation)
+        await self._l2.publish(self._channel, msgspec.json.encode(invalidation))
+        self._state.sent += 1
+
+    def _apply(self, invalidation: Invalidation) -> None:
+        self._state.generation += 1
+        for key in invalidation.keys:
+            self._l1.pop(key)
+
+        if invalidation.pattern:
+            for key in self._l1.keys():
+                if fnmatch.fnmatchcase(key, invalidation.pattern):
+                    self._l1.pop(key)
+
+    def _ensure_listener(self) -> None:
+        # started on first use, so every worker process subscribes on its own
+        if self._state.listener is None:
+            self._state.listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        state = self._state
+        while True:
+            pubsub = self._l2.pubsub()
+            try:
+                await pubsub.subscribe(self._channel)
+                state.subscribed = True
+                async for message in pubsub.listen():
+                    try:
+                        invalidation = _INVALIDATION_DECODER.decode(message["data"])
+                    except msgspec.DecodeError:
+                        continue
+
+                    self._apply(invalidation)
+                    lag = max(0.0, time.time() - invalidation.sent_at)
+                    state.received += 1
+                    state.lag_last = lag
+                    state.lag_max = max(state.lag_max, lag)
+                    state.lag_total += lag
+            except RedisError as e:
+                log.warning(f"Cache invalidation channel is down: {e!r}")
+            except Exception as e:
+                # the listener must outlive anything, l1 is unused until it
+                # subscribes again
+                log.exception(f"Cache invalidation listener failed: {e!r}")
+            finally:
+                state.subscribed = False
+                # anything could have changed while we were not listening
+                self._l1.clear()
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+
+            await asyncio.sleep(RECONNECT_DELAY)
+
+
+def get_tiered_cache(cache: RedisCache, settings: RedisSettings) -> TieredCache:
+    return TieredCache(
+        cache,
+        TTLCache(maxsize=settings.local_cache_size, ttl=settings.local_cache_ttl),
+    )
@@ -0,0 +1,81 @@
+import csv
+from typing import AsyncIterable, AsyncIterator, Final, Literal
+
+import msgspec
+
+from src.common import dto
+from src.common.exceptions import BadRequestError
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# rows hashed, copied and merged together, what is held in memory at once
+IMPORT_BATCH_SIZE: Final[int] = 5_000
+MAX_LINE_LENGTH: Final[int] = 64 * 1024
+MAX_REPORTED_ERRORS: Final[int] = 100
+CSV_COLUMNS: Final[tuple[str, ...]] = ("login", "password")
+
+_USER_DECODER: Final[msgspec.json.Decoder[dto.UserCreate]] = msgspec.json.Decoder(
+    dto.UserCreate
+)
+
+
+async def read_lines(stream: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    tail = b""
+    async for chunk in stream:
+        *lines, tail = (tail + chunk).split(b"\n")
+        if len(tail) > MAX_LINE_LENGTH:
+            raise BadRequestError(f"Lines must be shorter than {MAX_LINE_LENGTH} bytes")
+        for line in lines:
+            yield line
+
+    if tail:
+        yield tail
+
+
+async def read_users(
+    stream: AsyncIterable[bytes], format: ImportFormat, result: dto.UserImportResult
+) -> AsyncIterator[list[dto.UserCreate]]:
+    # yields valid users in batches, invalid rows are counted in `result`
+    batch: list[dto.UserCreate] = []
+    header: list[str] | None = None
+    number = 0
+    async for line in read_lines(stream):
+        number += 1
+        if not line.strip():
+            continue
+
+        try:
+            if format == "ndjson":
+                user = _USER_DECODER.decode(line)
+            elif header is None:
+                header = _csv_row(line)
+                if missing := set(CSV_COLUMNS) - set(header):
+                    raise BadRequestError(
+                        "CSV header misses columns", missing=sorted(missing)
+                    )
+                continue
+            else:
+                row = _csv_row(line)
+                if len(row) != len(header):
+                    raise ValueError(f"Expected {len(header)} fields, got {len(row)}")
+                user = msgspec.convert(
+                    dict(zip(header, row, strict=True)), dto.UserCreate
+                )
+        except (msgspec.ValidationError, msgspec.DecodeError, ValueError) as e:
+            result.rejected += 1
+            if len(result.errors) < MAX_REPORTED_ERRORS:
+                result.errors.append(dto.UserImportError(line=number, message=str(e)))
+            continue
+
+        batch.append(user)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def _csv_row(line: bytes) -> list[str]:
+    # one record per line, fields with line breaks are not supported
+    return next(csv.reader([line.decode().rstrip("\r")]), [])
@@ -1,13 +1,16 @@
 import uuid
-from typing import Any, overload
+from typing import Any, Final, Sequence, overload
 
 from src.common import dto
 from src.common.exceptions import ConflictError, NotFoundError
-from src.database.alchemy import queries
+from src.database.alchemy import entity, queries
+from src.database.alchemy.queries.materialize import Materializer, materializer
 from src.database.alchemy.types import role
 from src.database.tools import on_error
 from src.services.base import Service
 
+_ROLE: Final[Materializer[dto.Role]] = materializer(dto.Role, entity.Role)
+
 
 class RoleService(Service):
     __slots__ = ()
@@ -18,7 +21,7 @@ class RoleService(Service):
         if not role:
             raise ConflictError("This role already exists")
 
-        return dto.Role.from_mapping(role.as_dict())
+        return _ROLE.from_entity(role)
 
     @overload
     async def get_one(
@@ -36,7 +39,7 @@ class RoleService(Service):
         if not role:
             raise NotFoundError("Role not found", **kw)
 
-        return dto.Role.from_mapping(role.as_dict())
+        return _ROLE.from_entity(role)
 
     @on_error(base_message="Role was not set. {reason}", detail="Set Role Failed")
     async def set_role_to_user(self, data: dto.SetRoleToUser) -> dto.Status:
@@ -45,9 +48,27 @@ class RoleService(Service):
         set_role = await self._manager.send(
             queries.role.SetToUser(user_id=data.user_id, role_id=role.id)
         )
+        if set_role:
+            # roles are part of the user's representation and its ETag
+            await self._manager.send(queries.user.Touch(id=data.user_id))
 
         return dto.Status(success=bool(set_role))
 
+    @on_error(base_message="Role was not set. {reason}", detail="Set Role Failed")
+    async def set_role_to_users(
+        self, user_ids: Sequence[uuid.UUID], name: role.RoleType
+    ) -> dto.Role:
+        # the role is returned as the users show it, with its permissions
+        role = await self.get_one("permissions", name=name)
+
+        set_roles = await self._manager.send(
+            queries.role.BulkSetToUsers(*user_ids, role_id=role.id)
+        )
+        if set_roles:
+            await self._manager.send(queries.user.TouchMany(*user_ids))
+
+        return role
+
     @on_error(
         base_message="Role was not changed. {reason}", detail="Change Role Failed"
     )
@@ -60,5 +81,7 @@ class RoleService(Service):
                 user_id=data.user_id, old_role_id=old_role.id, new_role_id=new_role.id
             )
         )
+        if changed:
+            await self._manager.send(queries.user.Touch(id=data.user_id))
 
         return dto.Status(success=bool(changed))
@@ -1,4 +1,5 @@
 import base64
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import (
     Any,
@@ -24,6 +25,10 @@ class JWTImpl(JWT[tuple[datetime, Token], TokenPayload]):
     def __init__(self, settings: CipherSettings) -> None:
         self._settings = settings
 
+    @property
+    def stateless(self) -> bool:
+        return self._settings.stateless_access_tokens
+
     def encode(
         self,
         sub: str,
@@ -62,6 +67,8 @@ class JWTImpl(JWT[tuple[datetime, Token], TokenPayload]):
             "sub": sub,
             "iat": now,
             "type": typ,
+            # tokens issued within the same second still differ
+            "jti": uuid.uuid4().hex,
         }
         try:
             token = jwt.encode(
@@ -91,4 +98,4 @@ class JWTImpl(JWT[tuple[datetime, Token], TokenPayload]):
         except jwt.PyJWTError as e:
             raise UnAuthorizedError("Token is invalid or expired") from e
 
-        return TokenPayload(**result)
+        return TokenPayload.from_mapping(result)
@@ -0,0 +1,139 @@
+import asyncio
+import heapq
+import itertools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Final, TypeVar
+
+from src.common.exceptions import ServiceUnavailableError
+from src.core.settings import CipherSettings
+from src.interfaces.hasher import AbstractAsyncHasher, AbstractHasher
+
+R = TypeVar("R")
+
+# lower value wins, so logins are never stuck behind a burst of signups
+VERIFY_PRIORITY: Final[int] = 0
+HASH_PRIORITY: Final[int] = 1
+
+
+class _PriorityGate:
+    __slots__ = (
+        "_free",
+        "_queue_size",
+        "_waiters",
+        "_counter",
+    )
+
+    def __init__(self, workers: int, queue_size: int) -> None:
+        self._free = workers
+        self._queue_size = queue_size
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+
+    @property
+    def pending(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, priority: int) -> None:
+        if self._free > 0 and not self._waiters:
+            self._free -= 1
+            return
+
+        if len(self._waiters) >= self._queue_size:
+            raise ServiceUnavailableError(
+                "Server is busy, try again later", headers={"Retry-After": "1"}
+            )
+
+        waiter = (
+            priority,
+            next(self._counter),
+            asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(self._waiters, waiter)
+        try:
+            await waiter[2]
+        except asyncio.CancelledError:
+            if waiter[2].done() and not waiter[2].cancelled():
+                # slot was already handed over to us, pass it on
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+
+        self._free += 1
+
+
+class PooledHasher(AbstractAsyncHasher):
+    __slots__ = (
+        "_hasher",
+        "_executor_factory",
+        "_executor",
+        "_gate",
+    )
+
+    def __init__(
+        self,
+        hasher: AbstractHasher,
+        executor_factory: Callable[[], Executor],
+        workers: int,
+        queue_size: int,
+    ) -> None:
+        self._hasher = hasher
+        self._executor_factory = executor_factory
+        self._executor: Executor | None = None
+        self._gate = _PriorityGate(workers, queue_size)
+
+    async def hash_password(self, plain: str) -> str:
+        return await self._run(HASH_PRIORITY, self._hasher.hash_password, plain)
+
+    async def verify_password(self, hashed: str, plain: str) -> bool:
+        return await self._run(
+            VERIFY_PRIORITY, self._hasher.verify_password, hashed, plain
+        )
+
+    async def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, priority: int, func: Callable[..., R], *args: Any) -> R:
+        await self._gate.acquire(priority)
+        try:
+            # created on first use, so every worker process owns its own pool
+            if self._executor is None:
+                self._executor = self._executor_factory()
+
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, func, *args
+            )
+        finally:
+            self._gate.release()
+
+
+def get_pooled_hasher(hasher: AbstractHasher, settings: CipherSettings) -> PooledHasher:
+    executor_factory: Callable[[], Executor]
+    if settings.hasher_executor == "process":
+        executor_factory = partial(
+            ProcessPoolExecutor, max_workers=settings.hasher_workers
+        )
+    else:
+        executor_factory = partial(
+            ThreadPoolExecutor,
+            max_workers=settings.hasher_workers,
+            thread_name_prefix="hasher",
+        )
+
+    return PooledHasher(
+        hasher,
+        executor_factory,
+        workers=settings.hasher_workers,
+        queue_size=settings.hasher_queue_size,
+    )
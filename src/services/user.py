@@ -1,16 +1,33 @@
+import asyncio
 import uuid
-from typing import Any, Literal, overload
+from typing import Any, AsyncIterator, Final, Literal, Sequence, TypeVar, overload
 
 import msgspec
 
 from src.common import dto
 from src.common.exceptions import ConflictError, NotFoundError
-from src.database.alchemy import queries
-from src.database.alchemy.types import OrderByType, user
-from src.database.tools import on_error
-from src.interfaces.hasher import AbstractHasher
+from src.database.alchemy import entity, queries
+from src.database.alchemy.queries.materialize import Materializer, materializer
+from src.database.alchemy.types import CountType, OrderByType, user
+from src.database.alchemy.types.role import RoleType
+from src.database.tools import decode_cursor, encode_cursor, on_error
+from src.interfaces.hasher import AbstractAsyncHasher
 from src.services.base import Service
 
+_USER_DECODER: Final[msgspec.json.Decoder[dto.User]] = msgspec.json.Decoder(dto.User)
+# passwords hashed at once by a bulk operation, kept below the hasher queue size
+HASH_BATCH_SIZE: Final[int] = 16
+# rows fetched from the server side cursor at once
+EXPORT_PARTITION_SIZE: Final[int] = 1_000
+_USER: Final[Materializer[dto.User]] = materializer(dto.User, entity.User)
+
+UserWithPasswordT = TypeVar("UserWithPasswordT", dto.UserCreate, dto.UserBulkUpdate)
+
+
+def normalize_login(login: str) -> str:
+    # case is handled by `idx_lower_login`, surrounding spaces are never meant
+    return login.strip()
+
 
 class UserService(Service):
     __slots__ = ()
@@ -26,12 +43,24 @@ class UserService(Service):
     async def get_one(
         self, *_loads: user.LoadsType, lock: bool = False, **kw: Any
     ) -> dto.User:
+        if login := kw.get("login"):
+            kw["login"] = normalize_login(login)
+
+        if not lock:
+            # the user with its roles and permissions in a single statement,
+            # skipping the orm entities in between
+            found = await self._manager.send(queries.user.GetAsJson(*_loads, **kw))
+            if not found:
+                raise NotFoundError("User not found", **kw)
+
+            return _USER_DECODER.decode(found)
+
         user = await self._manager.send(queries.user.Get(*_loads, lock=lock, **kw))
 
         if not user:
             raise NotFoundError("User not found", **kw)
 
-        return dto.User.from_mapping(user.as_dict())
+        return _USER.from_entity(user)
 
     async def get_many(
         self,
@@ -39,61 +68,216 @@ class UserService(Service):
         order_by: OrderByType = "ASC",
         limit: int | None = None,
         offset: int | None = None,
-    ) -> tuple[int, list[dto.User]]:
-        total, users = await self._manager.send(
+        count: CountType = "exact",
+    ) -> tuple[int, list[dto.User], CountType]:
+        total, users, count = await self._manager.send(
             queries.user.GetManyByOffset(
-                *_loads, order_by=order_by, offset=offset, limit=limit
+                *_loads, order_by=order_by, offset=offset, limit=limit, count=count
+            )
+        )
+
+        return total, [_USER.from_entity(user) for user in users], count
+
+    async def get_many_by_cursor(
+        self,
+        *_loads: user.LoadsType,
+        limit: int,
+        order_by: OrderByType = "ASC",
+        cursor: str | None = None,
+    ) -> tuple[list[dto.User], str | None]:
+        users, has_more = await self._manager.send(
+            queries.user.GetManyByCursor(
+                *_loads,
+                limit=limit,
+                order_by=order_by,
+                after=decode_cursor(cursor) if cursor else None,
             )
         )
+        next_cursor = (
+            encode_cursor(users[-1].created_at, users[-1].id) if has_more else None
+        )
 
-        return total, [dto.User.from_mapping(user.as_dict()) for user in users]
+        return [_USER.from_entity(user) for user in users], next_cursor
+
+    async def export(
+        self, order_by: OrderByType = "ASC", partition_size: int = EXPORT_PARTITION_SIZE
+    ) -> AsyncIterator[list[str]]:
+        # users with their roles as json documents, written out as they are
+        partitions = await self._manager.send(
+            queries.user.StreamAsJson(
+                "roles", order_by=order_by, partition_size=partition_size
+            )
+        )
+        async for rows in partitions:
+            yield [row[0] for row in rows]
+
+    async def get_version(self, id: uuid.UUID) -> str:
+        version = await self._manager.send(queries.user.GetVersion(id=id))
+
+        if not version:
+            raise NotFoundError("User not found", id=id)
+
+        return version
+
+    async def get_many_version(self) -> str:
+        return await self._manager.send(queries.user.GetManyVersion())
 
     @on_error("login", detail="Creation failed")
-    async def create(self, data: dto.UserCreate, hasher: AbstractHasher) -> dto.User:
-        data.password = hasher.hash_password(data.password)
+    async def create(
+        self, data: dto.UserCreate, hasher: AbstractAsyncHasher
+    ) -> dto.User:
+        data.login = normalize_login(data.login)
+        data.password = await hasher.hash_password(data.password)
 
         user = await self._manager.send(queries.user.Create(**data.to_dict()))
 
         if not user:
             raise ConflictError("This user already exists")
 
-        return dto.User.from_mapping(user.as_dict())
+        return _USER.from_entity(user)
+
+    @on_error("login", detail="Creation failed")
+    async def signup(
+        self,
+        data: dto.UserCreate,
+        hasher: AbstractAsyncHasher,
+        role: RoleType = "USER",
+    ) -> dto.User:
+        # the user, its role and the returned representation in one statement
+        found = await self._manager.send(
+            queries.user.Signup(
+                normalize_login(data.login),
+                await hasher.hash_password(data.password),
+                role=role,
+            )
+        )
+        if not found:
+            raise ConflictError("This user already exists")
+
+        user = _USER_DECODER.decode(found)
+        if not user.roles:
+            raise NotFoundError("Role not found", name=role)
+
+        return user
+
+    @on_error("login", detail="Creation failed")
+    async def create_many(self, data: Sequence[dto.UserCreate]) -> list[dto.User]:
+        # passwords come hashed by `hash_users`, see `CreateManyUsersCommand`.
+        # logins that are already taken are skipped, not reported as conflicts
+        users = await self._manager.send(
+            queries.user.BulkCreate(
+                *(
+                    {"login": normalize_login(user.login), "password": user.password}
+                    for user in data
+                )
+            )
+        )
+
+        return [_USER.from_entity(user) for user in users]
+
+    async def import_many(
+        self, data: Sequence[dto.UserCreate], role: RoleType = "USER"
+    ) -> int:
+        # passwords come hashed by `hash_users`, see `ImportUsersCommand`
+        found = await self._manager.send(queries.role.Get(name=role))
+        if not found:
+            raise NotFoundError("Role not found", name=role)
+
+        return await self._manager.send(
+            queries.user.Import(
+                *((normalize_login(user.login), user.password) for user in data),
+                role_id=found.id,
+            )
+        )
 
     @on_error("login", detail="Updating failed")
     async def update(
-        self, id: uuid.UUID, hasher: AbstractHasher, data: dto.UserUpdate
+        self, id: uuid.UUID, hasher: AbstractAsyncHasher, data: dto.UserUpdate
     ) -> dto.User:
-        await self.ensure_exists(id=id)
-
+        if data.login and data.login != msgspec.UNSET:
+            data.login = normalize_login(data.login)
         if data.password and data.password != msgspec.UNSET:
-            data.password = hasher.hash_password(data.password)
+            data.password = await hasher.hash_password(data.password)
 
+        # a missing user is told apart by no returned row, not by a lookup before
         user = await self._manager.send(queries.user.Update(id=id, **data.to_dict()))
         if not user:
-            raise NotFoundError("User to update not found", id=id)
+            raise NotFoundError("User not found", id=id)
+
+        return _USER.from_entity(user)
 
-        return dto.User.from_mapping(user.as_dict())
+    @on_error("login", detail="Updating failed")
+    async def update_many(self, data: Sequence[dto.UserBulkUpdate]) -> list[dto.User]:
+        # passwords come hashed by `hash_users`, see `UpdateManyUsersCommand`
+        rows = [user.to_dict() for user in data]
+        for row in rows:
+            if login := row.get("login"):
+                row["login"] = normalize_login(login)
+
+        # unknown ids are not an error, they are just missing in the result
+        users = await self._manager.send(queries.user.BulkUpdate(*rows))  # type: ignore[arg-type]
+
+        return [_USER.from_entity(user) for user in users]
 
     @on_error(
         base_message="You cannot delete this user. {reason}",
         detail="Deleting failed",
     )
     async def delete(self, id: uuid.UUID) -> dto.User:
-        await self.ensure_exists(id=id)
-
         user = await self._manager.send(queries.user.Delete(id=id))
         if not user:
-            raise ConflictError("Couldn't delete user", id=id)
+            raise NotFoundError("User not found", id=id)
 
-        return dto.User.from_mapping(user.as_dict())
+        return _USER.from_entity(user)
+
+    @on_error(
+        base_message="You cannot delete these users. {reason}",
+        detail="Deleting failed",
+    )
+    async def delete_many(self, ids: Sequence[uuid.UUID]) -> list[dto.User]:
+        users = await self._manager.send(queries.user.BulkDelete(*ids))
+
+        return [_USER.from_entity(user) for user in users]
 
     @overload
     async def ensure_exists(self, *, id: uuid.UUID) -> Literal[True]: ...
     @overload
     async def ensure_exists(self, *, login: str) -> Literal[True]: ...
     async def ensure_exists(self, **kw: Any) -> Literal[True]:
+        if login := kw.get("login"):
+            kw["login"] = normalize_login(login)
+
         exists = await self._manager.send(queries.user.Exists(**kw))
         if not exists:
             raise NotFoundError(message="User not found", **kw)
 
         return True
+
+
+async def hash_users(
+    hasher: AbstractAsyncHasher, data: Sequence[UserWithPasswordT]
+) -> list[UserWithPasswordT]:
+    # users of a bulk update may keep their password, these are left as they are
+    hashed = iter(
+        await hash_passwords(hasher, [user.password for user in data if user.password])
+    )
+
+    return [
+        msgspec.structs.replace(user, password=next(hashed)) if user.password else user
+        for user in data
+    ]
+
+
+async def hash_passwords(
+    hasher: AbstractAsyncHasher, passwords: Sequence[str]
+) -> list[str]:
+    hashed: list[str] = []
+    for start in range(0, len(passwords), HASH_BATCH_SIZE):
+        hashed += await asyncio.gather(
+            *(
+                hasher.hash_password(password)
+                for password in passwords[start : start + HASH_BATCH_SIZE]
+            )
+        )
+
+    return hashed
@@ -1,3 +1,4 @@
+import base64
 from functools import wraps
 from typing import AsyncIterator, Awaitable, Callable, ParamSpec, TypeVar
 
@@ -9,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 
 from src.api import init_app
 from src.api.v1 import init_v1_router
-from src.core.settings import DatabaseSettings, Settings, load_settings
+from src.core.settings import CipherSettings, DatabaseSettings, Settings, load_settings
 from src.database.alchemy.connection import (
     create_sa_engine,
     create_sa_session_factory,
@@ -20,7 +21,9 @@ from src.database.manager import TransactionManager
 from src.interfaces.connection import AbstractAsyncConnection
 from src.interfaces.hasher import AbstractHasher
 from src.interfaces.manager import AbstractTransactionManager
+from src.services.cache.redis import RedisCache, get_redis
 from src.services.security.argon2 import get_argon2_hasher
+from src.services.security.pooled import PooledHasher, get_pooled_hasher
 
 pytestmark = pytest.mark.anyio
 
@@ -107,10 +110,38 @@ async def manager(
         yield manager
 
 
+@pytest.fixture(scope="function")
+async def redis(settings: Settings) -> AsyncIterator[RedisCache]:
+    cache = get_redis(settings.redis)
+    yield cache
+    await cache.close()
+
+
 @pytest.fixture(scope="session")
 def argon() -> AbstractHasher:
     return get_argon2_hasher()
 
+
+@pytest.fixture(scope="function")
+def cipher() -> CipherSettings:
+    key = base64.b64encode(b"test_secret_key").decode()
+    return CipherSettings(
+        algorithm="HS256",
+        secret_key=key,
+        public_key=key,
+        access_token_expire_seconds=60,
+        refresh_token_expire_seconds=3600,
+    )
+
+
+@pytest.fixture(scope="function")
+async def hasher(
+    argon: AbstractHasher, cipher: CipherSettings
+) -> AsyncIterator[PooledHasher]:
+    hasher = get_pooled_hasher(argon, cipher)
+    yield hasher
+    await hasher.close()
+
 # the same like pytest.raises() function
 def handle_error(
     *skip: type[BaseException],
@@ -0,0 +1,72 @@
+import pytest
+
+from src.api.v1.commands.user.bulk import (
+    CreateManyUsers,
+    CreateManyUsersCommand,
+    UpdateManyUsers,
+    UpdateManyUsersCommand,
+)
+from src.common import dto
+from src.database.alchemy import entity, queries
+from src.interfaces.hasher import AbstractHasher
+from src.interfaces.manager import AbstractTransactionManager
+from src.services import UserService
+from src.services.cache.principal import PrincipalCache
+from src.services.cache.redis import RedisCache
+from src.services.security.pooled import PooledHasher
+from tests.conftest import *  # noqa
+from tests.repository.conftest import *  # noqa
+
+
+@pytest.fixture(scope="function")
+def principal(redis: RedisCache) -> PrincipalCache:
+    return PrincipalCache(redis, ttl=60)
+
+
+async def test_create_many_returns_roles(
+    manager: AbstractTransactionManager,
+    hasher: PooledHasher,
+    principal: PrincipalCache,
+    with_roles: None,
+) -> None:
+    created = await CreateManyUsersCommand(manager, hasher, principal).execute(
+        CreateManyUsers(
+            users=[
+                dto.UserCreate(login=f"user{i}", password="password") for i in range(3)
+            ]
+        )
+    )
+
+    assert len(created) == 3, "Users were not created"
+    for user in created:
+        stored = await UserService(manager).get_one("roles", "permissions", id=user.id)
+        assert user.roles and user.roles == stored.roles, "Assigned role not returned"
+
+
+async def test_update_many_hashes_passwords(
+    manager: AbstractTransactionManager,
+    hasher: PooledHasher,
+    argon: AbstractHasher,
+    principal: PrincipalCache,
+    user: entity.User,
+) -> None:
+    other = await manager.send(queries.user.Create(login="other", password="kept"))
+    assert other, "User was not created"
+
+    updated = await UpdateManyUsersCommand(manager, hasher, principal).execute(
+        UpdateManyUsers(
+            users=[
+                dto.UserBulkUpdate(id=user.id, password="new_password"),
+                dto.UserBulkUpdate(id=other.id, login="renamed"),
+            ]
+        )
+    )
+    assert {u.login for u in updated} == {"test", "renamed"}, "Users not updated"
+
+    changed = await manager.send(queries.user.Get(id=user.id, secrets=True))
+    kept = await manager.send(queries.user.Get(id=other.id, secrets=True))
+
+    assert changed and argon.verify_password(
+        changed.password, "new_password"
+    ), "Password was not hashed"
+    assert kept and kept.password == "kept", "Missing password was changed"
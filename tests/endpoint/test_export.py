@@ -0,0 +1,39 @@
+import msgspec
+
+from src.api.v1.commands.user.export import ExportUsers, ExportUsersCommand
+from src.common import dto
+from src.database.alchemy import queries
+from src.interfaces.manager import AbstractTransactionManager
+from src.services import RoleService
+from tests.conftest import *  # noqa
+from tests.repository.conftest import *  # noqa
+
+
+async def test_export_lines(
+    manager: AbstractTransactionManager, with_roles: None
+) -> None:
+    users = [
+        await manager.send(queries.user.Create(login=f"user{i}", password="test"))
+        for i in range(3)
+    ]
+    assert all(users), "Users were not created"
+    await RoleService(manager).set_role_to_users([users[0].id, users[1].id], "USER")
+    await RoleService(manager).set_role_to_users([users[1].id], "ADMIN")
+
+    chunks = [
+        chunk
+        async for chunk in await ExportUsersCommand(manager).execute(
+            ExportUsers(order_by="DESC")
+        )
+    ]
+    lines = b"".join(chunks).splitlines()
+    exported = [msgspec.json.decode(line, type=dto.User) for line in lines]
+
+    assert [user.id for user in exported] == sorted(
+        (user.id for user in users), reverse=True
+    ), "Users are not exported in order"
+    assert {user.login: [role.name for role in user.roles] for user in exported} == {
+        "user0": ["USER"],
+        "user1": ["ADMIN", "USER"],
+        "user2": [],
+    }, "Exported roles do not match"
@@ -0,0 +1,138 @@
+import uuid
+from typing import Any
+
+import pytest
+from litestar import Litestar
+from litestar.di import Provide
+from litestar.types import Message, Receive, Scope
+
+from src.api.v1.middlewares.rate_limit import MAX_PEEK_BODY_SIZE, RateLimitMiddleware
+from src.common.exceptions import TooManyRequestsError
+from src.services.cache.rate_limit import RateLimiter
+from src.services.cache.redis import RedisCache
+from tests.conftest import *  # noqa
+
+PROXY = "10.0.0.1"
+
+
+class _Handler:
+    def __init__(self) -> None:
+        self.bodies: list[bytes] = []
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Any) -> None:
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        self.bodies.append(b"".join(chunks))
+
+
+@pytest.fixture(scope="function")
+def limiter(redis: RedisCache) -> RateLimiter:
+    return RateLimiter(redis, {"login": (2, 60)}, trusted_proxies=[PROXY])
+
+
+def _scope(limiter: RateLimiter, client: str, real_ip: str | None = None) -> Scope:
+    app = Litestar(
+        [],
+        dependencies={"rate_limiter": Provide(lambda: limiter, sync_to_thread=False)},
+    )
+    headers = [(b"x-real-ip", real_ip.encode())] if real_ip else []
+    return {  # type: ignore[return-value]
+        "type": "http",
+        "headers": headers,
+        "client": (client, 50000),
+        "app": app,
+    }
+
+
+def _receive(*chunks: bytes) -> Receive:
+    messages: list[Message] = [
+        {
+            "type": "http.request",
+            "body": chunk,
+            "more_body": i < len(chunks) - 1,
+        }
+        for i, chunk in enumerate(chunks)
+    ]
+
+    async def receive() -> Message:
+        return messages.pop(0)
+
+    return receive
+
+
+def _login(login: str) -> bytes:
+    return f'{{"login": "{login}", "password": "wrong"}}'.encode()
+
+
+async def _send(*args: Any) -> None:
+    pass
+
+
+async def test_real_ip_ignored_from_untrusted_client(limiter: RateLimiter) -> None:
+    middleware = RateLimitMiddleware(_Handler(), name="login", by=("ip",))
+    client = f"192.0.2.{uuid.uuid4().int % 200}"
+    await limiter.hit("login", f"ip:{client}")
+    await limiter.hit("login", f"ip:{client}")
+
+    with pytest.raises(TooManyRequestsError):
+        await middleware(
+            _scope(limiter, client, real_ip=uuid.uuid4().hex), _receive(b""), _send
+        )
+
+
+async def test_real_ip_from_trusted_proxy(limiter: RateLimiter) -> None:
+    handler = _Handler()
+    middleware = RateLimitMiddleware(handler, name="login", by=("ip",))
+
+    for _ in range(3):
+        await middleware(
+            _scope(limiter, PROXY, real_ip=uuid.uuid4().hex), _receive(b""), _send
+        )
+
+    assert len(handler.bodies) == 3, "Clients behind the proxy share a limit"
+
+
+async def test_login_not_locked_out_by_others(limiter: RateLimiter) -> None:
+    handler = _Handler()
+    middleware = RateLimitMiddleware(handler, name="login", by=("ip", "login"))
+    body = _login(uuid.uuid4().hex)
+
+    for _ in range(2):
+        await middleware(
+            _scope(limiter, PROXY, real_ip=uuid.uuid4().hex), _receive(body), _send
+        )
+
+    owner = _scope(limiter, PROXY, real_ip=uuid.uuid4().hex)
+    for _ in range(2):
+        await middleware(owner, _receive(body), _send)
+    with pytest.raises(TooManyRequestsError):
+        await middleware(owner, _receive(body), _send)
+
+    assert handler.bodies == [body] * 4, "Body was not passed on"
+
+
+async def test_large_body_not_read_past_limit(limiter: RateLimiter) -> None:
+    handler = _Handler()
+    middleware = RateLimitMiddleware(handler, name="login", by=("login",))
+    chunk = b" " * (MAX_PEEK_BODY_SIZE // 2)
+    body = _login(uuid.uuid4().hex)
+    receive = _receive(chunk, chunk, chunk, body)
+    received = 0
+
+    async def counting() -> Message:
+        nonlocal received
+        received += 1
+        return await receive()
+
+    async def app(scope: Scope, receive: Receive, send: Any) -> None:
+        assert received == 3, "Body was read past the limit"
+        await handler(scope, receive, send)
+
+    middleware.app = app
+    await middleware(_scope(limiter, PROXY), counting, _send)
+
+    assert handler.bodies == [chunk * 3 + body], "Body was not passed on whole"
@@ -0,0 +1,55 @@
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.api.common.middlewares import TransactionScopeMiddleware
+from src.database.alchemy import queries
+from src.database.alchemy.connection import (
+    create_sa_session_factory,
+    create_session_factory,
+)
+from src.database.manager import create_db_manager_factory
+from src.interfaces.connection import AbstractAsyncConnection
+from tests.conftest import *  # noqa
+
+
+async def _receive() -> Any:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: Any) -> None:
+    pass
+
+
+async def test_idle_connection_released_on_response_start(
+    engine: AsyncEngine,
+    connection_factory: Callable[[], AbstractAsyncConnection],
+) -> None:
+    checkins = []
+    event.listen(engine.sync_engine, "checkin", lambda *args: checkins.append(1))
+    factory = create_db_manager_factory(connection_factory)
+    export_factory = create_db_manager_factory(
+        create_session_factory(create_sa_session_factory(engine))
+    )
+    released: list[int] = []
+
+    async def app(scope: Any, receive: Any, send: Any) -> None:
+        # the user lookup of the authentication
+        async with factory() as manager:
+            await manager.send(queries.user.Exists(login="test"))
+
+        async with export_factory() as export:
+            await export.create_transaction()
+            await export.send(queries.user.Exists(login="test"))
+
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            released.append(len(checkins))
+            assert export.conn.in_transaction(), "Export lost its connection"
+
+            await send({"type": "http.response.body", "body": b""})
+
+    await TransactionScopeMiddleware(app)({"type": "http"}, _receive, _send)
+
+    assert released == [1], "Idle connection was held through the response"
+    assert len(checkins) == 2, "Export connection was not released"
@@ -0,0 +1,53 @@
+from typing import Any
+
+from sqlalchemy import Select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.alchemy import queries
+from src.interfaces.command import Query
+from src.interfaces.manager import AbstractTransactionManager
+from tests.conftest import *  # noqa
+from tests.repository.conftest import *  # noqa
+
+
+class Explain(Query[AsyncSession, str]):
+    __slots__ = ("stmt",)
+
+    def __init__(self, stmt: Select[Any]) -> None:
+        self.stmt = stmt
+
+    async def execute(self, conn: AsyncSession, /, **kw: Any) -> str:
+        # tables in tests are tiny, the planner would scan them anyway
+        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        sql = self.stmt.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+        plan = await conn.scalars(text(f"EXPLAIN {sql}"))
+
+        return "\n".join(plan)
+
+
+async def test_user_login_lookups_use_index(
+    manager: AbstractTransactionManager,
+) -> None:
+    for query in (
+        queries.user.Get(login="Test"),
+        queries.user.Get("roles", login=" test"),
+        queries.user.Exists(login="TEST"),
+    ):
+        plan = await manager.send(Explain(query._stmt()))
+
+        assert "idx_lower_login" in plan, f"Index not used:\n{plan}"
+
+
+async def test_role_name_lookups_use_index(
+    manager: AbstractTransactionManager,
+) -> None:
+    for query in (
+        queries.role.Get(name="ADMIN"),
+        queries.role.Get("permissions", name="user"),
+    ):
+        plan = await manager.send(Explain(query._stmt()))
+
+        assert "idx_lower_role_name" in plan, f"Index not used:\n{plan}"
@@ -0,0 +1,70 @@
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.database.alchemy import queries
+from src.database.alchemy.connection import (
+    create_sa_engine,
+    create_sa_session_factory,
+    create_session_factory,
+)
+from src.database.alchemy.replica import AlchemyReadReplica
+from src.database.manager import create_db_manager_factory
+from src.interfaces.connection import AbstractAsyncConnection
+from tests.conftest import *  # noqa
+from tests.repository.conftest import *  # noqa
+
+
+async def test_replica_routing_success(
+    engine: AsyncEngine,
+    connection_factory: Callable[[], AbstractAsyncConnection],
+) -> None:
+    # a second engine on the same database stands in for the replica
+    replica_engine = create_sa_engine(engine.url.render_as_string(hide_password=False))
+    replica = AlchemyReadReplica(
+        replica_engine,
+        create_session_factory(create_sa_session_factory(replica_engine)),
+        max_lag=1,
+        probe_interval=1,
+    )
+    primary = create_db_manager_factory(connection_factory)
+    read = create_db_manager_factory(connection_factory, replica=replica)
+
+    def on_replica() -> bool:
+        return read().conn._conn.bind is replica_engine  # type: ignore[attr-defined]
+
+    try:
+        assert not on_replica(), "Replica was used before it was probed"
+        assert await replica.probe() == 0, "A primary has no lag"
+        assert on_replica(), "Replica was not used"
+
+        replica.lag = 5
+        assert not on_replica(), "Lagging replica was used"
+        replica.lag = 0
+
+        async with primary() as manager:
+            await manager.create_transaction()
+            await manager.send(queries.user.Create(login="test", password="test"))
+
+        assert not on_replica(), "Replica was used right after a write"
+
+        async with read() as manager:
+            assert await manager.send(queries.user.Exists(login="test"))
+    finally:
+        await replica_engine.dispose()
+
+
+async def test_replica_probe_failed(
+    engine: AsyncEngine,
+    connection_factory: Callable[[], AbstractAsyncConnection],
+) -> None:
+    replica_engine = create_sa_engine(engine.url.set(port=1).render_as_string(False))
+    replica = AlchemyReadReplica(
+        replica_engine, connection_factory, max_lag=1, probe_interval=1
+    )
+    replica.lag = 0
+    try:
+        assert await replica.probe() is None, "Unreachable replica has a lag"
+        assert not replica.available(), "Unreachable replica is used"
+    finally:
+        await replica_engine.dispose()
@@ -0,0 +1,127 @@
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.database.alchemy import queries
+from src.database.alchemy.connection import (
+    create_sa_session_factory,
+    create_session_factory,
+)
+from src.database.manager import (
+    create_db_manager_factory,
+    release_idle,
+    transaction_scope,
+)
+from src.interfaces.connection import AbstractAsyncConnection
+from tests.conftest import *  # noqa
+from tests.repository.conftest import *  # noqa
+
+
+async def test_scope_shares_connection_success(
+    engine: AsyncEngine,
+    connection_factory: Callable[[], AbstractAsyncConnection],
+) -> None:
+    checkouts = []
+    event.listen(engine.sync_engine, "checkout", lambda *args: checkouts.append(1))
+    factory = create_db_manager_factory(connection_factory)
+
+    assert factory() is not factory(), "Manager was shared outside of a scope"
+
+    async with transaction_scope():
+        assert factory() is factory(), "Manager was not shared within a scope"
+
+        # the user lookup of the authentication, then the handler writes
+        async with factory() as manager:
+            assert not await manager.send(queries.user.Exists(login="test"))
+
+        async with factory() as manager:
+            await manager.create_transaction()
+            await manager.send(queries.user.Create(login="test", password="test"))
+
+        assert len(checkouts) == 1, "Every command checked out a connection"
+
+    async with factory() as manager:
+        assert await manager.send(
+            queries.user.Exists(login="test")
+        ), "Write was not committed"
+
+
+async def test_scope_read_transaction_ended(
+    engine: AsyncEngine,
+    connection_factory: Callable[[], AbstractAsyncConnection],
+) -> None:
+    checkouts = []
+    event.listen(engine.sync_engine, "checkout", lambda *args: checkouts.append(1))
+    factory = create_db_manager_factory(connection_factory)
+
+    async with transaction_scope():
+        async with factory() as manager:
+            async with manager:
+                assert not await manager.send(queries.user.Exists(login="test"))
+
+            assert manager.conn.in_transaction(), "Inner block ended the read"
+
+        assert not manager.conn.in_transaction(), "Read was kept open"
+
+        async with factory() as manager:
+            assert not await manager.send(queries.user.Exists(login="test"))
+
+        assert len(checkouts) == 1, "Connection was not kept for the next command"
+
+
+async def test_scope_failed_command_rolled_back(
+    connection_factory: Callable[[], AbstractAsyncConnection],
+) -> None:
+    factory = create_db_manager_factory(connection_factory)
+
+    async with transaction_scope():
+        async with factory() as manager:
+            await manager.create_transaction()
+            await manager.send(queries.user.Create(login="test", password="test"))
+
+        try:
+            async with factory() as manager:
+                await manager.create_transaction()
+                await manager.send(queries.user.Create(login="new", password="test"))
+                raise ValueError()
+        except ValueError:
+            pass
+
+        async with factory() as manager:
+            assert await manager.send(
+                queries.user.Exists(login="test")
+            ), "Committed write was rolled back"
+            assert not await manager.send(
+                queries.user.Exists(login="new")
+            ), "Failed write was committed"
+
+
+async def test_scope_release_idle(
+    engine: AsyncEngine,
+    connection_factory: Callable[[], AbstractAsyncConnection],
+) -> None:
+    checkins = []
+    event.listen(engine.sync_engine, "checkin", lambda *args: checkins.append(1))
+    factory = create_db_manager_factory(connection_factory)
+    # a pool of its own, as for the export
+    streaming = create_db_manager_factory(
+        create_session_factory(create_sa_session_factory(engine))
+    )
+
+    async with transaction_scope():
+        async with factory() as manager:
+            assert not await manager.send(queries.user.Exists(login="test"))
+
+        async with streaming() as export:
+            await export.create_transaction()
+            assert not await export.send(queries.user.Exists(login="test"))
+
+            await release_idle()
+            assert len(checkins) == 1, "Idle connection was not released"
+            assert export.conn.in_transaction(), "Manager in use was released"
+
+        async with factory() as manager:
+            assert not await manager.send(
+                queries.user.Exists(login="test")
+            ), "Released manager can not be used again"
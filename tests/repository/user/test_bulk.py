@@ -0,0 +1,121 @@
+import pytest
+
+from src.database.alchemy import entity, queries
+from src.database.alchemy.queries import base
+from src.interfaces.manager import AbstractTransactionManager
+from tests.conftest import *  # noqa
+from tests.repository.conftest import *  # noqa
+
+
+async def test_bulk_create_success(manager: AbstractTransactionManager) -> None:
+    created = await manager.send(
+        queries.user.BulkCreate(
+            *({"login": f"bulk{i}", "password": "test"} for i in range(100)),
+            {"login": "bulk0", "password": "duplicate"},
+        )
+    )
+    total, _, _ = await manager.send(queries.user.GetManyByOffset())
+
+    assert len(created) == total == 100, "Duplicates were not skipped"
+
+
+async def test_bulk_create_chunks_success(
+    manager: AbstractTransactionManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(base, "MAX_BIND_PARAMS", 30)
+    created = await manager.send(
+        queries.user.BulkCreate(
+            *({"login": f"bulk{i}", "password": "test"} for i in range(25))
+        )
+    )
+
+    assert len(created) == 25, "Not every chunk was inserted"
+
+
+async def test_bulk_update_success(manager: AbstractTransactionManager) -> None:
+    users = await manager.send(
+        queries.user.BulkCreate(
+            *({"login": f"bulk{i}", "password": "test"} for i in range(3))
+        )
+    )
+    updated = await manager.send(
+        queries.user.BulkUpdate(
+            {"id": users[0].id, "login": "renamed0"},
+            {"id": users[1].id, "login": "renamed1", "password": "changed"},
+            {"id": users[2].id},
+        )
+    )
+    found = await manager.send(queries.user.Get(id=users[1].id))
+
+    assert {user.login for user in updated} == {"renamed0", "renamed1"}
+    assert found and found.password == "changed", "Update was not applied"
+
+
+async def test_bulk_delete_success(
+    manager: AbstractTransactionManager, with_roles: None
+) -> None:
+    users = await manager.send(
+        queries.user.BulkCreate(
+            *({"login": f"bulk{i}", "password": "test"} for i in range(3))
+        )
+    )
+    role = await manager.send(queries.role.Get(name="USER"))
+
+    assert role, "Role not found"
+
+    assigned = await manager.send(
+        queries.role.BulkSetToUsers(*(user.id for user in users), role_id=role.id)
+    )
+    deleted = await manager.send(
+        queries.user.BulkDelete(users[0].id, users[1].id, users[1].id)
+    )
+    total, left, _ = await manager.send(queries.user.GetManyByOffset("roles"))
+
+    assert len(assigned) == 3, "Roles were not assigned"
+    assert {user.id for user in deleted} == {users[0].id, users[1].id}
+    assert total == 1 and left[0].id == users[2].id
+    assert [r.name for r in left[0].roles] == ["USER"]
+    assert not await manager.send(queries.user.BulkDelete())
+
+
+async def test_import_success(
+    manager: AbstractTransactionManager, user: entity.User, with_roles: None
+) -> None:
+    role = await manager.send(queries.role.Get(name="USER"))
+
+    assert role, "Role not found"
+
+    created = await manager.send(
+        queries.user.Import(
+            ("imported", "hash"),
+            ("IMPORTED", "hash"),
+            ("TEST", "hash"),
+            *((f"imported{i}", "hash") for i in range(10)),
+            role_id=role.id,
+        )
+    )
+    again = await manager.send(
+        queries.user.Import(("imported", "hash"), ("new", "hash"), role_id=role.id)
+    )
+    total, users, _ = await manager.send(queries.user.GetManyByOffset("roles"))
+
+    assert created == 11, "Taken or repeated logins were imported"
+    assert again == 1, "Staging table kept rows of the previous import"
+    assert total == 13
+    assert all(u.roles for u in users if u.id != user.id), "Roles were not set"
+
+
+async def test_stream_success(manager: AbstractTransactionManager) -> None:
+    await manager.send(
+        queries.user.BulkCreate(
+            *({"login": f"bulk{i}", "password": "test"} for i in range(25))
+        )
+    )
+    partitions = await manager.send(
+        queries.user.Stream("id", "login", order_by="DESC", partition_size=10)
+    )
+    rows = [partition async for partition in partitions]
+    ids = [row.id for partition in rows for row in partition]
+
+    assert [len(partition) for partition in rows] == [10, 10, 5], "Not partitioned"
+    assert ids == sorted(ids, reverse=True), "Wrong ordering"
@@ -0,0 +1,149 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.database.alchemy import entity, queries
+from src.database.manager import TransactionManager
+from src.interfaces.connection import AbstractAsyncConnection
+from src.services.cache.query import QueryCache
+from tests.conftest import *  # noqa
+from tests.repository.conftest import *  # noqa
+
+
+class MemoryCache:
+    def __init__(self) -> None:
+        self.values: dict[str, Any] = {}
+
+    async def get_value(self, key: str) -> Any:
+        return self.values.get(key)
+
+    async def get_many(self, *keys: str) -> list[Any]:
+        return [self.values.get(key) for key in keys]
+
+    async def set_value(self, key: str, value: Any, **kw: Any) -> None:
+        self.values[key] = value
+
+    async def incr(self, key: str, amount: int = 1, **kw: Any) -> int:
+        self.values[key] = int(self.values.get(key) or 0) + amount
+        return self.values[key]
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator["MemoryCache"]:
+        yield self
+
+
+@pytest.fixture(scope="function")
+def cached_manager(
+    connection_factory: Callable[[], AbstractAsyncConnection],
+) -> Callable[[], TransactionManager]:
+    cache = QueryCache(MemoryCache(), ttl=60)  # type: ignore[arg-type]
+    return lambda: TransactionManager(connection_factory(), cache=cache)
+
+
+async def _rename_behind_cache(engine: AsyncEngine, user: entity.User) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(
+            update(entity.User).where(entity.User.id == user.id).values(login="raw")
+        )
+
+
+async def test_get_served_from_cache(
+    engine: AsyncEngine,
+    cached_manager: Callable[[], TransactionManager],
+) -> None:
+    async with cached_manager() as manager:
+        await manager.create_transaction()
+        user = await manager.send(queries.user.Create(login="cached", password="p"))
+
+    assert user, "User was not created"
+
+    async with cached_manager() as manager:
+        cached = await manager.send(queries.user.Get("roles", id=user.id))
+
+    await _rename_behind_cache(engine, user)
+
+    async with cached_manager() as manager:
+        again = await manager.send(queries.user.Get("roles", id=user.id))
+        total, users, _ = await manager.send(queries.user.GetManyByOffset())
+
+    assert cached and again, "User not found"
+    assert again.as_dict() == cached.as_dict(secrets=False), "Result was not cached"
+    assert total == 1 and users[0].login == "raw", "List shares the single entry"
+
+
+async def test_commit_invalidates_cache(
+    cached_manager: Callable[[], TransactionManager],
+) -> None:
+    async with cached_manager() as manager:
+        await manager.create_transaction()
+        user = await manager.send(queries.user.Create(login="cached", password="p"))
+
+    assert user, "User was not created"
+
+    async with cached_manager() as manager:
+        assert await manager.send(queries.user.Exists(login="cached"))
+
+    async with cached_manager() as manager:
+        await manager.create_transaction()
+        await manager.send(queries.user.Update(id=user.id, login="renamed"))
+
+    async with cached_manager() as manager:
+        found = await manager.send(queries.user.Get(id=user.id))
+        exists = await manager.send(queries.user.Exists(login="cached"))
+
+    assert found and found.login == "renamed", "Stale user returned after commit"
+    assert not exists, "Stale exists returned after commit"
+
+
+async def test_rollback_keeps_cache(
+    engine: AsyncEngine,
+    cached_manager: Callable[[], TransactionManager],
+) -> None:
+    async with cached_manager() as manager:
+        await manager.create_transaction()
+        user = await manager.send(queries.user.Create(login="cached", password="p"))
+
+    assert user, "User was not created"
+
+    async with cached_manager() as manager:
+        await manager.send(queries.user.Get(id=user.id))
+
+    await _rename_behind_cache(engine, user)
+
+    with pytest.raises(RuntimeError):
+        async with cached_manager() as manager:
+            await manager.create_transaction()
+            await manager.send(queries.user.Update(id=user.id, login="renamed"))
+            renamed = await manager.send(queries.user.Get(id=user.id))
+            assert renamed and renamed.login == "renamed", "Own write is not visible"
+            raise RuntimeError
+
+    async with cached_manager() as manager:
+        found = await manager.send(queries.user.Get(id=user.id))
+
+    assert found and found.login == "cached", "Rolled back write invalidated cache"
+
+
+async def test_secrets_not_cached(
+    connection_factory: Callable[[], AbstractAsyncConnection],
+) -> None:
+    cache = MemoryCache()
+    query_cache = QueryCache(cache, ttl=60)  # type: ignore[arg-type]
+    async with TransactionManager(connection_factory(), cache=query_cache) as manager:
+        await manager.create_transaction()
+        user = await manager.send(queries.user.Create(login="cached", password="p"))
+
+    assert user, "User was not created"
+
+    async with TransactionManager(connection_factory(), cache=query_cache) as manager:
+        await manager.send(queries.user.Get(id=user.id))
+
+    async with TransactionManager(connection_factory(), cache=query_cache) as manager:
+        cached = await manager.send(queries.user.Get(id=user.id))
+        found = await manager.send(queries.user.Get(secrets=True, id=user.id))
+
+    assert cached and "password" not in cached.as_dict(), "Password was cached"
+    assert found and found.password == "p", "Secret columns were not read"
@@ -20,6 +20,14 @@ async def test_create_failed(manager: AbstractTransactionManager) -> None:
     assert not same_user, "Same user was created"
 
 
+async def test_signup_failed(
+    manager: AbstractTransactionManager, user: entity.User, with_roles: None
+) -> None:
+    same_user = await manager.send(queries.user.Signup("TEST", "test_test"))
+
+    assert not same_user, "Same user was created"
+
+
 async def test_get_one_failed(manager: AbstractTransactionManager) -> None:
     user = await manager.send(queries.user.Get(id=uuid.uuid4()))
 
@@ -27,7 +35,7 @@ async def test_get_one_failed(manager: AbstractTransactionManager) -> None:
 
 
 async def test_get_many_failed(manager: AbstractTransactionManager) -> None:
-    total, users = await manager.send(queries.user.GetManyByOffset())
+    total, users, _ = await manager.send(queries.user.GetManyByOffset())
 
     assert not all([total, users]), "Users found"
 
@@ -70,3 +78,9 @@ async def test_delete_failed(manager: AbstractTransactionManager) -> None:
     deleted = await manager.send(queries.user.Delete(id=uuid.uuid4()))
 
     assert not deleted, "User was deleted"
+
+
+async def test_get_version_failed(manager: AbstractTransactionManager) -> None:
+    version = await manager.send(queries.user.GetVersion(id=uuid.uuid4()))
+
+    assert not version, "Version found"
@@ -1,6 +1,10 @@
 from typing import get_args
 
+import msgspec
+
+from src.common import dto
 from src.database.alchemy import entity, queries, types
+from src.database.alchemy.queries.materialize import materializer
 from src.interfaces.manager import AbstractTransactionManager
 from tests.conftest import *  # noqa
 from tests.repository.conftest import *  # noqa
@@ -28,7 +32,7 @@ async def test_get_one_success(
 async def test_get_many_success(
     manager: AbstractTransactionManager, user: entity.User
 ) -> None:
-    total, users = await manager.send(queries.user.GetManyByOffset())
+    total, users, _ = await manager.send(queries.user.GetManyByOffset())
 
     assert all([total, users]), "Users not found"
 
@@ -50,6 +54,21 @@ async def test_delete_success(
     assert deleted, "User was not deleted"
 
 
+async def test_delete_cascade_success(
+    manager: AbstractTransactionManager, user: entity.User, with_roles: None
+) -> None:
+    role = await manager.send(queries.role.Get(name="USER"))
+
+    assert role, "Role not found"
+
+    await manager.send(queries.role.SetToUser(user.id, role_id=role.id))
+    deleted = await manager.send(queries.user.Delete(id=user.id))
+    role = await manager.send(queries.role.Get("users", name="USER"))
+
+    assert deleted and role, "User was not deleted"
+    assert not role.users, "Role link was not deleted"
+
+
 async def test_get_with_relationships_success(
     manager: AbstractTransactionManager, user: entity.User, with_roles: None
 ) -> None:
@@ -67,3 +86,141 @@ async def test_get_with_relationships_success(
     assert all(
         getattr(existing_user, v) for v in relations if v != "permissions"
     ), "Relations were not found"
+
+
+async def test_get_as_json_success(
+    manager: AbstractTransactionManager, user: entity.User, with_roles: None
+) -> None:
+    role = await manager.send(queries.role.Get(name="ADMIN"))
+
+    assert role, "Role not found"
+
+    await manager.send(queries.role.SetToUser(user.id, role_id=role.id))
+    for name in ("write", "read"):
+        permission = await manager.send(
+            queries.base.Create.with_entity(entity.Permission)(name=name)
+        )
+
+        assert permission, "Permission was not created"
+
+        await manager.send(
+            queries.base.Create.with_entity(entity.RolePermission)(
+                role_id=role.id, permission_id=permission.id
+            )
+        )
+
+    for loads in ((), ("roles",), ("permissions",)):
+        found = await manager.send(queries.user.GetAsJson(*loads, login="TEST"))
+        existing_user = await manager.send(queries.user.Get(*loads, id=user.id))
+
+        assert found and existing_user, "User not found"
+
+        from_json = msgspec.json.decode(found, type=dto.User)
+        from_orm = dto.User.from_mapping(existing_user.as_dict())
+        for principal in (from_json, from_orm):
+            for r in principal.roles:
+                r.permissions.sort(key=lambda p: p.name)
+
+        assert from_json == from_orm, f"Loaded {loads} differently"
+
+    assert not await manager.send(queries.user.GetAsJson(login="missing"))
+
+
+async def test_signup_success(
+    manager: AbstractTransactionManager, with_roles: None
+) -> None:
+    found = await manager.send(queries.user.Signup("signup", "test_test"))
+
+    assert found, "User was not created"
+
+    created = msgspec.json.decode(found, type=dto.User)
+    existing = await manager.send(queries.user.GetAsJson("permissions", id=created.id))
+
+    assert existing, "User not found"
+    assert created == msgspec.json.decode(existing, type=dto.User), "Wrong user"
+    assert [role.name for role in created.roles] == ["USER"], "Role was not set"
+
+
+async def test_materialize_success(
+    manager: AbstractTransactionManager, user: entity.User, with_roles: None
+) -> None:
+    role = await manager.send(queries.role.Get(name="USER"))
+
+    assert role, "Role not found"
+
+    await manager.send(queries.role.SetToUser(user.id, role_id=role.id))
+    users = materializer(dto.User, entity.User)
+
+    for loads in ((), ("roles",), ("permissions",)):
+        existing_user = await manager.send(queries.user.Get(*loads, id=user.id))
+
+        assert existing_user, "User not found"
+        assert users.from_entity(existing_user) == dto.User.from_mapping(
+            existing_user.as_dict()
+        ), f"Materialized {loads} differently"
+
+    row = (await manager.conn.execute(users.select())).one()  # type: ignore
+
+    assert users.from_row(row) == dto.User(id=user.id, login=user.login)
+
+
+async def test_get_version_success(
+    manager: AbstractTransactionManager, user: entity.User
+) -> None:
+    version = await manager.send(queries.user.GetVersion(id=user.id))
+
+    assert version == user.updated_at.isoformat(), "Version does not match"
+
+
+async def test_get_many_version_success(
+    manager: AbstractTransactionManager, user: entity.User
+) -> None:
+    version = await manager.send(queries.user.GetManyVersion())
+    await manager.send(queries.user.Create(login="other", password="test"))
+    after_create = await manager.send(queries.user.GetManyVersion())
+
+    assert version != after_create, "Version did not change"
+
+
+async def test_get_many_by_cursor_success(manager: AbstractTransactionManager) -> None:
+    for i in range(5):
+        await manager.send(queries.user.Create(login=f"user{i}", password="test"))
+
+    for order_by in ("ASC", "DESC"):
+        logins: list[str] = []
+        after = None
+        while True:
+            users, has_more = await manager.send(
+                queries.user.GetManyByCursor(limit=2, order_by=order_by, after=after)
+            )
+            logins += [user.login for user in users]
+            if not has_more:
+                break
+            after = (users[-1].created_at, users[-1].id)
+
+        expected = [f"user{i}" for i in range(5)]
+        assert logins == (
+            expected if order_by == "ASC" else expected[::-1]
+        ), "Pages are not in order"
+
+
+async def test_get_many_count_modes_success(
+    manager: AbstractTransactionManager, user: entity.User
+) -> None:
+    await manager.send(queries.user.Create(login="other", password="test"))
+
+    for count in get_args(types.CountType):
+        total, users, used = await manager.send(
+            queries.user.GetManyByOffset(limit=1, count=count)
+        )
+        assert total == 2 and len(users) == 1, f"Wrong page with {count} count"
+        # the new table was never analyzed, so there is nothing to estimate from
+        assert used == (
+            "exact" if count == "estimate" else count
+        ), f"Wrong mode reported for {count} count"
+
+    total, users, used = await manager.send(
+        queries.user.GetManyByOffset(offset=5, limit=1, count="window")
+    )
+    assert total == 2 and not users, "Window count lost past the last page"
+    assert used == "exact", "Count past the last page was not reported as exact"
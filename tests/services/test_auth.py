@@ -0,0 +1,103 @@
+import uuid
+
+import pytest
+
+from src.common import dto
+from src.common.exceptions import UnAuthorizedError
+from src.core.settings import CipherSettings
+from src.database.alchemy import queries
+from src.interfaces.manager import AbstractTransactionManager
+from src.services.auth import AuthService
+from src.services.cache.redis import RedisCache
+from src.services.security.jwt import JWTImpl
+from src.services.security.pooled import PooledHasher
+from tests.conftest import *  # noqa
+
+PASSWORD = "test_test"
+
+
+@pytest.fixture(scope="function")
+async def auth(
+    manager: AbstractTransactionManager,
+    hasher: PooledHasher,
+    cipher: CipherSettings,
+    redis: RedisCache,
+) -> AuthService:
+    await manager.send(
+        queries.user.Create(login="test", password=await hasher.hash_password(PASSWORD))
+    )
+
+    return AuthService(manager, hasher, JWTImpl(cipher), redis, maximum_tokens=2)
+
+
+def _credentials(fingerprint: str) -> dto.UserLogin:
+    return dto.UserLogin(fingerprint=fingerprint, login="test", password=PASSWORD)
+
+
+async def test_login_trims_sessions(auth: AuthService) -> None:
+    fingerprints = [uuid.uuid4().hex for _ in range(3)]
+    tokens = [await auth.login(_credentials(f)) for f in fingerprints]
+
+    with pytest.raises(UnAuthorizedError):
+        await auth.logout(tokens[0].refresh)
+
+    for token in tokens[1:]:
+        assert (
+            await auth.logout(token.refresh)
+        ).success, "Session within the limit was dropped"
+
+
+async def test_login_same_fingerprint_replaces_session(auth: AuthService) -> None:
+    fingerprint = uuid.uuid4().hex
+    old = await auth.login(_credentials(fingerprint))
+    other = await auth.login(_credentials(uuid.uuid4().hex))
+    new = await auth.login(_credentials(fingerprint))
+
+    with pytest.raises(UnAuthorizedError):
+        await auth.logout(old.refresh)
+
+    assert (await auth.logout(other.refresh)).success, "Other session was dropped"
+    assert (await auth.logout(new.refresh)).success, "New session was not stored"
+
+
+async def test_refresh_rotates(auth: AuthService) -> None:
+    fingerprint = dto.Fingerprint(fingerprint=uuid.uuid4().hex)
+    login = await auth.login(_credentials(fingerprint.fingerprint))
+
+    first = await auth.refresh(fingerprint, login.refresh.token)
+    second = await auth.refresh(fingerprint, first.refresh.token)
+
+    assert (
+        len({login.refresh.token, first.refresh.token, second.refresh.token}) == 3
+    ), "Refresh token was not rotated"
+    assert (await auth.logout(second.refresh)).success, "Rotated token not stored"
+
+
+async def test_refresh_reuse_revokes_all(auth: AuthService) -> None:
+    fingerprint = dto.Fingerprint(fingerprint=uuid.uuid4().hex)
+    login = await auth.login(_credentials(fingerprint.fingerprint))
+    other = await auth.login(_credentials(uuid.uuid4().hex))
+    rotated = await auth.refresh(fingerprint, login.refresh.token)
+
+    with pytest.raises(UnAuthorizedError):
+        await auth.refresh(fingerprint, login.refresh.token)
+
+    with pytest.raises(UnAuthorizedError):
+        await auth.refresh(fingerprint, rotated.refresh.token)
+
+    with pytest.raises(UnAuthorizedError):
+        await auth.logout(other.refresh)
+
+
+async def test_logout(auth: AuthService) -> None:
+    first = await auth.login(_credentials(uuid.uuid4().hex))
+    second = await auth.login(_credentials(uuid.uuid4().hex))
+
+    assert (await auth.logout(first.refresh)).success, "Logout failed"
+
+    with pytest.raises(UnAuthorizedError):
+        await auth.logout(first.refresh)
+
+    assert (
+        await auth.logout(second.refresh)
+    ).success, "Logout ended another session"
@@ -0,0 +1,42 @@
+from typing import Any
+
+import pytest
+
+from src.core.settings import DatabaseSettings
+from src.database.budget import plan_connections
+
+
+def _settings(**kw: Any) -> DatabaseSettings:
+    return DatabaseSettings(
+        driver="postgresql+asyncpg", host="postgres", port=5432, **kw
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 4, 8, 30])
+def test_plan_fits_max_connections(workers: int) -> None:
+    settings = _settings(replica_host="replica")
+    plan = plan_connections(settings, workers)
+
+    assert plan.pool_size >= 1, "No connection for interactive requests"
+    assert (
+        plan.workers * plan.per_worker
+        <= settings.max_connections - settings.reserved_connections
+    ), "Primary pools exceed max connections"
+    assert (
+        plan.workers * (plan.replica_pool_size + plan.replica_max_overflow)
+        <= settings.max_connections - settings.reserved_connections
+    ), "Replica pools exceed max connections"
+
+
+def test_plan_keeps_configured_sizes() -> None:
+    plan = plan_connections(
+        _settings(connection_pool_size=5, connection_max_overflow=5), 1
+    )
+
+    assert (plan.pool_size, plan.max_overflow) == (5, 5), "Configured sizes grew"
+    assert not plan.replica_pool_size, "Replica pool without a replica"
+
+
+def test_plan_failed() -> None:
+    with pytest.raises(ValueError):
+        plan_connections(_settings(max_connections=20), 10)
@@ -0,0 +1,63 @@
+import uuid
+from typing import Any
+
+from src.core.settings import RedisSettings
+from src.services.cache.rate_limit import RateLimiter
+from src.services.cache.redis import RedisCache, get_redis
+from tests.conftest import *  # noqa
+
+
+def _limiter(cache: RedisCache, limit: int = 2, **kw: Any) -> RateLimiter:
+    return RateLimiter(cache, {"login": (limit, 60)}, **kw)
+
+
+async def test_limit_per_identity(redis: RedisCache) -> None:
+    limiter = _limiter(redis)
+    first, second = uuid.uuid4().hex, uuid.uuid4().hex
+
+    assert not await limiter.hit("login", first), "First request was limited"
+    assert not await limiter.hit("login", first), "Second request was limited"
+
+    retry_after = await limiter.hit("login", first)
+    assert 0 < retry_after <= 60, "Request over the limit was let in"
+    assert not await limiter.hit("login", second), "Identities share a limit"
+
+
+async def test_limited_request_not_recorded(redis: RedisCache) -> None:
+    limiter = _limiter(redis, limit=1)
+    full, other = uuid.uuid4().hex, uuid.uuid4().hex
+
+    await limiter.hit("login", full)
+    assert await limiter.hit("login", full, other), "Full identity was let in"
+    assert not await limiter.hit(
+        "login", other
+    ), "Rejected request counted against the other identity"
+
+
+async def test_no_limit_configured(redis: RedisCache) -> None:
+    limiter = _limiter(redis, limit=1)
+    identity = uuid.uuid4().hex
+
+    for _ in range(3):
+        assert not await limiter.hit("signup", identity), "Unlimited name limited"
+
+
+async def test_unavailable_redis_lets_in() -> None:
+    cache = get_redis(RedisSettings(host="127.0.0.1", port=1))
+    try:
+        assert not await _limiter(cache, limit=0).hit(
+            "login", "ip"
+        ), "Broken limiter rejected the request"
+    finally:
+        await cache.close()
+
+
+def test_trusted_proxies() -> None:
+    limiter = RateLimiter(
+        get_redis(RedisSettings()), {}, trusted_proxies=["10.0.0.1", "172.16.0.0/12"]
+    )
+
+    assert limiter.trusts_proxy("10.0.0.1")
+    assert limiter.trusts_proxy("172.18.0.5")
+    assert not limiter.trusts_proxy("10.0.0.2")
+    assert not limiter.trusts_proxy("testclient")
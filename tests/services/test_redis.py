@@ -0,0 +1,115 @@
+import uuid
+
+import pytest
+
+from src.services.cache.redis import RedisCache
+from tests.conftest import *  # noqa
+
+
+def _keys(count: int) -> list[str]:
+    prefix = uuid.uuid4().hex
+    return [f"test:{prefix}:{i}" for i in range(count)]
+
+
+async def test_get_set_many(redis: RedisCache) -> None:
+    keys = _keys(3)
+
+    assert await redis.get_many() == [], "Empty lookup returned values"
+    await redis.set_many({})
+
+    await redis.set_many({keys[0]: "first", keys[1]: {"a": 1}})
+    assert await redis.get_many(*keys) == [
+        "first",
+        '{"a":1}',
+        None,
+    ], "Values were not stored in order"
+
+    await redis.set_many({keys[2]: "third"}, expire=60)
+    assert await redis.get_value(keys[2]) == "third", "Expiring value not stored"
+
+    await redis.del_keys(*keys)
+
+
+async def test_pipeline_flushes_on_exit(redis: RedisCache) -> None:
+    keys = _keys(3)
+
+    async with redis.pipeline(transaction=True) as pipe:
+        await pipe.set_value(keys[0], "first")
+        await pipe.set_many({keys[1]: "second"})
+        await pipe.incr(keys[2], expire=60)
+
+        assert await redis.get_many(*keys) == [
+            None,
+            None,
+            None,
+        ], "Pipeline was sent before its end"
+
+    assert await redis.get_many(*keys) == [
+        "first",
+        "second",
+        "1",
+    ], "Pipeline was not sent on exit"
+
+    await redis.del_keys(*keys)
+
+
+async def test_pipeline_discarded_on_error(redis: RedisCache) -> None:
+    (key,) = _keys(1)
+
+    with pytest.raises(KeyError):
+        async with redis.pipeline() as pipe:
+            await pipe.set_value(key, "value")
+            raise KeyError(key)
+
+    assert await redis.get_value(key) is None, "Failed pipeline was sent"
+
+
+async def test_pipeline_rejects_reads(redis: RedisCache) -> None:
+    (key,) = _keys(1)
+
+    async with redis.pipeline() as pipe:
+        for read in (
+            pipe.get_value(key),
+            pipe.get_many(key),
+            pipe.get_list(key),
+            pipe.pop(key, "value"),
+            pipe.del_pattern(f"{key}*"),
+            pipe.run_script("return 1", (), ()),
+        ):
+            with pytest.raises(TypeError):
+                await read
+
+
+async def test_del_keys(redis: RedisCache) -> None:
+    keys = _keys(3)
+    await redis.set_many(dict.fromkeys(keys, "value"))
+
+    await redis.del_keys()
+    await redis.del_keys(*keys[:2])
+
+    assert await redis.get_many(*keys) == [
+        None,
+        None,
+        "value",
+    ], "Wrong keys were unlinked"
+
+    async with redis.pipeline() as pipe:
+        await pipe.del_keys(keys[2])
+
+    assert await redis.get_value(keys[2]) is None, "Batched unlink was not sent"
+
+
+async def test_del_pattern(redis: RedisCache) -> None:
+    keys = _keys(5)
+    other = f"{keys[0]}:other"
+    await redis.set_many(dict.fromkeys(keys, "value"))
+    await redis.set_value(other, "value")
+
+    pattern = keys[0].rsplit(":", 1)[0] + ":?"
+    assert await redis.del_pattern(pattern, count=2) == 5, "Wrong number deleted"
+    assert await redis.get_many(*keys) == [None] * 5, "Matching keys survived"
+    assert await redis.get_value(other) == "value", "Not matching key was deleted"
+
+    assert await redis.del_pattern(pattern) == 0, "Deleted keys counted again"
+
+    await redis.del_keys(other)
@@ -0,0 +1,131 @@
+import asyncio
+import uuid
+from typing import AsyncIterator, Callable
+
+import pytest
+
+from src.common.cache import TTLCache
+from src.services.cache import tiered
+from src.services.cache.redis import RedisCache
+from src.services.cache.tiered import Invalidation, TieredCache
+from tests.conftest import *  # noqa
+
+
+@pytest.fixture(scope="function")
+def channel() -> str:
+    return f"test:invalidate:{uuid.uuid4().hex}"
+
+
+@pytest.fixture(scope="function")
+async def peers(
+    redis: RedisCache, channel: str
+) -> AsyncIterator[tuple[TieredCache, TieredCache]]:
+    first, second = (
+        TieredCache(redis, TTLCache(maxsize=100, ttl=60), channel) for _ in range(2)
+    )
+    yield first, second
+    await first.close()
+    await second.close()
+
+
+async def _until(predicate: Callable[[], bool], timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+async def _listening(cache: TieredCache) -> None:
+    await cache.get_many()
+    await _until(lambda: cache._state.subscribed)
+
+
+async def test_l1_evicted_on_peer_publish(
+    redis: RedisCache, peers: tuple[TieredCache, TieredCache]
+) -> None:
+    first, second = peers
+    key = f"test:{uuid.uuid4().hex}"
+    await _listening(first)
+
+    await redis.set_value(key, "old")
+    assert await first.get_value(key) == "old", "Value was not read from l2"
+
+    # written behind the back of both tiers, l1 still answers
+    await redis.set_value(key, "stale")
+    assert await first.get_value(key) == "old", "Value was not kept in l1"
+
+    await second.set_value(key, "new")
+    await _until(lambda: first.stats()["invalidations_received"] >= 1)
+
+    assert await first.get_value(key) == "new", "Peer write did not evict l1"
+
+    await redis.del_keys(key)
+
+
+async def test_listener_survives_errors(
+    monkeypatch: pytest.MonkeyPatch,
+    redis: RedisCache,
+    peers: tuple[TieredCache, TieredCache],
+) -> None:
+    first, second = peers
+    monkeypatch.setattr(tiered, "RECONNECT_DELAY", 0.01)
+    apply = TieredCache._apply
+    failed: list[Invalidation] = []
+
+    def _apply(self: TieredCache, invalidation: Invalidation) -> None:
+        if self is first and not failed:
+            failed.append(invalidation)
+            raise KeyError("boom")
+
+        apply(self, invalidation)
+
+    monkeypatch.setattr(TieredCache, "_apply", _apply)
+    await _listening(first)
+
+    await second.del_keys("missing")
+    await _until(lambda: bool(failed))
+
+    # published until the listener is back
+    async with asyncio.timeout(2.0):
+        while not first.stats()["invalidations_received"]:
+            await second.del_keys("missing")
+            await asyncio.sleep(0.01)
+
+    key = f"test:{uuid.uuid4().hex}"
+    await redis.set_value(key, "old")
+    assert await first.get_value(key) == "old", "Value was not read from l2"
+
+    await second.set_value(key, "new")
+    # everything but the failed invalidation arrived
+    await _until(
+        lambda: first.stats()["invalidations_received"]
+        == second.stats()["invalidations_sent"] - 1
+    )
+
+    assert first._state.listener is not None, "Listener was dropped"
+    assert not first._state.listener.done(), "Listener stopped after an error"
+    assert await first.get_value(key) == "new", "Invalidation was not applied"
+
+    await redis.del_keys(key)
+
+
+async def test_close_keeps_shared_client(
+    monkeypatch: pytest.MonkeyPatch,
+    redis: RedisCache,
+    peers: tuple[TieredCache, TieredCache],
+) -> None:
+    first, _ = peers
+    closed: list[RedisCache] = []
+
+    async def _close(self: RedisCache) -> None:
+        closed.append(self)
+
+    await _listening(first)
+    listener = first._state.listener
+
+    monkeypatch.setattr(RedisCache, "close", _close)
+    await first.close()
+    monkeypatch.undo()
+
+    assert listener is not None and listener.cancelled(), "Listener still runs"
+    assert not closed, "Shared redis client was closed"
+    assert await redis.get_value(f"test:{uuid.uuid4().hex}") is None